@@ -0,0 +1,103 @@
+import json
+import os
+from functools import lru_cache
+import pandas as pd
+
+# One place to turn any source's team name into a stable integer team ID and back.
+# Built once per league from Dictionary/{Pro,College}/{league}.json; the ID is the
+# file's "Team Rankings Index", which is also the value in {league}_mapping.json.
+
+DICTIONARY_DIR = os.path.dirname(os.path.abspath(__file__))
+LEAGUE_KEYS = {'NBA': 'Pro', 'NCB': 'College'}
+
+# Source name -> field in the team dictionary
+SOURCES = {
+    'DraftKings': 'DraftKings Name',
+    'Team Rankings': 'Team Rankings Name',
+    'Covers': 'Covers',
+    'PlainText': 'PlainText',
+    'ESPNBet': 'ESPNBet',
+    'BetMGM': 'BetMGM',
+    'Bovada': 'Bovada',
+    'Full Name': 'Full Name',
+}
+
+# Filler values in the dictionaries that must never match a real name
+PLACEHOLDERS = {'', 'unknown', 'unkown', 'value1', 'value2'}
+
+
+def dictionary_path(league):
+    if league not in LEAGUE_KEYS:
+        raise ValueError(f"Unsupported league: {league}")
+    return os.path.join(DICTIONARY_DIR, LEAGUE_KEYS[league], f'{league}.json')
+
+
+def normalize(name):
+    return name.strip().lower()
+
+
+class TeamRegistry:
+    """Hash indexes from every source's team name to a stable integer team ID."""
+
+    def __init__(self, league, teams):
+        self.league = league
+        self.teams = {}
+        self.index = {source: {} for source in SOURCES}
+        for position, team in enumerate(teams):
+            team_id = int(team.get('Team Rankings Index', position))
+            self.teams[team_id] = team
+            for source, field in SOURCES.items():
+                name = team.get(field)
+                if not isinstance(name, str) or normalize(name) in PLACEHOLDERS:
+                    continue
+                self.index[source].setdefault(normalize(name), team_id)
+
+    @classmethod
+    def from_file(cls, league):
+        with open(dictionary_path(league), 'r', encoding='utf-8') as f:
+            return cls(league, json.load(f))
+
+    def team_id(self, name, source):
+        """Integer team ID for a name as written by `source`, or None if unknown."""
+        if not isinstance(name, str):
+            return None
+        return self.index[source].get(normalize(name))
+
+    def field(self, team_id, field, default='Unknown'):
+        """Any dictionary field for a team ID; `field` may be a source name or a raw key."""
+        team = self.teams.get(team_id)
+        if team is None:
+            return default
+        return team.get(SOURCES.get(field, field), default)
+
+    def translate(self, name, from_source, to_field, default='Unknown'):
+        """Scalar name translation, e.g. DraftKings name -> Team Rankings name."""
+        return self.field(self.team_id(name, from_source), to_field, default)
+
+    def resolve(self, series, source):
+        """
+        Vectorized name -> team ID for a pandas column.
+
+        Args:
+        - series (pd.Series): Team names as written by `source`.
+        - source (str): Key of SOURCES.
+
+        Returns:
+        - pd.Series: Nullable Int16 team IDs, <NA> where the name is unknown.
+        """
+        codes, uniques = pd.factorize(series)
+        index = self.index[source]
+        ids = pd.array([index.get(normalize(name)) if isinstance(name, str) else None for name in uniques] + [None],
+                       dtype='Int16')
+        return pd.Series(ids[codes], index=series.index, name=series.name)
+
+    def translate_series(self, series, from_source, to_field):
+        """Vectorized name translation; NaN where the name is unknown."""
+        lookup = {team_id: self.field(team_id, to_field) for team_id in self.teams}
+        return self.resolve(series, from_source).map(lookup)
+
+
+@lru_cache(maxsize=None)
+def get_registry(league):
+    """Registry for a league, loaded once per process."""
+    return TeamRegistry.from_file(league)
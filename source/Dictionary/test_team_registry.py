@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from team_registry import SOURCES, TeamRegistry, get_registry
+
+TEAMS = [
+    {'Team Rankings Index': 0, 'Team Rankings Name': 'Atlanta', 'DraftKings Name': 'ATL Hawks', 'Covers': 'Atlanta',
+     'PlainText': 'ATL'},
+    {'Team Rankings Index': 12, 'Team Rankings Name': 'LA Clippers', 'DraftKings Name': 'LA Clippers',
+     'Covers': 'L.A. Clippers', 'PlainText': 'LAC'},
+    {'Team Rankings Index': 30, 'Team Rankings Name': 'Unknown', 'DraftKings Name': 'value1', 'Covers': 'Unknown',
+     'PlainText': 'N/A'},
+]
+
+
+@pytest.fixture
+def registry():
+    return TeamRegistry('NBA', TEAMS)
+
+
+def test_translate_series(registry):
+    names = pd.Series(['ATL Hawks', 'la clippers', ' LA Clippers ', 'BOS Celtics', None, 'ATL Hawks'],
+                      index=[5, 4, 3, 2, 1, 0], name='Away Team')
+    translated = registry.translate_series(names, 'DraftKings', 'Team Rankings')
+
+    assert translated.index.tolist() == [5, 4, 3, 2, 1, 0] and translated.name == 'Away Team'
+    assert translated.tolist()[:3] + translated.tolist()[5:] == ['Atlanta', 'LA Clippers', 'LA Clippers', 'Atlanta']
+    assert translated.iloc[3:5].isna().all()
+
+
+def test_placeholders_never_match(registry):
+    translated = registry.translate_series(pd.Series(['Unknown', 'value1', '']), 'Covers', 'PlainText')
+    assert translated.isna().all()
+    assert registry.resolve(pd.Series(['value1']), 'DraftKings').isna().all()
+
+
+def test_resolve_gives_team_ids(registry):
+    ids = registry.resolve(pd.Series(['L.A. Clippers', 'Atlanta', 'Boston']), 'Covers')
+    assert str(ids.dtype) == 'Int16'
+    assert ids.tolist()[:2] == [12, 0] and ids.isna().tolist() == [False, False, True]
+
+
+def test_empty_series(registry):
+    assert registry.translate_series(pd.Series([], dtype=object), 'Covers', 'Team Rankings').empty
+
+
+@pytest.mark.parametrize('league', ['NBA', 'NCB'])
+@pytest.mark.parametrize('source, to_field', [('DraftKings', 'Team Rankings'), ('Covers', 'DraftKings'),
+                                              ('Team Rankings', 'Covers')])
+def test_matches_scalar_translate(league, source, to_field):
+    registry = get_registry(league)
+    names = pd.Series([team.get(SOURCES[source]) for team in registry.teams.values()] + ['Not A Team'])
+    names = pd.concat([names, names.str.upper()], ignore_index=True)
+
+    translated = registry.translate_series(names, source, to_field)
+    expected = [registry.translate(name, source, to_field, default=np.nan) if isinstance(name, str) else np.nan
+                for name in names]
+    assert [value if isinstance(value, str) else None for value in translated] == \
+        [value if isinstance(value, str) else None for value in expected]
@@ -4,6 +4,10 @@ import pandas as pd
 from datetime import date, timedelta
 import json
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrapers'))
+from fixtures import record_page, resolve_url
 
 # Define constants
 SCORES_URLS = {
@@ -41,8 +45,13 @@ def standardize_team_name(team_name, source, team_dict):
 def fetch_scores(league, date_str, source, team_dict):
     """Fetch scores for the given league and date from a specific source."""
     url = SCORES_URLS[league].format(date=date_str)
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    response = requests.get(resolve_url(url))
+    record_page(url, response.text)
+    return parse_scores(response.text, league, source, team_dict)
+
+def parse_scores(html, league, source, team_dict):
+    """Parse the game scores out of a scoreboard page."""
+    soup = BeautifulSoup(html, 'html.parser')
 
     games = []
 
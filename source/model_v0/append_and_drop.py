@@ -1,12 +1,21 @@
+import os
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+from dtype_policy import apply_policy, memory_mb, memory_report
+from datasets import drop_non_features
+
+league = 'NCB'
+
 # Define the start and end dates
 start_date = datetime.strptime('2024-11-10', '%Y-%m-%d')
 end_date = datetime.strptime('2024-12-07', '%Y-%m-%d')
 
 # Initialize an empty list to collect DataFrames
 df_list = []
+read_mb = 0.0
 
 # Iterate over all dates in the range
 current_date = start_date
@@ -14,25 +23,12 @@ while current_date <= end_date:
     date_str = current_date.strftime('%Y-%m-%d')
     try:
         # Read the CSV for the current date
-        file_path = f'C:/Users/dcooke/Projects/Sports/basketball_trends/source/proc_data/preview/NCB/{date_str}/ats/final_preprocess.csv'
+        file_path = f'C:/Users/dcooke/Projects/Sports/basketball_trends/source/proc_data/preview/{league}/{date_str}/ats/final_preprocess.csv'
         df = pd.read_csv(file_path)
+        read_mb += memory_mb(df)
 
-        # Drop columns containing certain keywords
-        columns_to_drop = [col for col in df.columns if 'Underdog' in col or 'Favorite' in col or 'Team Covers_last' in col or 'Team Covers_all' in col or 'Unnamed' in col]
-        df.drop(columns=columns_to_drop, inplace=True, errors='ignore')
-
-        # Drop specific columns
-        specific_columns_to_drop = [
-            'Away Team Covers_current_season', 'Away Team_current_season',
-            'Home Team_current_season', 'Home Team Covers_current_season',
-            'Home Team', 'Away Team', 'Time_current_season',
-            'Location_current_season', 'Hotness Score_current_season',
-            'Rank_current_season'
-        ]
-        df.drop(columns=specific_columns_to_drop, inplace=True, errors='ignore')
-
-        # Reset the index
-        df.reset_index(drop=True, inplace=True)
+        # Drop the columns that are not model features
+        df = drop_non_features(df)
 
         # Append the processed DataFrame to the list
         df_list.append(df)
@@ -46,8 +42,9 @@ while current_date <= end_date:
     # Move to the next day
     current_date += timedelta(days=1)
 
-# Combine all DataFrames into one
-combined_df = pd.concat(df_list, ignore_index=True)
+# Combine all DataFrames into one and apply the dtype policy once, to the whole set
+combined_df = apply_policy(pd.concat(df_list, ignore_index=True), league)
+print(memory_report('append_and_drop', read_mb, memory_mb(combined_df), combined_df.shape))
 
 # Print the resulting DataFrame's columns
 print("Combined DataFrame Columns:")
@@ -0,0 +1,96 @@
+import json
+import os
+from datetime import datetime
+import numpy as np
+import xgboost as xgb
+from datasets import MODEL_DIR
+
+# Saved models, one directory per league:
+#   artifacts/{league}/model.ubj   the booster, in XGBoost's binary UBJSON format
+#   artifacts/{league}/meta.json   feature column order, per-column fill values,
+#                                  threshold, dataset hash, params and weights
+# Both files are written to a temporary name and swapped in, so a predict run
+# never reads a half-written model.
+
+ARTIFACT_DIR = os.path.join(MODEL_DIR, 'artifacts')
+MODEL_FILE = 'model.ubj'
+META_FILE = 'meta.json'
+
+
+def artifact_dir(league, root=ARTIFACT_DIR):
+    return os.path.join(root, league)
+
+
+def replace_file(path, write):
+    """Write a file through write(temp_path), then swap it into place."""
+    temp_path = f'{path}.{os.getpid()}.tmp{os.path.splitext(path)[1]}'
+    write(temp_path)
+    os.replace(temp_path, path)
+
+
+def save_artifact(league, booster, columns, fill_values, threshold, data_hash, params=None, weights=None,
+                  metrics=None, root=ARTIFACT_DIR):
+    """
+    Save a trained model and everything predict needs to reproduce its inputs.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - booster (xgb.Booster or XGBClassifier): Trained model.
+    - columns (list): Feature columns in training order.
+    - fill_values (list): Value substituted for a missing feature, per column (the training means).
+    - threshold (float): Probability at or above which a home cover is picked.
+    - data_hash (str): datasets.dataset_hash of the training data.
+    - params (dict): Training parameters, for the record.
+    - weights (dict): Time-range weights the features were built with.
+    - metrics (dict): Validation metrics, for the record.
+    - root (str): Artifact directory.
+
+    Returns:
+    - str: Directory the artifact was saved to.
+    """
+    if isinstance(booster, xgb.XGBModel):
+        booster = booster.get_booster()
+    directory = artifact_dir(league, root)
+    os.makedirs(directory, exist_ok=True)
+
+    meta = {
+        'league': league,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'xgboost': xgb.__version__,
+        'data_hash': data_hash,
+        'threshold': float(threshold),
+        'columns': [str(column) for column in columns],
+        'fill_values': [float(value) for value in fill_values],
+        'params': params or {},
+        'weights': weights or {},
+        'metrics': {name: float(value) for name, value in (metrics or {}).items()},
+    }
+    def write_meta(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    replace_file(os.path.join(directory, MODEL_FILE), booster.save_model)
+    replace_file(os.path.join(directory, META_FILE), write_meta)
+    return directory
+
+
+def load_artifact(league, root=ARTIFACT_DIR, nthread=1):
+    """
+    Load a saved model.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - root (str): Artifact directory.
+    - nthread (int): Prediction threads; one is fastest for a slate of games.
+
+    Returns:
+    - tuple: (xgb.Booster, meta dict with 'fill_values' as a float32 array).
+    """
+    directory = artifact_dir(league, root)
+    with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    meta['fill_values'] = np.asarray(meta['fill_values'], dtype=np.float32)
+
+    booster = xgb.Booster(params={'nthread': nthread})
+    booster.load_model(os.path.join(directory, MODEL_FILE))
+    return booster, meta
@@ -0,0 +1,159 @@
+import argparse
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+from datasets import GAME_KEYS, TARGET
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dictionary'))
+from odds import decimal_odds
+from odds_index import load_odds_index
+from team_registry import get_registry
+
+# Grades ATS bets on model probabilities, every threshold and stake size at once.
+#
+# For a threshold t the home side is bet when P(home cover) >= t and, with
+# sides='both', the away side when 1 - P >= t. Each game is paid at its own
+# DraftKings spread odds from dk_odds.json. Stakes are flat units or a fraction
+# of the Kelly stake on a compounding bankroll. Results are (stakes x thresholds
+# x games) arrays, so a whole threshold curve is one broadcasted pass.
+#
+#   python basketball_trends/source/model_v0/backtest.py predictions.csv --league NCB
+
+THRESHOLDS = np.round(np.arange(0.50, 0.80, 0.0025), 4)
+STAKES = [('flat', 1.0), ('kelly', 0.1), ('kelly', 0.25), ('kelly', 0.5)]
+DEFAULT_ODDS = -110
+BANKROLL = 100.0
+
+
+def game_odds(league, date, away_teams, home_teams, default_odds=DEFAULT_ODDS):
+    """
+    Spread odds for one slate's games from that day's dk_odds.json.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - date (str): 'YYYY-MM-DD'.
+    - away_teams, home_teams (pd.Series): Covers names, as in final_preprocess.csv.
+    - default_odds (int): Price used where a team is not on the board.
+
+    Returns:
+    - tuple: (away odds, home odds, missing mask) arrays.
+    """
+    registry = get_registry(league)
+    try:
+        index = load_odds_index(league, date)
+    except FileNotFoundError:
+        index = {}
+
+    sides = []
+    for teams in [away_teams, home_teams]:
+        names = registry.translate_series(teams, 'Covers', 'DraftKings')
+        sides.append(np.array([index[name][1] if name in index else None for name in names], dtype=object))
+    away, home = sides
+    missing = pd.isna(away) | pd.isna(home)
+    away[pd.isna(away)] = default_odds
+    home[pd.isna(home)] = default_odds
+    return away, home, missing
+
+
+def attach_odds(df, league, default_odds=DEFAULT_ODDS):
+    """Adds 'Away Odds', 'Home Odds' and 'Odds Missing' to dated game rows (see datasets.load_partitions)."""
+    df = df.copy()
+    df['Away Odds'], df['Home Odds'], df['Odds Missing'] = None, None, False
+    for date, rows in df.groupby('date').groups.items():
+        away, home, missing = game_odds(league, date, df.loc[rows, GAME_KEYS[0]], df.loc[rows, GAME_KEYS[1]],
+                                        default_odds)
+        df.loc[rows, 'Away Odds'], df.loc[rows, 'Home Odds'], df.loc[rows, 'Odds Missing'] = away, home, missing
+    return df
+
+
+def max_drawdown(equity):
+    """Largest peak-to-trough fall along the last axis of an equity curve."""
+    return (np.maximum.accumulate(equity, axis=-1) - equity).max(axis=-1)
+
+
+def backtest(probabilities, home_cover, home_odds, away_odds, thresholds=THRESHOLDS, stakes=STAKES,
+             sides='both', bankroll=BANKROLL):
+    """
+    Grade every (stake, threshold) configuration over the same games.
+
+    Args:
+    - probabilities (array): Model P(home cover) per game, in the order the bets are placed.
+    - home_cover (array): 1 where the home team covered, 0 where the away team did.
+    - home_odds, away_odds (array): American spread odds per game; strings like '−110' are fine.
+    - thresholds (array): Minimum probability of the bet side.
+    - stakes (list): ('flat', units) or ('kelly', fraction of the full Kelly stake).
+    - sides (str): 'both' to also bet the away side, 'home' to bet home covers only.
+    - bankroll (float): Starting bankroll for Kelly staking.
+
+    Returns:
+    - pd.DataFrame: One row per configuration with bets, wins, staked, profit, roi and max_drawdown.
+    """
+    p = np.asarray(probabilities, dtype=np.float64)[None, :]
+    covered = np.asarray(home_cover, dtype=bool)[None, :]
+    t = np.asarray(thresholds, dtype=np.float64)[:, None]
+    home_decimal, away_decimal = decimal_odds(home_odds)[None, :], decimal_odds(away_odds)[None, :]
+
+    # (thresholds, games): which side is bet, its win probability, payout and result per unit staked
+    bet_home = p >= t
+    bet_away = ((1 - p) >= t) & ~bet_home if sides == 'both' else np.zeros_like(bet_home)
+    placed = bet_home | bet_away
+    q = np.where(bet_home, p, 1 - p)
+    b = np.where(bet_home, home_decimal, away_decimal) - 1
+    won = np.where(bet_home, covered, ~covered)
+    unit_return = np.where(placed, np.where(won, b, -1.0), 0.0)
+    kelly = np.where(placed, np.clip((b * q - (1 - q)) / b, 0, None), 0.0)
+
+    # Stakes per bet, (stake sizes, thresholds, games) for each staking rule
+    configs = []
+    flat = np.asarray([size for kind, size in stakes if kind == 'flat'], dtype=np.float64)
+    if len(flat):
+        stake = flat[:, None, None] * placed[None]
+        equity = np.concatenate([np.zeros(stake.shape[:-1] + (1,)), np.cumsum(stake * unit_return, axis=-1)], axis=-1)
+        configs.append(('flat', flat, stake, equity[..., -1], equity))
+
+    fractions = np.asarray([size for kind, size in stakes if kind == 'kelly'], dtype=np.float64)
+    if len(fractions):
+        share = fractions[:, None, None] * kelly[None]  # Share of the bankroll on each bet
+        growth = np.cumprod(1 + share * unit_return, axis=-1)
+        equity = bankroll * np.concatenate([np.ones(growth.shape[:-1] + (1,)), growth], axis=-1)
+        configs.append(('kelly', fractions, share * equity[..., :-1], equity[..., -1] - bankroll, equity))
+
+    rows = []
+    for kind, sizes, stake, profit, equity in configs:
+        bets = stake > 0
+        staked = stake.sum(axis=-1)
+        roi = np.divide(profit, staked, out=np.zeros_like(profit), where=staked > 0)
+        drawdown = max_drawdown(equity)
+        for i, size in enumerate(sizes):
+            rows.append(pd.DataFrame({
+                'stake': kind, 'size': size, 'threshold': thresholds,
+                'bets': bets[i].sum(axis=-1), 'wins': (bets[i] & won).sum(axis=-1),
+                'staked': staked[i], 'profit': profit[i], 'roi': roi[i], 'max_drawdown': drawdown[i],
+            }))
+    return pd.concat(rows, ignore_index=True)
+
+
+def backtest_games(df, probability_column='probability', **kwargs):
+    """backtest() over dated game rows that carry a probability, the result and attach_odds() columns."""
+    df = df[df[TARGET].notna()].sort_values('date', kind='stable')
+    return backtest(df[probability_column], df[TARGET].astype(bool), df['Home Odds'], df['Away Odds'], **kwargs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep thresholds and stakes over model predictions')
+    parser.add_argument('predictions', help="CSV with 'date', the Covers team columns, 'Home Cover' and 'probability'")
+    parser.add_argument('--league', choices=['NBA', 'NCB'], default='NCB')
+    parser.add_argument('--sides', choices=['both', 'home'], default='both')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    games = attach_odds(pd.read_csv(args.predictions), args.league)
+    print(f"{len(games)} games, {int(games['Odds Missing'].sum())} priced at {DEFAULT_ODDS} for lack of a line")
+    start = timeit.default_timer()
+    results = backtest_games(games, sides=args.sides)
+    elapsed = timeit.default_timer() - start
+    print(f'{len(results)} configurations in {elapsed * 1000:.1f} ms')
+    print(results[results['bets'] > 0].sort_values('profit', ascending=False).head(args.top).round(3).to_string(index=False))
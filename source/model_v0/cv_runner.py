@@ -0,0 +1,202 @@
+import argparse
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+from sklearn.metrics import accuracy_score, brier_score_loss, f1_score, log_loss, precision_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+from datasets import MODEL_DIR, dataset_hash, load_training_data
+
+# Stratified K-fold CV with SMOTE applied inside each training fold only, so no
+# validation row (or a synthetic neighbour of one) is ever trained on.
+#
+# Each fold's resampled training matrix is cached as
+#   cache/smote/{dataset hash}_k{splits}_s{seed}_f{fold}.npz
+# so repeated experiments on the same data skip SMOTE entirely. Folds train in
+# parallel, one single-threaded XGBoost per worker process.
+#
+#   python basketball_trends/source/model_v0/cv_runner.py --workers 5
+
+MODEL_PARAMS = {
+    'eval_metric': 'logloss',
+    'objective': 'binary:logistic',
+    'max_depth': 5,
+    'learning_rate': 0.02,
+    'n_estimators': 150,
+    'subsample': 0.75,
+    'colsample_bytree': 0.65,
+    'reg_alpha': 0.7,
+    'reg_lambda': 4.0,
+    'scale_pos_weight': 2.5,
+    'random_state': 42
+}
+
+N_SPLITS = 5
+WORKERS = os.cpu_count() or 1
+CACHE_DIR = os.path.join(MODEL_DIR, 'cache', 'smote')
+
+# Per-process copy of the dataset, set once by init_worker instead of pickled with every fold
+DATA = {}
+
+
+def booster_params(params=MODEL_PARAMS):
+    """
+    XGBClassifier parameters as xgb.train takes them.
+
+    Returns:
+    - tuple: (params dict, num_boost_round from n_estimators).
+    """
+    params = dict(params)
+    rounds = params.pop('n_estimators', 100)
+    if 'random_state' in params:
+        params['seed'] = params.pop('random_state')
+    if 'n_jobs' in params:
+        params['nthread'] = params.pop('n_jobs')
+    return params, rounds
+
+
+def resample_path(cache_dir, data_hash, n_splits, seed, fold):
+    return os.path.join(cache_dir, f'{data_hash}_k{n_splits}_s{seed}_f{fold}.npz')
+
+
+def resample_fold(X_train, y_train, seed, cache_path=None):
+    """
+    SMOTE-balanced copy of one training fold, read from or written to the cache.
+
+    Returns:
+    - tuple: (X_resampled, y_resampled, True if it came from the cache).
+    """
+    if cache_path is not None and os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            return cached['X'], cached['y'], True
+
+    X_resampled, y_resampled = SMOTE(random_state=seed).fit_resample(X_train, y_train)
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f'{cache_path}.{os.getpid()}.tmp.npz'
+        np.savez(temp_path, X=X_resampled, y=y_resampled)
+        os.replace(temp_path, cache_path)
+    return X_resampled, y_resampled, False
+
+
+def init_worker(X, y):
+    DATA['X'], DATA['y'] = X, y
+
+
+def fold_metrics(y_true, probabilities, threshold=0.5):
+    predictions = (probabilities >= threshold).astype(int)
+    return {
+        'precision': precision_score(y_true, predictions, zero_division=0),
+        'f1': f1_score(y_true, predictions, zero_division=0),
+        'accuracy': accuracy_score(y_true, predictions),
+        'log_loss': log_loss(y_true, probabilities, labels=[0, 1]),
+        'brier': brier_score_loss(y_true, probabilities),
+        'auc': roc_auc_score(y_true, probabilities) if len(np.unique(y_true)) == 2 else np.nan,
+    }
+
+
+def run_fold(job):
+    """
+    Resample, train and score one fold in a worker process.
+
+    Args:
+    - job (tuple): (fold, train_idx, val_idx, params, seed, cache_path, smote).
+
+    Returns:
+    - tuple: (fold, val_idx, validation probabilities, metrics dict).
+    """
+    fold, train_idx, val_idx, params, seed, cache_path, smote = job
+    X, y = DATA['X'], DATA['y']
+    start = timeit.default_timer()
+    if smote:
+        X_train, y_train, cached = resample_fold(X[train_idx], y[train_idx], seed, cache_path)
+    else:
+        X_train, y_train, cached = X[train_idx], y[train_idx], False
+    resampled = timeit.default_timer()
+
+    model = XGBClassifier(**{**params, 'n_jobs': 1})
+    model.fit(X_train, y_train, verbose=False)
+    probabilities = model.predict_proba(X[val_idx])[:, 1]
+
+    metrics = fold_metrics(y[val_idx], probabilities)
+    metrics.update({'fold': fold + 1, 'train_rows': len(y_train), 'val_rows': len(val_idx), 'cached': cached,
+                    'resample_seconds': resampled - start, 'fit_seconds': timeit.default_timer() - resampled})
+    return fold, val_idx, probabilities, metrics
+
+
+def run_cv(X, y, params=MODEL_PARAMS, n_splits=N_SPLITS, seed=42, workers=WORKERS, cache_dir=CACHE_DIR, smote=True):
+    """
+    Cross-validate a model with per-fold SMOTE, folds trained in parallel.
+
+    Args:
+    - X (pd.DataFrame): Features.
+    - y (pd.Series): Binary target.
+    - params (dict): XGBClassifier parameters.
+    - n_splits (int): Folds.
+    - seed (int): Seed for the fold split and SMOTE.
+    - workers (int): Worker processes.
+    - cache_dir (str): Where resampled folds are cached; None disables the cache.
+    - smote (bool): Balance each training fold with SMOTE.
+
+    Returns:
+    - dict: 'folds' (pd.DataFrame of per-fold metrics), 'oof' (pd.Series of out-of-fold
+      probabilities aligned to X) and 'oof_metrics' (metrics over all out-of-fold rows).
+    """
+    X_values = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    y_values = np.asarray(y, dtype=np.int8)
+    data_hash = dataset_hash(X, y)
+
+    kfold = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    jobs = [
+        (fold, train_idx, val_idx, params, seed,
+         resample_path(cache_dir, data_hash, n_splits, seed, fold) if cache_dir else None, smote)
+        for fold, (train_idx, val_idx) in enumerate(kfold.split(X_values, y_values))
+    ]
+
+    oof = np.full(len(y_values), np.nan)
+    rows = []
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, n_splits), initializer=init_worker,
+                                       initargs=(X_values, y_values))
+        results = executor.map(run_fold, jobs)
+    else:
+        # In-process, for one core or scripts that can't be re-imported by spawned workers
+        executor = None
+        init_worker(X_values, y_values)
+        results = map(run_fold, jobs)
+    try:
+        for fold, val_idx, probabilities, metrics in results:
+            oof[val_idx] = probabilities
+            rows.append(metrics)
+            print(f"Fold {fold + 1}: Precision = {metrics['precision']:.3f}, F1 Score = {metrics['f1']:.3f}, "
+                  f"Log Loss = {metrics['log_loss']:.3f}{' (cached SMOTE)' if metrics['cached'] else ''}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    folds = pd.DataFrame(rows).set_index('fold')
+    return {
+        'folds': folds,
+        'oof': pd.Series(oof, index=X.index, name='oof_probability'),
+        'oof_metrics': fold_metrics(y_values, oof),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cross-validate the model with per-fold SMOTE')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--splits', type=int, default=N_SPLITS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
+    X, y = load_training_data()
+    start = timeit.default_timer()
+    result = run_cv(X, y, n_splits=args.splits, seed=args.seed, workers=args.workers,
+                    cache_dir=None if args.no_cache else CACHE_DIR)
+    print(result['folds'].round(3))
+    print(f"out-of-fold: {', '.join(f'{name} {value:.3f}' for name, value in result['oof_metrics'].items())} "
+          f"in {timeit.default_timer() - start:.1f}s")
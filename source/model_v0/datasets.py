@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sys
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from feature_builder import build_features
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+
+# Training data as the model scripts prepare it: coll_data.csv (or the dated
+# final_preprocess.csv partitions it is collected from), weighted composites
+# from feature_builder, 'Home Cover' as the target and missing features filled
+# with their column means.
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+TRAINING_FILE = os.path.join(MODEL_DIR, 'coll_data.csv')  # NCB only; it has no league column
+TRAINING_START = '2024-11-10'
+TARGET = 'Home Cover'
+
+# Covers names identify a game in final_preprocess.csv and game_results.csv
+GAME_KEYS = ['Away Team Covers_current_season', 'Home Team Covers_current_season']
+
+# final_preprocess columns that are not model features (see append_and_drop.py)
+DROP_KEYWORDS = ['Underdog', 'Favorite', 'Team Covers_last', 'Team Covers_all', 'Unnamed']
+DROP_COLUMNS = [
+    'Away Team Covers_current_season', 'Away Team_current_season',
+    'Home Team_current_season', 'Home Team Covers_current_season',
+    'Home Team', 'Away Team', 'Time_current_season',
+    'Location_current_season', 'Hotness Score_current_season',
+    'Rank_current_season'
+]
+
+TIME_RANGE_WEIGHTS = {
+    'current_season': 0.6,
+    'last_10_seasons': 0.3,
+    'all_time': 0.1
+}
+
+
+def drop_non_features(df):
+    """final_preprocess rows reduced to the columns coll_data.csv keeps."""
+    columns = [column for column in df.columns if any(keyword in column for keyword in DROP_KEYWORDS)]
+    return df.drop(columns=columns + DROP_COLUMNS, errors='ignore').reset_index(drop=True)
+
+
+def load_partitions(league, start_date, end_date):
+    """
+    Every final_preprocess.csv between two dates, stacked with a 'date' column.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - start_date, end_date (str): Inclusive 'YYYY-MM-DD' bounds.
+
+    Returns:
+    - pd.DataFrame: Rows in date order; days without a file are skipped.
+    """
+    import final_preprocess  # Not at module level, so predict.py starts without the processing modules
+    start, end = datetime.strptime(str(start_date), '%Y-%m-%d'), datetime.strptime(str(end_date), '%Y-%m-%d')
+    frames = []
+    for i in range((end - start).days + 1):
+        date = (start + timedelta(days=i)).strftime('%Y-%m-%d')
+        path = final_preprocess.output_file(league, date)
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            df.insert(0, 'date', date)
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=['date'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def split_features(data):
+    """
+    Features and target of a built training frame.
+
+    Args:
+    - data (pd.DataFrame): Output of build_features, still holding TARGET.
+
+    Returns:
+    - tuple: (X float32 frame with NaN filled by column means, y int Series).
+    """
+    X = data.drop(columns=[TARGET]).astype(np.float32)
+    y = data[TARGET].astype(int)
+    return X.fillna(X.mean()), y
+
+
+def slate_features(df, weights=TIME_RANGE_WEIGHTS):
+    """
+    Model features for dated final_preprocess rows, built one slate at a time.
+
+    Returns:
+    - tuple: (game rows with date, team keys and result; float32 features aligned to them).
+    """
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    features = []
+    for _, day in df.groupby('date', sort=True):
+        # Ranks and other slate-relative features only see that day's games, as in predict.py
+        built = build_features(drop_non_features(day.drop(columns=['date'])), weights)
+        features.append(built.drop(columns=[TARGET], errors='ignore').astype(np.float32))
+    return df[['date'] + GAME_KEYS + [TARGET]], pd.concat(features, ignore_index=True)
+
+
+def training_features(data, weights=TIME_RANGE_WEIGHTS):
+    """
+    X and y from training rows, dropping rows without a result.
+
+    Dated final_preprocess rows are built per slate before the unplayed games are
+    dropped, so each row sees the slate predict.py would score it with.
+    coll_data.csv has no dates and is built as one frame.
+    """
+    if 'date' not in data:
+        # A missing stat ('--' ATS +/-) is NaN in the CSV; build_features counts it as 0
+        return split_features(build_features(data.dropna(subset=[TARGET]), weights))
+    games, X = slate_features(data, weights)
+    played = games[TARGET].notna().to_numpy()
+    X = X[played].reset_index(drop=True)
+    return X.fillna(X.mean()), games.loc[played, TARGET].astype(int).reset_index(drop=True)
+
+
+def load_training_data(path=TRAINING_FILE, weights=TIME_RANGE_WEIGHTS):
+    """X and y from the collected training CSV."""
+    return training_features(pd.read_csv(path), weights)
+
+
+def load_league_training_data(league, start_date=TRAINING_START, end_date=None, weights=TIME_RANGE_WEIGHTS):
+    """
+    X and y for one league, collected from its final_preprocess.csv partitions as append_and_drop.py does.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - start_date, end_date (str): Inclusive 'YYYY-MM-DD' bounds; end_date None means today.
+    - weights (dict): Time-range weights for build_features.
+
+    Returns:
+    - tuple: (X float32 frame, y int Series).
+    """
+    end_date = end_date or datetime.today().strftime('%Y-%m-%d')
+    partitions = load_partitions(league, start_date, end_date)
+    if partitions.empty:
+        raise FileNotFoundError(f'No {league} final_preprocess.csv between {start_date} and {end_date}')
+    return training_features(partitions, weights)
+
+
+def dataset_hash(X, y=None):
+    """
+    Content hash of a feature matrix (and target), used to key caches and saved artifacts.
+
+    Column names and order are part of the hash, so a changed feature set never
+    reuses results computed on another.
+    """
+    digest = hashlib.sha1()
+    digest.update('\x1f'.join(map(str, X.columns)).encode('utf-8'))
+    digest.update(np.ascontiguousarray(X.to_numpy(dtype=np.float32)).tobytes())
+    if y is not None:
+        digest.update(np.ascontiguousarray(np.asarray(y, dtype=np.int8)).tobytes())
+    return digest.hexdigest()[:16]
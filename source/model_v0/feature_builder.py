@@ -0,0 +1,158 @@
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+
+# Weighted multi-range features for the model.
+#
+# final_preprocess writes every stat three times, once per time range:
+#   'Away Team all_games_MOV_current_season', '..._last_10_seasons', '..._all_time'
+# FeatureBuilder groups those columns by base name once and stacks them into a
+# (rows, bases, ranges) float32 tensor, so every '{base}_weighted' composite for a
+# weight vector is a single tensor @ weights product. Sweeping weight vectors
+# reuses the tensor instead of rebuilding the frame.
+#
+#   python basketball_trends/source/model_v0/feature_builder.py --data coll_data.csv
+
+TIME_RANGES = ['current_season', 'last_10_seasons', 'all_time']
+FEATURE_DTYPE = np.float32
+
+
+def base_name(column, range_key):
+    return column.replace(f'_{range_key}', '')
+
+
+class FeatureBuilder:
+    """Range columns of a training frame, grouped by base name and stacked once."""
+
+    def __init__(self, df, time_ranges=TIME_RANGES):
+        self.df = df
+        self.time_ranges = list(time_ranges)
+
+        # base name -> [(range index, column)], bases in the order their composites are created
+        groups = {}
+        for k, range_key in enumerate(self.time_ranges):
+            for column in df.columns:
+                if range_key in column:
+                    groups.setdefault(base_name(column, range_key), []).append((k, column))
+        self.bases = list(groups)
+        self.range_columns = list(dict.fromkeys(column for members in groups.values() for _, column in members))
+
+        # Non-numeric cells count as 0, as they did when the frame was coerced in place
+        self.values = np.column_stack([
+            pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=FEATURE_DTYPE)
+            for column in self.range_columns
+        ]) if self.range_columns else np.zeros((len(df), 0), dtype=FEATURE_DTYPE)
+
+        # One 0/1 selection matrix maps range columns to (base, range) slots
+        position = {column: i for i, column in enumerate(self.range_columns)}
+        selection = np.zeros((len(self.range_columns), len(self.bases), len(self.time_ranges)), dtype=FEATURE_DTYPE)
+        for b, members in enumerate(groups.values()):
+            for k, column in members:
+                selection[position[column], b, k] += 1
+        self.stack = np.tensordot(self.values, selection, axes=1)  # (rows, bases, ranges)
+
+    @property
+    def weighted_columns(self):
+        return [f'{base}_weighted' for base in self.bases]
+
+    def weight_vector(self, weights):
+        """Dict of range -> weight as a vector aligned to time_ranges; missing ranges weigh 0."""
+        return np.array([weights.get(range_key, 0) for range_key in self.time_ranges], dtype=FEATURE_DTYPE)
+
+    def weighted(self, weights):
+        """
+        Every weighted composite for one weight vector.
+
+        Args:
+        - weights (dict): Range -> weight, e.g. {'current_season': 0.6, 'last_10_seasons': 0.3, 'all_time': 0.1}.
+
+        Returns:
+        - np.ndarray: C-contiguous float32 block, (rows, bases), columns in weighted_columns order.
+        """
+        return self.stack @ self.weight_vector(weights)
+
+    def sweep(self, weight_grid):
+        """
+        Composites for many weight vectors at once.
+
+        Args:
+        - weight_grid (list): Weight dicts.
+
+        Returns:
+        - np.ndarray: float32 (weight vectors, rows, bases).
+        """
+        matrix = np.stack([self.weight_vector(weights) for weights in weight_grid])
+        return np.moveaxis(self.stack @ matrix.T, -1, 0)
+
+    def features(self, weights):
+        """
+        Training frame with the range columns made numeric, the weighted block and the derived metrics.
+
+        Args:
+        - weights (dict): Range -> weight.
+
+        Returns:
+        - pd.DataFrame: Original columns, then '{base}_weighted', then the derived metrics.
+        """
+        range_block = pd.DataFrame(self.values, columns=self.range_columns, index=self.df.index)
+        weighted = pd.DataFrame(self.weighted(weights), columns=self.weighted_columns, index=self.df.index)
+        df = pd.concat([self.df.drop(columns=self.range_columns), range_block], axis=1)[list(self.df.columns)]
+        return add_derived_metrics(pd.concat([df, weighted], axis=1))
+
+
+def add_derived_metrics(df):
+    """Spread/odds differences, scoring metrics and their ranks from the weighted columns."""
+    derived = {}
+    try:
+        derived['Spread_Difference'] = df['Away Team Spread_weighted'] - df['Home Team Spread_weighted']
+        derived['Implied_Odds_Difference'] = df['Away Team Implied Odds_weighted'] - df['Home Team Implied Odds_weighted']
+    except KeyError as e:
+        print(f"Error creating Spread/Implied Odds Difference: {e}")
+
+    # Scoring metrics
+    for side in ['Away', 'Home']:
+        derived[f'{side}_Scoring_Metric'] = (pd.Series(0, index=df.index) + df.get(f'{side} Team MOV_weighted', 0)
+                                             + df.get(f'{side} Team ATS +/-_weighted', 0))
+    derived['MOV_ATS_Ratio'] = derived['Away_Scoring_Metric'] / (derived['Home_Scoring_Metric'] + 1e-9)
+
+    # Rankings
+    derived['Away_Rank'] = derived['Away_Scoring_Metric'].rank(ascending=False)
+    derived['Home_Rank'] = derived['Home_Scoring_Metric'].rank(ascending=False)
+
+    return pd.concat([df, pd.DataFrame(derived, index=df.index)], axis=1)
+
+
+def build_features(df, weights, time_ranges=TIME_RANGES):
+    """
+    Process sports data by combining time ranges with specified weights.
+
+    Args:
+    - df (pd.DataFrame): Input DataFrame containing sports data.
+    - weights (dict): Dictionary containing weights for time ranges.
+    - time_ranges (list): Range suffixes to combine.
+
+    Returns:
+    - pd.DataFrame: Processed DataFrame with weighted composite features.
+    """
+    return FeatureBuilder(df, time_ranges).features(weights)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the weighted feature build and a weight sweep')
+    parser.add_argument('--data', default='coll_data.csv')
+    parser.add_argument('--grid', type=int, default=11, help='Weight steps per range')
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data).dropna(subset=['Home Cover'])
+    start = timeit.default_timer()
+    builder = FeatureBuilder(data)
+    built = timeit.default_timer() - start
+
+    steps = np.linspace(0, 1, args.grid)
+    grid = [dict(zip(TIME_RANGES, (a, b, round(1 - a - b, 6)))) for a in steps for b in steps if a + b <= 1 + 1e-9]
+    start = timeit.default_timer()
+    builder.sweep(grid)
+    swept = timeit.default_timer() - start
+    print(f'{len(data)} rows, {len(builder.bases)} composites: built in {built * 1000:.1f} ms, '
+          f'{len(grid)} weight vectors in {swept * 1000:.1f} ms ({swept / len(grid) * 1000:.3f} ms each)')
@@ -0,0 +1,263 @@
+import argparse
+import itertools
+import json
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import xgboost as xgb
+from sklearn.model_selection import StratifiedKFold
+from cv_runner import CACHE_DIR, resample_fold, resample_path
+from datasets import MODEL_DIR, dataset_hash, load_training_data
+
+# Successive-halving search over model_time2's XGBoost grid.
+#
+# Every config (the grid without n_estimators) is trained for a few boosting
+# rounds on each CV fold; the best 1/ETA by mean validation log loss go on to
+# ETA times more rounds, and so on up to the largest n_estimators. Only the
+# last rung's survivors (81 of the 2187 configs with the default grid and ETA)
+# are scored at every n_estimators value, read from the same boosters via
+# iteration_range; configs dropped in earlier rungs never reach those budgets.
+#
+# Training folds are balanced with SMOTE as in cv_runner (resample_fold, same
+# fold split and cache), so the search tunes on the data model_time2 and
+# train_artifact fit on; validation folds stay unresampled. Workers build each
+# fold's QuantileDMatrix/DMatrix once and reuse them for every trial they run.
+# Finished trials are appended to TRIALS_FILE, keyed by dataset hash, so an
+# interrupted search resumes where it stopped.
+#
+#   python basketball_trends/source/model_v0/halving_search.py --workers 8
+#   python basketball_trends/source/model_v0/halving_search.py --limit 200 --min-rounds 5
+
+PARAM_GRID = {
+    'max_depth': [4, 5, 6],
+    'learning_rate': [0.01, 0.05, 0.1],
+    'n_estimators': [100, 150, 200],
+    'subsample': [0.7, 0.75, 0.8],
+    'colsample_bytree': [0.65, 0.7, 0.75],
+    'reg_alpha': [0.05, 0.1, 0.2],
+    'reg_lambda': [1.0, 1.5, 2.0],
+    'scale_pos_weight': [1.0, 1.5, 2.0]
+}
+BASE_PARAMS = {
+    'objective': 'binary:logistic',
+    'eval_metric': 'logloss',
+    'tree_method': 'hist',
+    'nthread': 1,  # One thread per worker process; the pool supplies the parallelism
+    'seed': 42,
+}
+
+ETA = 3
+MIN_ROUNDS = 10
+N_SPLITS = 5
+WORKERS = os.cpu_count() or 1
+TRIALS_FILE = os.path.join(MODEL_DIR, 'search', 'halving_trials.jsonl')
+
+# Per-process fold matrices, built once by init_worker
+FOLD_MATRICES = []
+
+
+def param_configs(grid=PARAM_GRID):
+    """Every combination of the grid except n_estimators, which is the budget."""
+    keys = [key for key in grid if key != 'n_estimators']
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def config_key(config):
+    return json.dumps(config, sort_keys=True)
+
+
+def rung_rounds(max_rounds, min_rounds=MIN_ROUNDS, eta=ETA):
+    """Boosting rounds per rung: min_rounds, min_rounds * eta, ... capped at max_rounds."""
+    rounds = [min_rounds]
+    while rounds[-1] < max_rounds:
+        rounds.append(min(rounds[-1] * eta, max_rounds))
+    return rounds
+
+
+def make_folds(y, n_splits=N_SPLITS, seed=42):
+    kfold = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return list(kfold.split(np.zeros(len(y)), y))
+
+
+def fold_data(X, y, folds, seed=42, smote=True, cache_dir=CACHE_DIR, data_hash=None):
+    """
+    Training and validation arrays per fold, training folds SMOTE-balanced as in cv_runner.
+
+    Returns:
+    - list: (X_train, y_train, X_val, y_val) per fold.
+    """
+    data = []
+    for fold, (train_idx, val_idx) in enumerate(folds):
+        X_train, y_train = X[train_idx], y[train_idx]
+        if smote:
+            cache_path = resample_path(cache_dir, data_hash, len(folds), seed, fold) if cache_dir else None
+            X_train, y_train, _ = resample_fold(X_train, y_train, seed, cache_path)
+        data.append((X_train, y_train, X[val_idx], y[val_idx]))
+    return data
+
+
+def init_worker(folds):
+    """Build each fold's training QuantileDMatrix and validation DMatrix once per process."""
+    FOLD_MATRICES.clear()
+    for X_train, y_train, X_val, y_val in folds:
+        dtrain = xgb.QuantileDMatrix(X_train, label=y_train)
+        dval = xgb.DMatrix(X_val, label=y_val)
+        FOLD_MATRICES.append((dtrain, dval, y_val))
+
+
+def log_loss(y_true, probabilities, eps=1e-15):
+    p = np.clip(probabilities, eps, 1 - eps)
+    return float(-np.mean(y_true * np.log(p) + (1 - y_true) * np.log(1 - p)))
+
+
+def run_trial(trial):
+    """
+    Train one config for `rounds` boosting rounds on every fold.
+
+    Args:
+    - trial (tuple): (config, rounds, eval_rounds), eval_rounds being the tree counts to score.
+
+    Returns:
+    - tuple: (config, rounds, {tree count: mean validation log loss}, seconds).
+    """
+    config, rounds, eval_rounds = trial
+    start = timeit.default_timer()
+    params = {**BASE_PARAMS, **config}
+    losses = {n: [] for n in eval_rounds}
+    for dtrain, dval, y_val in FOLD_MATRICES:
+        booster = xgb.train(params, dtrain, num_boost_round=rounds)
+        for n in eval_rounds:
+            losses[n].append(log_loss(y_val, booster.predict(dval, iteration_range=(0, n))))
+    scores = {n: float(np.mean(values)) for n, values in losses.items()}
+    return config, rounds, scores, timeit.default_timer() - start
+
+
+def load_trials(path, data_hash):
+    """Completed trials for this dataset: (config key, rounds) -> {tree count: loss}."""
+    trials = {}
+    if not os.path.exists(path):
+        return trials
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A line cut short by an interrupted run
+            if record['data'] == data_hash:
+                trials[(record['key'], record['rounds'])] = {int(n): loss for n, loss in record['scores'].items()}
+    return trials
+
+
+def successive_halving(X, y, grid=PARAM_GRID, eta=ETA, min_rounds=MIN_ROUNDS, n_splits=N_SPLITS,
+                       workers=WORKERS, trials_file=TRIALS_FILE, limit=None, seed=42, smote=True, cache_dir=CACHE_DIR):
+    """
+    Search the grid with successive halving on a process pool.
+
+    Args:
+    - X (pd.DataFrame): Features.
+    - y (pd.Series): Binary target.
+    - grid (dict): Parameter grid; n_estimators values set the round budget.
+    - eta (int): Keep the best 1/eta configs per rung, with eta times the rounds.
+    - min_rounds (int): Boosting rounds in the first rung.
+    - n_splits (int): CV folds per trial.
+    - workers (int): Worker processes.
+    - trials_file (str): JSON-lines file of completed trials; None disables resuming.
+    - limit (int): Only search this many configs, sampled with `seed`; None searches all.
+    - smote (bool): Balance each training fold with SMOTE, as the final model is trained.
+    - cache_dir (str): Resampled-fold cache shared with cv_runner; None disables it.
+
+    Returns:
+    - dict: 'params' (best config plus n_estimators), 'log_loss', 'trials', 'trials_per_sec' and per-rung reports.
+    """
+    X_values = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+    y_values = np.asarray(y, dtype=np.int8)
+    data_hash = dataset_hash(X, y)
+    folds = fold_data(X_values, y_values, make_folds(y_values, n_splits, seed), seed, smote, cache_dir, data_hash)
+    # Trials on balanced and unbalanced folds are not comparable, so they resume separately
+    trials_key = f'{data_hash}_smote' if smote else data_hash
+
+    configs = param_configs(grid)
+    if limit is not None and limit < len(configs):
+        picks = np.random.default_rng(seed).choice(len(configs), size=limit, replace=False)
+        configs = [configs[i] for i in sorted(picks)]
+    n_estimators = sorted(grid['n_estimators'])
+    rungs = rung_rounds(max(n_estimators), min_rounds, eta)
+
+    done = load_trials(trials_file, trials_key) if trials_file else {}
+    if trials_file:
+        os.makedirs(os.path.dirname(trials_file), exist_ok=True)
+
+    reports, total_trials, start = [], 0, timeit.default_timer()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(folds,)) as executor:
+        for r, rounds in enumerate(rungs):
+            last = r == len(rungs) - 1
+            eval_rounds = tuple(sorted({rounds} | ({n for n in n_estimators if n <= rounds} if last else set())))
+            scores = {}
+            pending = []
+            for config in configs:
+                cached = done.get((config_key(config), rounds))
+                if cached is not None and all(n in cached for n in eval_rounds):
+                    scores[config_key(config)] = cached
+                else:
+                    pending.append((config, rounds, eval_rounds))
+
+            rung_start = timeit.default_timer()
+            with open(trials_file, 'a', encoding='utf-8') if trials_file else open(os.devnull, 'w') as log:
+                for config, _, trial_scores, seconds in executor.map(run_trial, pending,
+                                                                     chunksize=max(1, len(pending) // (workers * 4))):
+                    key = config_key(config)
+                    scores[key] = trial_scores
+                    log.write(json.dumps({'data': trials_key, 'key': key, 'rounds': rounds,
+                                          'scores': trial_scores, 'seconds': round(seconds, 4)}) + '\n')
+                    log.flush()
+            elapsed = timeit.default_timer() - rung_start
+            total_trials += len(pending)
+
+            ranked = sorted(configs, key=lambda config: (scores[config_key(config)][rounds], config_key(config)))
+            reports.append({'rung': r, 'rounds': rounds, 'configs': len(configs), 'trained': len(pending),
+                            'resumed': len(configs) - len(pending), 'elapsed': elapsed,
+                            'trials_per_sec': len(pending) / elapsed if elapsed > 0 else 0.0,
+                            'best_log_loss': scores[config_key(ranked[0])][rounds]})
+            print(f"rung {r}: {len(configs)} configs x {rounds} rounds, {len(pending)} trained "
+                  f"({reports[-1]['trials_per_sec']:.1f} trials/s), {reports[-1]['resumed']} resumed, "
+                  f"best log loss {reports[-1]['best_log_loss']:.4f}")
+
+            if last:
+                # Only this rung's survivors were scored at every n_estimators, from their final boosters
+                # Ties on loss and rounds fall back to the config key, as in the ranking above; dicts don't compare
+                best_loss, best_n, best_config = min(
+                    ((scores[config_key(config)][n], n, config) for config in configs
+                     for n in eval_rounds if n in n_estimators),
+                    key=lambda trial: (trial[0], trial[1], config_key(trial[2]))
+                )
+                break
+            configs = ranked[:max(1, len(configs) // eta)]
+
+    elapsed = timeit.default_timer() - start
+    print(f'{total_trials} trials in {elapsed:.1f}s ({total_trials / elapsed if elapsed > 0 else 0:.1f} trials/s), '
+          f'best log loss {best_loss:.4f}: {dict(best_config, n_estimators=best_n)}')
+    return {
+        'params': dict(best_config, n_estimators=best_n),
+        'log_loss': best_loss,
+        'trials': total_trials,
+        'trials_per_sec': total_trials / elapsed if elapsed > 0 else 0.0,
+        'rungs': reports,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Successive-halving search over the XGBoost grid')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--eta', type=int, default=ETA)
+    parser.add_argument('--min-rounds', type=int, default=MIN_ROUNDS)
+    parser.add_argument('--splits', type=int, default=N_SPLITS)
+    parser.add_argument('--limit', type=int, default=None, help='Search a random subset of this many configs')
+    parser.add_argument('--trials-file', default=TRIALS_FILE)
+    parser.add_argument('--no-smote', action='store_true', help='Tune on the unbalanced training folds')
+    args = parser.parse_args()
+
+    X, y = load_training_data()
+    successive_halving(X, y, eta=args.eta, min_rounds=args.min_rounds, n_splits=args.splits, workers=args.workers,
+                       trials_file=args.trials_file, limit=args.limit, smote=not args.no_smote)
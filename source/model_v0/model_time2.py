@@ -6,55 +6,13 @@ from sklearn.metrics import log_loss, brier_score_loss, classification_report
 from xgboost import XGBClassifier
 from imblearn.over_sampling import SMOTE
 import matplotlib.pyplot as plt
+import os
+import sys
 
-def process_sports_data(df, weights):
-    """
-    Process sports data by combining time ranges with specified weights.
-    Args:
-    - df (pd.DataFrame): Input DataFrame containing sports data.
-    - weights (dict): Dictionary containing weights for time ranges.
-    Returns:
-    - pd.DataFrame: Processed DataFrame with weighted composite features.
-    """
-    time_ranges = ['current_season', 'last_10_seasons', 'all_time']
-    
-    
-    for range_key in time_ranges:
-        for col in df.columns:
-            if range_key in col:
-                base_col_name = col.replace(f"_{range_key}", "")
-                weighted_col_name = f"{base_col_name}_weighted"
-                
-                # Ensure numeric conversion
-                if col not in df.select_dtypes(include=[np.number]).columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                if weighted_col_name not in df:
-                    df[weighted_col_name] = 0
-                
-                # Handle NaN values
-                df[col].fillna(0, inplace=True)
-                
-                # Multiply only if column is numeric
-                df[weighted_col_name] += df[col] * weights.get(range_key, 0)
-    
-    # Create derived metrics
-    try:
-        df['Spread_Difference'] = df['Away Team Spread_weighted'] - df['Home Team Spread_weighted']
-        df['Implied_Odds_Difference'] = df['Away Team Implied Odds_weighted'] - df['Home Team Implied Odds_weighted']
-    except KeyError as e:
-        print(f"Error creating Spread/Implied Odds Difference: {e}")
-
-    # Scoring metrics
-    df['Away_Scoring_Metric'] = df.get('Away Team MOV_weighted', 0) + df.get('Away Team ATS +/-_weighted', 0)
-    df['Home_Scoring_Metric'] = df.get('Home Team MOV_weighted', 0) + df.get('Home Team ATS +/-_weighted', 0)
-    df['MOV_ATS_Ratio'] = df['Away_Scoring_Metric'] / (df['Home_Scoring_Metric'] + 1e-9)
-
-    # Rankings
-    df['Away_Rank'] = df['Away_Scoring_Metric'].rank(ascending=False)
-    df['Home_Rank'] = df['Home_Scoring_Metric'].rank(ascending=False)
-
-    return df
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+from odds import profit_per_unit
+from feature_builder import build_features
+from cv_runner import WORKERS, run_cv
 
 # Define weights
 time_range_weights = {
@@ -64,8 +22,8 @@ time_range_weights = {
 }
 
 # Load data
-data = pd.read_csv('coll_data.csv').dropna()
-data = process_sports_data(data, time_range_weights)
+data = pd.read_csv('coll_data.csv').dropna(subset=['Home Cover'])
+data = build_features(data, time_range_weights)
 
 # Split features and target
 X = data.drop(columns=['Home Cover'])
@@ -74,7 +32,7 @@ y = data['Home Cover'].astype(int)
 # Handle missing values
 X.fillna(X.mean(), inplace=True)
 
-# Train-test split
+# Train-test split (random, so later games train the model; walk_forward.py scores out of time)
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
 
 # SMOTE balancing
@@ -137,16 +95,12 @@ model = XGBClassifier(
 
 
 
-# K-Fold Cross-Validation
-kfold = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-for fold, (train_idx, val_idx) in enumerate(kfold.split(X_train, y_train)):
-    X_fold_train, X_fold_val = X_train.iloc[train_idx], X_train.iloc[val_idx]
-    y_fold_train, y_fold_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
+# K-Fold Cross-Validation: SMOTE inside each training fold only, folds in parallel.
+# Windows starts workers by re-running this unguarded script, so folds run in-process there.
+cv_results = run_cv(X_train, y_train, model.get_params(), workers=1 if os.name == 'nt' else WORKERS)
 
-    model.fit(X_train_balanced, y_train_balanced, eval_set=[(X_fold_val, y_fold_val)], verbose=False)
-    val_pred = model.predict(X_fold_val)
-    print(f"Fold {fold + 1}: Precision = {precision_score(y_fold_val, val_pred):.3f}, "
-          f"F1 Score = {f1_score(y_fold_val, val_pred):.3f}")
+# Final model on the whole balanced training split
+model.fit(X_train_balanced, y_train_balanced, verbose=False)
 
 # Adjust threshold
 probabilities = model.predict_proba(X_test)[:, 1]
@@ -202,28 +156,20 @@ def calculate_profit(probabilities, y_true, sample_size, threshold=0.55, wager=1
     - y_true (np.ndarray): Actual binary outcomes (0 or 1).
     - threshold (float): Probability threshold to classify as positive.
     - wager (float): Amount wagered per bet.
-    - odds (int): American odds for the bet (-110 by default).
+    - odds (int, str or array): American odds for the bet (-110 by default), or one line per bet.
 
     Returns:
     - float: Total profit or loss.
     """
-    # Convert American odds to decimal odds
-    if odds < 0:
-        payout = (100 / abs(odds)) * wager  # Profit for a winning $1 wager
-    else:
-        payout = (odds / 100) * wager
+    # Profit for a winning wager at each bet's line
+    payout = profit_per_unit(odds) * wager
 
     # Make predictions
-    predictions = (probabilities >= threshold).astype(int)
-
-    # Calculate profit or loss for each bet
-    profit = 0
-    for pred, actual in zip(predictions, y_true):
-        if pred == actual:  # Correct prediction
-            profit += payout
-        else:  # Incorrect prediction
-            profit -= wager
-        sample_size = sample_size + 1
+    predictions = (np.asarray(probabilities) >= threshold).astype(int)
+
+    # Calculate profit or loss for every bet at once
+    profit = np.where(predictions == np.asarray(y_true), payout, -wager).sum()
+    sample_size = sample_size + len(predictions)
 
     return profit, sample_size
 
@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from artifacts import ARTIFACT_DIR, load_artifact
+from datasets import GAME_KEYS, TIME_RANGE_WEIGHTS, drop_non_features
+from feature_builder import build_features
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'processing'))
+
+# Scores a day's slate with the model saved by train_artifact.py.
+#
+# The booster and its metadata are loaded once; each slate is then reduced to
+# the saved column order, missing features take the training means, and the
+# float32 matrix goes straight to Booster.inplace_predict with no DMatrix.
+# By default the slate is rebuilt in memory from the day's scraped trends and
+# odds (slate_builder), so it can run right after an odds poll; --saved scores
+# the final_preprocess.csv already on disk. The processing modules are imported
+# only when a slate is loaded, so constructing a Predictor pays for xgboost and
+# pandas alone.
+#
+#   python basketball_trends/source/model_v0/predict.py --league NCB
+#   python basketball_trends/source/model_v0/predict.py --league NBA --date 2024-12-09 --saved
+
+
+class Predictor:
+    """A saved model and the feature layout it was trained on."""
+
+    def __init__(self, league, root=ARTIFACT_DIR):
+        self.league = league
+        self.booster, self.meta = load_artifact(league, root)
+        self.columns = self.meta['columns']
+        self.fill_values = self.meta['fill_values']
+        self.threshold = self.meta['threshold']
+        self.weights = self.meta['weights'] or TIME_RANGE_WEIGHTS
+
+    def features(self, df):
+        """final_preprocess rows as a float32 matrix in the model's column order."""
+        built = build_features(drop_non_features(df), self.weights)
+        X = built.reindex(columns=self.columns).to_numpy(dtype=np.float32)
+        return np.where(np.isnan(X), self.fill_values, X)
+
+    def predict(self, df):
+        """
+        Score a slate.
+
+        Args:
+        - df (pd.DataFrame): final_preprocess rows for the slate.
+
+        Returns:
+        - pd.DataFrame: The Covers team columns, 'probability' of a home cover and
+          'Home Cover Pick' where it reaches the saved threshold.
+        """
+        if df.empty:
+            return pd.DataFrame(columns=GAME_KEYS + ['probability', 'Home Cover Pick'])
+        probabilities = self.booster.inplace_predict(self.features(df))
+        return df[GAME_KEYS].reset_index(drop=True).assign(
+            probability=probabilities, **{'Home Cover Pick': probabilities >= self.threshold}
+        )
+
+
+def load_slate(league, date, saved=False):
+    """A day's final_preprocess rows, read from disk or rebuilt in memory."""
+    if saved:
+        import final_preprocess
+        return pd.read_csv(final_preprocess.output_file(league, date))
+    import slate_builder
+    return slate_builder.build_slate(league, date, save=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score a day's slate with the saved model")
+    parser.add_argument('--league', choices=['NBA', 'NCB'], default='NCB')
+    parser.add_argument('--date', default=datetime.today().strftime('%Y-%m-%d'))
+    parser.add_argument('--saved', action='store_true', help='Score the saved final_preprocess.csv')
+    parser.add_argument('--output', default=None, help='Write the predictions to this CSV')
+    args = parser.parse_args()
+
+    start = timeit.default_timer()
+    predictor = Predictor(args.league)
+    loaded = timeit.default_timer()
+    slate = load_slate(args.league, args.date, args.saved)
+    built = timeit.default_timer()
+    predictions = predictor.predict(slate)
+    scored = timeit.default_timer()
+
+    print(predictions.round(3).to_string(index=False))
+    print(f"{args.league} {args.date}: {len(predictions)} games, threshold {predictor.threshold:.3f}; "
+          f"model {(loaded - start) * 1000:.1f} ms, slate {(built - loaded) * 1000:.1f} ms, "
+          f"scoring {(scored - built) * 1000:.1f} ms")
+    if args.output:
+        predictions.to_csv(args.output, index=False)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtest import BANKROLL, backtest, backtest_games
+from datasets import TARGET
+
+THRESHOLDS = [0.5, 0.55, 0.6, 0.7]
+STAKES = [('flat', 1.0), ('flat', 2.5), ('kelly', 0.25), ('kelly', 1.0)]
+
+
+def american_to_decimal(odds):
+    odds = int(str(odds).replace('−', '-'))
+    return 1 + (odds / 100 if odds > 0 else 100 / -odds)
+
+
+def grade_loop(probabilities, home_cover, home_odds, away_odds, threshold, kind, size, sides='both',
+               bankroll=BANKROLL):
+    """One configuration graded a game at a time, the way the bets would be placed."""
+    equity = bankroll if kind == 'kelly' else 0.0
+    start, peak, drawdown = equity, equity, 0.0
+    bets = wins = 0
+    staked = 0.0
+    for p, covered, home, away in zip(probabilities, home_cover, home_odds, away_odds):
+        if p >= threshold:
+            q, b, won = p, american_to_decimal(home) - 1, covered
+        elif sides == 'both' and 1 - p >= threshold:
+            q, b, won = 1 - p, american_to_decimal(away) - 1, not covered
+        else:
+            continue
+        stake = size if kind == 'flat' else size * max((b * q - (1 - q)) / b, 0) * equity
+        if stake <= 0:
+            continue
+        bets += 1
+        wins += bool(won)
+        staked += stake
+        equity += stake * b if won else -stake
+        peak = max(peak, equity)
+        drawdown = max(drawdown, peak - equity)
+    profit = equity - start
+    return {'bets': bets, 'wins': wins, 'staked': staked, 'profit': profit,
+            'roi': profit / staked if staked else 0.0, 'max_drawdown': drawdown}
+
+
+def games(n=200, seed=7):
+    rng = np.random.default_rng(seed)
+    prices = np.array(['−110', '−105', '+100', '−120', '+105', '−115'], dtype=object)
+    return (rng.uniform(0.25, 0.8, n), rng.random(n) < 0.5, rng.choice(prices, n), rng.choice(prices, n))
+
+
+@pytest.mark.parametrize('sides', ['both', 'home'])
+def test_matches_per_game_loop(sides):
+    probabilities, home_cover, home_odds, away_odds = games()
+    results = backtest(probabilities, home_cover, home_odds, away_odds, THRESHOLDS, STAKES, sides)
+    assert len(results) == len(THRESHOLDS) * len(STAKES)
+
+    for row in results.itertuples(index=False):
+        expected = grade_loop(probabilities, home_cover, home_odds, away_odds, row.threshold, row.stake, row.size,
+                              sides)
+        assert (row.bets, row.wins) == (expected['bets'], expected['wins']), row
+        for field in ['staked', 'profit', 'roi', 'max_drawdown']:
+            assert np.isclose(getattr(row, field), expected[field], rtol=1e-9, atol=1e-9), (field, row)
+
+
+def test_no_bets_above_every_threshold():
+    probabilities, home_cover, home_odds, away_odds = games(20)
+    results = backtest(np.full(20, 0.5), home_cover, home_odds, away_odds, [0.6], STAKES)
+    assert (results[['bets', 'wins', 'staked', 'profit', 'roi', 'max_drawdown']] == 0).all().all()
+
+
+def test_games_are_graded_in_date_order_without_unplayed_games():
+    probabilities, home_cover, home_odds, away_odds = games(60, seed=3)
+    df = pd.DataFrame({'date': pd.date_range('2024-11-10', periods=60).strftime('%Y-%m-%d'),
+                       'probability': probabilities, TARGET: home_cover.astype(float),
+                       'Home Odds': home_odds, 'Away Odds': away_odds})
+    df.loc[[4, 17], TARGET] = np.nan
+    shuffled = df.sample(frac=1, random_state=1)
+
+    played = df[df[TARGET].notna()]
+    expected = backtest(played['probability'], played[TARGET].astype(bool), played['Home Odds'], played['Away Odds'],
+                        THRESHOLDS, STAKES)
+    pd.testing.assert_frame_equal(backtest_games(shuffled, thresholds=THRESHOLDS, stakes=STAKES), expected)
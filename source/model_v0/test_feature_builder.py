@@ -0,0 +1,86 @@
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from datasets import TARGET, TIME_RANGE_WEIGHTS, TRAINING_FILE
+from feature_builder import FeatureBuilder, build_features
+
+
+def process_sports_data(df, weights):
+    """model_time2's feature step before feature_builder, kept as the reference it replaced."""
+    time_ranges = ['current_season', 'last_10_seasons', 'all_time']
+    for range_key in time_ranges:
+        for col in df.columns:
+            if range_key in col:
+                base_col_name = col.replace(f"_{range_key}", "")
+                weighted_col_name = f"{base_col_name}_weighted"
+                if col not in df.select_dtypes(include=[np.number]).columns:
+                    df[col] = pd.to_numeric(df[col], errors='coerce')
+                if weighted_col_name not in df:
+                    df[weighted_col_name] = 0
+                df[col].fillna(0, inplace=True)
+                df[weighted_col_name] += df[col] * weights.get(range_key, 0)
+
+    try:
+        df['Spread_Difference'] = df['Away Team Spread_weighted'] - df['Home Team Spread_weighted']
+        df['Implied_Odds_Difference'] = df['Away Team Implied Odds_weighted'] - df['Home Team Implied Odds_weighted']
+    except KeyError as e:
+        print(f"Error creating Spread/Implied Odds Difference: {e}")
+
+    df['Away_Scoring_Metric'] = df.get('Away Team MOV_weighted', 0) + df.get('Away Team ATS +/-_weighted', 0)
+    df['Home_Scoring_Metric'] = df.get('Home Team MOV_weighted', 0) + df.get('Home Team ATS +/-_weighted', 0)
+    df['MOV_ATS_Ratio'] = df['Away_Scoring_Metric'] / (df['Home_Scoring_Metric'] + 1e-9)
+
+    df['Away_Rank'] = df['Away_Scoring_Metric'].rank(ascending=False)
+    df['Home_Rank'] = df['Home_Scoring_Metric'].rank(ascending=False)
+    return df
+
+
+def reference(df, weights):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # Chained inplace fillna and frame fragmentation
+        return process_sports_data(df.copy(), weights)
+
+
+def assert_same_features(new, old):
+    assert list(new.columns) == list(old.columns)
+    for column in old.columns:
+        expected = pd.to_numeric(old[column], errors='coerce').to_numpy(dtype=float)
+        actual = pd.to_numeric(new[column], errors='coerce').to_numpy(dtype=float)
+        if column.endswith('_Rank'):
+            assert np.array_equal(actual, expected, equal_nan=True), column
+        else:
+            assert np.allclose(actual, expected, rtol=1e-5, atol=1e-4, equal_nan=True), column
+
+
+@pytest.mark.parametrize('weights', [TIME_RANGE_WEIGHTS, {'current_season': 1.0},
+                                     {'current_season': 0.2, 'last_10_seasons': 0.5, 'all_time': 0.3}])
+def test_matches_process_sports_data_on_training_data(weights):
+    data = pd.read_csv(TRAINING_FILE).dropna(subset=[TARGET])
+    assert_same_features(build_features(data, weights), reference(data, weights))
+
+
+def test_matches_process_sports_data_on_text_and_missing_values():
+    data = pd.DataFrame({
+        'Away Team Spread_current_season': ['+3.5', '-2', None],
+        'Away Team Spread_last_10_seasons': [3.5, -2.0, 1.0],
+        'Home Team Spread_current_season': ['-3.5', '+2', '--'],
+        'Away Team MOV_current_season': [1.5, np.nan, -4.0],
+        'Away Team MOV_all_time': [0.5, 2.0, np.nan],
+        'Home Team ATS +/-_current_season': ['--', '0.3', '-1.1'],
+        'Location_current_season_map': [1, 2, 3],
+        TARGET: [True, False, True],
+    })
+    # No odds columns: both print the same KeyError and skip the differences
+    assert_same_features(build_features(data, TIME_RANGE_WEIGHTS), reference(data, TIME_RANGE_WEIGHTS))
+
+
+def test_does_not_modify_input_and_sweep_matches():
+    data = pd.read_csv(TRAINING_FILE).dropna(subset=[TARGET])
+    before = data.copy()
+    builder = FeatureBuilder(data)
+    grid = [TIME_RANGE_WEIGHTS, {'current_season': 1.0}]
+    swept = builder.sweep(grid)
+    pd.testing.assert_frame_equal(data, before)
+    for block, weights in zip(swept, grid):
+        assert np.allclose(block, builder.weighted(weights))
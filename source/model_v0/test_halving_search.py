@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+from halving_search import successive_halving
+
+
+def test_tied_configs_pick_the_first_key():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(120, 4)), columns=list('abcd'))
+    y = pd.Series((X['a'] + rng.normal(size=120) > 0).astype(int))
+    # verbosity never changes a tree, so both configs tie on loss and rounds
+    grid = {'max_depth': [2], 'verbosity': [1, 0], 'n_estimators': [4]}
+
+    result = successive_halving(X, y, grid=grid, min_rounds=4, n_splits=3, workers=1, trials_file=None,
+                                cache_dir=None)
+    assert result['params'] == {'max_depth': 2, 'verbosity': 0, 'n_estimators': 4}
+    assert result['trials'] == 2
@@ -0,0 +1,43 @@
+import os
+import numpy as np
+import pytest
+from cv_runner import MODEL_PARAMS
+from datasets import TARGET, dataset_hash, load_league_training_data, load_partitions
+from predict import Predictor
+from train_artifact import train_artifact
+import final_preprocess  # On sys.path once datasets is imported
+
+# Partitions are the final_preprocess.csv files committed under source/proc_data
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+START, END = '2024-11-10', '2024-12-07'
+
+
+@pytest.fixture
+def partitions(monkeypatch):
+    monkeypatch.setattr(final_preprocess, 'BASE_PATH', SOURCE_DIR)
+    partitions = load_partitions('NCB', START, END)
+    if partitions.empty:
+        pytest.skip('no NCB final_preprocess.csv in proc_data')
+    return partitions
+
+
+def test_served_features_match_training_rows(partitions, tmp_path):
+    params = {**MODEL_PARAMS, 'n_estimators': 5}
+    train_artifact('NCB', params=params, workers=1, root=str(tmp_path), start_date=START, end_date=END,
+                   cache_dir=None)
+    predictor = Predictor('NCB', root=str(tmp_path))
+    X, y = load_league_training_data('NCB', START, END)
+    assert predictor.meta['data_hash'] == dataset_hash(X, y)
+
+    served = []
+    for _, day in partitions.groupby('date', sort=True):
+        features = predictor.features(day.drop(columns=['date']))
+        served.append(features[day[TARGET].notna().to_numpy()])
+        # Ranks are relative to the slate being scored
+        ranks = features[:, [predictor.columns.index('Away_Rank'), predictor.columns.index('Home_Rank')]]
+        assert ranks.max() <= len(day)
+    served = np.concatenate(served).astype(np.float32)
+
+    assert list(X.columns) == predictor.columns
+    assert np.array_equal(served, X.to_numpy(dtype=np.float32))
+    assert X['Away_Rank'].max() <= partitions.groupby('date').size().max()
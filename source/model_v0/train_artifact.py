@@ -0,0 +1,76 @@
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE
+from sklearn.metrics import roc_curve
+from xgboost import XGBClassifier
+from artifacts import ARTIFACT_DIR, save_artifact
+from cv_runner import CACHE_DIR, MODEL_PARAMS, WORKERS, run_cv
+from datasets import TIME_RANGE_WEIGHTS, TRAINING_START, dataset_hash, load_league_training_data, training_features
+
+# Trains model_time2's model on the collected training data and saves it with
+# artifacts.save_artifact for predict.py. The threshold is picked as in
+# model_time2 (Youden's J on the ROC curve), but over out-of-fold probabilities
+# from cv_runner instead of a held-out split, so the final model trains on every row.
+# Each league trains on its own dated final_preprocess.csv partitions; --data
+# trains on a CSV of those rows instead. Features are built one slate (date) at
+# a time, as predict.py builds them, so slate-relative columns such as the ranks
+# are on the same scale in training and scoring. coll_data.csv has no dates and
+# can't be used here.
+#
+#   python basketball_trends/source/model_v0/train_artifact.py --league NBA
+#   python basketball_trends/source/model_v0/train_artifact.py --league NCB --start 2024-11-10 --end 2024-12-07
+
+
+def youden_threshold(y_true, probabilities):
+    """Probability threshold maximizing TPR - FPR."""
+    fpr, tpr, thresholds = roc_curve(y_true, probabilities)
+    return float(min(thresholds[np.argmax(tpr - fpr)], 1.0))
+
+
+def train_artifact(league, path=None, params=MODEL_PARAMS, weights=TIME_RANGE_WEIGHTS, workers=WORKERS,
+                   root=ARTIFACT_DIR, start_date=TRAINING_START, end_date=None, cache_dir=CACHE_DIR):
+    """
+    Cross-validate, fit on all rows and save the model for a league.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - path (str): CSV of this league's final_preprocess rows with a 'date' column; None collects the
+      league's partitions.
+    - start_date, end_date (str): Partition dates to train on when path is None.
+    - cache_dir (str): cv_runner's SMOTE fold cache; None disables it.
+
+    Returns:
+    - str: Directory the artifact was saved to.
+    """
+    if path is None:
+        X, y = load_league_training_data(league, start_date, end_date, weights)
+    else:
+        data = pd.read_csv(path)
+        if 'date' not in data:
+            raise ValueError(f"{path} has no 'date' column; features are built per slate, as predict.py builds them")
+        X, y = training_features(data, weights)
+    cv_results = run_cv(X, y, params, workers=workers, cache_dir=cache_dir)
+    threshold = youden_threshold(y, cv_results['oof'])
+
+    X_balanced, y_balanced = SMOTE(random_state=42).fit_resample(X, y)
+    model = XGBClassifier(**params)
+    model.fit(X_balanced, y_balanced, verbose=False)
+
+    return save_artifact(league, model, X.columns, X.mean(), threshold, dataset_hash(X, y), params, weights,
+                         cv_results['oof_metrics'], root)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the model and save it for predict.py')
+    parser.add_argument('--league', choices=['NBA', 'NCB'], default='NCB')
+    parser.add_argument('--data', default=None, help="CSV of this league's dated final_preprocess rows instead of its partitions")
+    parser.add_argument('--start', default=TRAINING_START)
+    parser.add_argument('--end', default=None)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    start = timeit.default_timer()
+    directory = train_artifact(args.league, args.data, workers=args.workers, start_date=args.start, end_date=args.end)
+    print(f'Saved {args.league} model to {directory} in {timeit.default_timer() - start:.1f}s')
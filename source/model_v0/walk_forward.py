@@ -0,0 +1,116 @@
+import argparse
+import timeit
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from backtest import attach_odds, backtest_games
+from cv_runner import MODEL_PARAMS, booster_params
+from datasets import TARGET, load_partitions, slate_features
+
+# Walk-forward evaluation over the dated final_preprocess.csv partitions.
+#
+# Each day's slate is scored by a model trained only on the days before it.
+# Between full retrains the booster is warm-started: WARM_ROUNDS trees fit on
+# the newly graded days are added to the previous booster (xgb_model=), so a
+# season costs a handful of cold fits instead of one per day. Features are
+# built per slate, as they are at prediction time, and missing values are
+# filled with the training rows' means.
+#
+#   python basketball_trends/source/model_v0/walk_forward.py --league NCB --start 2024-11-10 --output walk_forward.csv
+
+MIN_TRAIN_DAYS = 7
+WARM_ROUNDS = 10
+FULL_RETRAIN_EVERY = 7
+
+
+def walk_forward(games, X, params=MODEL_PARAMS, min_train_days=MIN_TRAIN_DAYS, warm_rounds=WARM_ROUNDS,
+                 full_retrain_every=FULL_RETRAIN_EVERY):
+    """
+    Score every slate after the first min_train_days with a model trained on earlier days only.
+
+    Args:
+    - games (pd.DataFrame): 'date', team keys and TARGET per row, in date order.
+    - X (pd.DataFrame): Features aligned to games.
+    - params (dict): XGBClassifier-style parameters; n_estimators sets a full fit's rounds.
+    - min_train_days (int): Days of results before the first slate is scored.
+    - warm_rounds (int): Trees added per warm-started refit.
+    - full_retrain_every (int): Slates between cold refits on all prior days.
+
+    Returns:
+    - pd.DataFrame: games rows that were scored, with 'probability' and the 'fit' ('full' or 'warm') used.
+    """
+    train_params, full_rounds = booster_params(params)
+    dates = np.asarray(games['date'])
+    graded = games[TARGET].notna().to_numpy()
+    y = games[TARGET].eq(True).to_numpy(dtype=np.int8)
+    days = sorted(set(dates))
+
+    booster, fitted_through, since_full = None, None, 0
+    scored = []
+    for i, day in enumerate(days[min_train_days:], start=min_train_days):
+        prior = graded & (dates < day)
+        if not prior.any():
+            continue
+        means = X[prior].mean()
+
+        if booster is None or since_full >= full_retrain_every:
+            # Cold fit on every graded row before this slate
+            dtrain = xgb.DMatrix(X[prior].fillna(means), label=y[prior])
+            booster = xgb.train(train_params, dtrain, num_boost_round=full_rounds)
+            fit, since_full = 'full', 0
+        else:
+            # Add trees fit on the days graded since the last refit
+            new = prior & (dates > fitted_through)
+            if new.any():
+                dtrain = xgb.DMatrix(X[new].fillna(means), label=y[new])
+                booster = xgb.train(train_params, dtrain, num_boost_round=warm_rounds, xgb_model=booster)
+            fit = 'warm'
+        fitted_through = days[i - 1]
+        since_full += 1
+
+        today = dates == day
+        probabilities = booster.predict(xgb.DMatrix(X[today].fillna(means)))
+        scored.append(games[today].assign(probability=probabilities, fit=fit))
+
+    return pd.concat(scored, ignore_index=True) if scored else games.iloc[:0].assign(probability=[], fit=[])
+
+
+def summarize(predictions):
+    """Accuracy and log loss over the graded walk-forward predictions."""
+    graded = predictions[predictions[TARGET].notna()]
+    y, p = graded[TARGET].eq(True).to_numpy(dtype=int), np.clip(graded['probability'].to_numpy(), 1e-15, 1 - 1e-15)
+    return {
+        'slates': predictions['date'].nunique(),
+        'games': len(predictions),
+        'graded': len(graded),
+        'accuracy': float(((p >= 0.5) == y).mean()) if len(y) else np.nan,
+        'log_loss': float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))) if len(y) else np.nan,
+        'full_fits': int((predictions.groupby('date')['fit'].first() == 'full').sum()),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Walk-forward evaluation with warm-started refits')
+    parser.add_argument('--league', choices=['NBA', 'NCB'], default='NCB')
+    parser.add_argument('--start', default='2024-11-10')
+    parser.add_argument('--end', default=datetime.today().strftime('%Y-%m-%d'))
+    parser.add_argument('--min-train-days', type=int, default=MIN_TRAIN_DAYS)
+    parser.add_argument('--warm-rounds', type=int, default=WARM_ROUNDS)
+    parser.add_argument('--full-every', type=int, default=FULL_RETRAIN_EVERY)
+    parser.add_argument('--output', default=None, help='CSV of per-game predictions, readable by backtest.py')
+    args = parser.parse_args()
+
+    start = timeit.default_timer()
+    games, X = slate_features(load_partitions(args.league, args.start, args.end))
+    predictions = walk_forward(games, X, min_train_days=args.min_train_days, warm_rounds=args.warm_rounds,
+                               full_retrain_every=args.full_every)
+    summary = summarize(predictions)
+    print(f"{args.league}: {summary['slates']} slates, {summary['graded']}/{summary['games']} games graded, "
+          f"accuracy {summary['accuracy']:.3f}, log loss {summary['log_loss']:.3f}, "
+          f"{summary['full_fits']} full fits, {timeit.default_timer() - start:.1f}s")
+
+    if args.output:
+        predictions.to_csv(args.output, index=False)
+    results = backtest_games(attach_odds(predictions, args.league))
+    print(results[results['bets'] > 0].sort_values('profit', ascending=False).head(5).round(3).to_string(index=False))
@@ -1,7 +1,19 @@
-import pandas as pd
 import glob
 import os
 from datetime import datetime, timedelta
+from manifest import Manifest, partition_key
+from trend_dataset import aggregate, ingest_partition, load_trends
+
+MANIFEST_VERSION = 2  # 2: typed trend fields
+
+
+def input_files(date, league, type, range):
+    return sorted(glob.glob(f"basketball_trends/source/raw_data/{league}/{date}/{type}/{range}/*.csv"))
+
+
+def output_file(date, league, type, range):
+    return f'basketball_trends/source/proc_data/agg_raw/{league}/{date}/{type}/{range}_aggregated.csv'
+
 
 def agg_files(date, league, type, range):
     # Validate inputs
@@ -16,53 +28,60 @@ def agg_files(date, league, type, range):
     if range not in allowed_ranges:
         raise ValueError(f"Invalid range: {range}. Allowed values are {allowed_ranges}.")
 
-    # Define the path to the folder containing the CSV files
-    path = f"basketball_trends/source/raw_data/{league}/{date}/{type}/{range}"
-    filenames = glob.glob(path + "/*.csv")
-
-    # Initialize an empty list to store DataFrames
-    dfs = []
-
-    # Loop through the filenames and process each file
-    for filename in filenames:
-        # Extract the base file name (to use as a new column prefix)
-        base_name = os.path.basename(filename).replace('.csv', '')
-        
-        # Read the CSV file into a DataFrame
-        df = pd.read_csv(filename)
-        
-        # Add a multi-level column index (team as the row index, stats with file name as prefix)
-        df = df.set_index('Team').add_prefix(base_name + '_')
-        
-        # Append to the list of DataFrames
-        dfs.append(df)
-
-    # Merge all DataFrames horizontally by index (Team)
-    big_frame = pd.concat(dfs, axis=1)
+    # Fold the partition's situation CSVs into the trend dataset, typed
+    df = ingest_partition(league, date, type, range)
+    if df is None:
+        raise FileNotFoundError(f"No trend CSVs for {league}/{date}/{type}/{range}")
+
+    # One row per team, '{situation}_{stat}' columns
+    big_frame = aggregate(df)
 
     # Define the output path
-    output_path = f'basketball_trends/source/proc_data/agg_raw/{league}/{date}/{type}'
-    os.makedirs(output_path, exist_ok=True)
+    output_path = output_file(date, league, type, range)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     # Save the DataFrame to a CSV file
-    big_frame.to_csv(os.path.join(output_path, f'{range}_aggregated.csv'))
+    big_frame.to_csv(output_path)
     # print(f'Agg csv saved to {output_path}')
 
 
-def main():
+def agg_season(league, type, range, start_date=None, end_date=None):
+    """
+    Aggregate every ingested date of a league/type/range in one dataset scan.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - type (str): 'ou' or 'ats'.
+    - range (str): Team Rankings range folder.
+    - start_date, end_date (str): Optional inclusive 'YYYY-MM-DD' bounds.
+
+    Returns:
+    - pd.DataFrame: agg_raw layout indexed by (date, Team).
+    """
+    df = load_trends([league], types=[type], ranges=[range], start_date=start_date, end_date=end_date)
+    return aggregate(df.drop(columns=['league', 'type', 'range']))
+
+
+def main(force=False):
     allowed_leagues = ['NBA', 'NCB']
     allowed_types = ['ou', 'ats']
     allowed_ranges = ['yearly_since_2014_2015', 'yearly_all', 'yearly_2024_2025']  # Replace with actual allowed range values
-    for x in range(0, 29):
-        date = (datetime.today() - timedelta(days=x)).date()
-
-        for league in allowed_leagues:
-            for type_ in allowed_types:
-                for range_ in allowed_ranges:
-                    try:
-                        agg_files(date, league, type_, range_)
-                    except:
-                        print('agg_csvs_error', date)
+    with Manifest('agg_csv_files', version=MANIFEST_VERSION) as manifest:
+        for x in range(0, 29):
+            date = (datetime.today() - timedelta(days=x)).date()
+
+            for league in allowed_leagues:
+                for type_ in allowed_types:
+                    for range_ in allowed_ranges:
+                        inputs = input_files(date, league, type_, range_)
+                        if not inputs:
+                            continue  # Nothing scraped for this partition
+                        try:
+                            manifest.run(partition_key(league, date, type_, range_), inputs,
+                                         [output_file(date, league, type_, range_)],
+                                         lambda: agg_files(date, league, type_, range_), force)
+                        except:
+                            print('agg_csvs_error', date)
     print(f'agg_csv_ran')
 
 
@@ -1,7 +1,11 @@
 import pandas as pd
 import os
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trend_normalizer import normalize_table
+
 def norm_ats(date, league, type, range):
     # Format the date as a string for the file path
     date_str = date.strftime('%Y-%m-%d')
@@ -15,21 +19,20 @@ def norm_ats(date, league, type, range):
         return
 
     # Read and process the data
-    df = pd.read_csv(file_path)
+    df = normalize_table(pd.read_csv(file_path, dtype=str))
     print("Columns in the file:", df.columns)
 
-    df['Cover %'] = df['Cover %'].str.rstrip('%').astype(float)
-    df['gp'] = df['ATS Record'].apply(lambda x: sum(map(int, x.split('-'))))
+    df['gp'] = df['wins'] + df['losses'] + df['pushes']
 
-    columns = ['gp', 'Cover %', 'MOV', 'ATS +/-']
+    columns = ['gp', 'cover_pct', 'mov', 'ats_pm']
     for column in columns:
-        df[f'norm_{column}'] = df[column].apply(lambda x: (x - df[column].min()) / (df[column].max() - df[column].min()))
+        df[f'norm_{column}'] = (df[column] - df[column].min()) / (df[column].max() - df[column].min())
 
     df['good_score'] = (
         df['norm_gp'] * 0.15 +
-        df['norm_Cover %'] * 0.3 +
-        df['norm_ATS +/-'] * 0.2 +
-        df['norm_MOV'] * 0.35
+        df['norm_cover_pct'] * 0.3 +
+        df['norm_ats_pm'] * 0.2 +
+        df['norm_mov'] * 0.35
     )
 
     result_df = df[['Team', 'gp', 'good_score']].sort_values(by='good_score', ascending=False)
@@ -0,0 +1,221 @@
+import argparse
+import os
+import timeit
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from tqdm import tqdm
+import agg_csv_files
+import combine_ranges
+import final_preprocess
+import game_preview_v2
+import pre_process
+from manifest import MANIFEST_DIR, Manifest, partition_key
+
+# Rebuilds the preview pipeline over a date range with every core.
+# Stages run in dependency order; within a stage every (league, date, ...)
+# partition is independent, so dirty partitions are fanned out over a process
+# pool in chunks. Only the parent process reads or writes the manifests.
+#
+#   python basketball_trends/source/processing/backfill.py --start 2024-11-10
+#   python basketball_trends/source/processing/backfill.py --start 2024-12-01 --stages preview final --force
+
+LEAGUES = ['NBA', 'NCB']
+TYPES = ['ou', 'ats']
+RANGES = ['yearly_since_2014_2015', 'yearly_all', 'yearly_2024_2025']
+WORKERS = os.cpu_count() or 1
+
+
+def agg_partitions(league, date):
+    return [(date, league, type_, range_) for type_ in TYPES for range_ in RANGES]
+
+
+def pre_process_partitions(league, date):
+    return [(date, league, 'ats', range_) for range_ in RANGES]
+
+
+def preview_partitions(league, date):
+    return [(league, date, range_) for range_ in combine_ranges.RANGE_FILES]
+
+
+def day_partitions(league, date):
+    return [(league, date)]
+
+
+# name -> manifest stage and version, partitions per league-day, the partition's key in the
+# stage's own manifest, inputs (required ones must exist to build), outputs and build function
+STAGES = {
+    'agg': {
+        'manifest': 'agg_csv_files',
+        'version': agg_csv_files.MANIFEST_VERSION,
+        'partitions': agg_partitions,
+        'key': lambda date, league, type_, range_: partition_key(league, date, type_, range_),
+        'inputs': agg_csv_files.input_files,
+        'required': agg_csv_files.input_files,
+        'outputs': lambda *args: [agg_csv_files.output_file(*args)],
+        'build': agg_csv_files.agg_files,
+    },
+    'preview': {
+        'manifest': 'game_preview_v2',
+        'version': game_preview_v2.MANIFEST_VERSION,
+        'partitions': preview_partitions,
+        'key': lambda league, date, range_: partition_key(league, date, 'ats', range_),
+        'inputs': game_preview_v2.preview_inputs,
+        'required': game_preview_v2.preview_inputs,
+        'outputs': game_preview_v2.output_files,
+        'build': game_preview_v2.generate_preview,
+    },
+    'combine': {
+        'manifest': 'combine_ranges',
+        'version': combine_ranges.MANIFEST_VERSION,
+        'partitions': day_partitions,
+        'key': lambda league, date: partition_key(league, date, 'ats'),
+        'inputs': combine_ranges.input_files,
+        'required': combine_ranges.input_files,
+        'outputs': lambda *args: [combine_ranges.output_file(*args)],
+        'build': combine_ranges.main,
+    },
+    'pre_process': {
+        'manifest': 'pre_process',
+        'version': pre_process.MANIFEST_VERSION,
+        'partitions': pre_process_partitions,
+        'key': lambda date, league, type_, range_: partition_key(league, date, type_, range_),
+        'inputs': lambda *args: [pre_process.input_file(*args)],
+        'required': lambda *args: [pre_process.input_file(*args)],
+        'outputs': lambda *args: [pre_process.output_file(*args)],
+        'build': pre_process.process_file,
+    },
+    'final': {
+        'manifest': 'final_preprocess',
+        'manifest_dir': f'{final_preprocess.BASE_PATH}/proc_data/manifest',
+        'version': final_preprocess.MANIFEST_VERSION,
+        'partitions': day_partitions,
+        'key': lambda league, date: partition_key(league, date, 'ats'),
+        'inputs': lambda *args: [final_preprocess.input_file(*args), final_preprocess.game_results_file(*args)],
+        'required': lambda *args: [final_preprocess.input_file(*args)],
+        'outputs': lambda *args: [final_preprocess.output_file(*args)],
+        'build': final_preprocess.main,
+    },
+}
+STAGE_ORDER = ['agg', 'preview', 'combine', 'pre_process', 'final']
+
+
+def date_range(start_date, end_date):
+    days = (end_date - start_date).days
+    return [(start_date + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days + 1)]
+
+
+def run_partition(unit):
+    """
+    Build one partition in a worker process.
+
+    Args:
+    - unit (tuple): (stage name, partition args).
+
+    Returns:
+    - tuple: (stage name, args, error or None, seconds).
+    """
+    stage, args = unit
+    start = timeit.default_timer()
+    try:
+        STAGES[stage]['build'](*args)
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}\n{traceback.format_exc(limit=3)}'
+    return stage, args, error, timeit.default_timer() - start
+
+
+def run_stage(stage, dates, leagues=LEAGUES, workers=WORKERS, chunksize=None, force=False):
+    """
+    Build every dirty partition of one stage over a process pool.
+
+    Args:
+    - stage (str): Key of STAGES.
+    - dates (list): 'YYYY-MM-DD' strings.
+    - leagues (list): Leagues to build.
+    - workers (int): Worker processes.
+    - chunksize (int): Partitions handed to a worker at a time; None sizes it from the work.
+    - force (bool): Rebuild partitions even when the manifest says they are up to date.
+
+    Returns:
+    - dict: Counts, per-partition errors, elapsed time and partitions per second.
+    """
+    spec = STAGES[stage]
+    manifest = Manifest(spec['manifest'], spec.get('manifest_dir', MANIFEST_DIR), spec['version'])
+
+    units, missing, up_to_date = [], 0, 0
+    for date in dates:
+        for league in leagues:
+            for args in spec['partitions'](league, date):
+                required = spec['required'](*args)
+                if not required or not all(os.path.exists(path) for path in required):
+                    missing += 1
+                    continue
+                if force or manifest.is_dirty(spec['key'](*args), spec['inputs'](*args), spec['outputs'](*args)):
+                    units.append((stage, args))
+                else:
+                    up_to_date += 1
+
+    errors = {}
+    start = timeit.default_timer()
+    if units:
+        chunksize = chunksize or max(1, len(units) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(run_partition, units, chunksize=chunksize)
+            for _, args, error, _ in tqdm(results, total=len(units), desc=stage):
+                key = spec['key'](*args)
+                if error is None:
+                    manifest.record(key, spec['inputs'](*args), spec['outputs'](*args))
+                else:
+                    errors[key] = error
+        manifest.save()
+    elapsed = timeit.default_timer() - start
+
+    built = len(units) - len(errors)
+    return {
+        'stage': stage,
+        'dirty': len(units),
+        'built': built,
+        'failed': len(errors),
+        'up_to_date': up_to_date,
+        'missing_inputs': missing,
+        'errors': errors,
+        'workers': workers,
+        'elapsed': elapsed,
+        'partitions_per_sec': len(units) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(report):
+    print(f"{report['stage']}: {report['built']}/{report['dirty']} dirty partitions built in "
+          f"{report['elapsed']:.1f}s ({report['partitions_per_sec']:.1f}/s, {report['workers']} workers), "
+          f"{report['failed']} failed, {report['up_to_date']} up to date, {report['missing_inputs']} without inputs")
+    for key, error in report['errors'].items():
+        print(f"  {key}: {error.splitlines()[0]}")
+
+
+def main(start_date, end_date=None, stages=STAGE_ORDER, leagues=LEAGUES, workers=WORKERS, chunksize=None,
+         force=False):
+    dates = date_range(start_date, end_date or datetime.today())
+    start = timeit.default_timer()
+    reports = []
+    for stage in [stage for stage in STAGE_ORDER if stage in stages]:
+        report = run_stage(stage, dates, leagues, workers, chunksize, force)
+        print_report(report)
+        reports.append(report)
+    print(f'backfill: {sum(report["built"] for report in reports)} partitions in '
+          f'{timeit.default_timer() - start:.1f}s over {len(dates)} days')
+    return reports
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild the preview pipeline over a date range in parallel')
+    parser.add_argument('--start', type=lambda s: datetime.strptime(s, '%Y-%m-%d'), default=datetime(2024, 11, 10))
+    parser.add_argument('--end', type=lambda s: datetime.strptime(s, '%Y-%m-%d'), default=None)
+    parser.add_argument('--stages', nargs='+', choices=STAGE_ORDER, default=STAGE_ORDER)
+    parser.add_argument('--leagues', nargs='+', choices=LEAGUES, default=LEAGUES)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--chunksize', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='Rebuild partitions the manifest says are up to date')
+    args = parser.parse_args()
+    main(args.start, args.end, args.stages, args.leagues, args.workers, args.chunksize, args.force)
@@ -0,0 +1,101 @@
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from game_preview_v2 import STAT_FIELDS, add_underdog_favorite_stats
+
+# Benchmark for the underdog/favorite column selection in game_preview_v2.
+# Builds a synthetic multi-season preview frame, checks the vectorized version
+# against the old row-by-row implementation and reports the speedup.
+#
+#   python bench_preview.py --rows 20000 --repeats 3
+
+FAMILIES = ['is_dog', 'is_fav', 'is_home', 'is_away']
+
+
+def make_preview_frame(rows, seed=0):
+    """Random frame with the columns add_underdog_favorite_stats reads."""
+    rng = np.random.default_rng(seed)
+    teams = np.array([f'Team {i}' for i in range(360)])
+    away_spread = rng.choice(np.arange(-20, 20.5, 0.5), size=rows)
+    data = {
+        'Away Team': rng.choice(teams, size=rows),
+        'Home Team': rng.choice(teams, size=rows),
+        'Away Team Spread': [f'{s:+.1f}' for s in away_spread],
+        'Home Team Spread': [f'{-s:+.1f}' for s in away_spread],
+        'Away Team Odds': rng.choice(['-110', '-105', '+100', '-115'], size=rows),
+        'Home Team Odds': rng.choice(['-110', '-105', '+100', '-115'], size=rows),
+        'Away Team Underdog': away_spread > 0,
+    }
+    for side in ['Away', 'Home']:
+        for family in FAMILIES:
+            for field in ['wins', 'losses', 'pushes']:
+                data[f'{side} Team {family}_{field}'] = rng.integers(0, 40, size=rows).astype('int16')
+            data[f'{side} Team {family}_cover_pct'] = rng.uniform(0, 100, size=rows).astype('float32')
+            data[f'{side} Team {family}_mov'] = rng.normal(0, 8, size=rows).astype('float32')
+            data[f'{side} Team {family}_ats_pm'] = rng.normal(0, 4, size=rows).astype('float32')
+    return pd.DataFrame(data)
+
+
+def legacy_underdog_favorite_stats(df):
+    """The iterrows implementation add_underdog_favorite_stats replaced, kept as the baseline."""
+    underdog_stats = []
+    favorite_stats = []
+
+    for _, row in df.iterrows():
+        # Determine if away or home team is the underdog
+        if row['Away Team Underdog']:
+            underdog_stats.append({
+                'Team': row['Away Team'],
+                'Spread': row['Away Team Spread'],
+                'Odds': row['Away Team Odds'],
+                **{field: row[f'Away Team is_dog_{field}'] for field in STAT_FIELDS}
+            })
+            favorite_stats.append({
+                'Team': row['Home Team'],
+                'Spread': row['Home Team Spread'],
+                'Odds': row['Home Team Odds'],
+                **{field: row[f'Home Team is_fav_{field}'] for field in STAT_FIELDS}
+            })
+        else:
+            underdog_stats.append({
+                'Team': row['Home Team'],
+                'Spread': row['Home Team Spread'],
+                'Odds': row['Home Team Odds'],
+                **{field: row[f'Home Team is_dog_{field}'] for field in STAT_FIELDS}
+            })
+            favorite_stats.append({
+                'Team': row['Away Team'],
+                'Spread': row['Away Team Spread'],
+                'Odds': row['Away Team Odds'],
+                **{field: row[f'Away Team is_fav_{field}'] for field in STAT_FIELDS}
+            })
+
+    underdog_df = pd.DataFrame(underdog_stats).add_prefix('Underdog is_dog ')
+    favorite_df = pd.DataFrame(favorite_stats).add_prefix('Favorite is_fav ')
+
+    return pd.concat([df, underdog_df, favorite_df], axis=1)
+
+
+def best_time(fn, df, repeats):
+    return min(timeit.repeat(lambda: fn(df), number=1, repeat=repeats))
+
+
+def main(rows=20000, repeats=3):
+    df = make_preview_frame(rows)
+    pd.testing.assert_frame_equal(add_underdog_favorite_stats(df), legacy_underdog_favorite_stats(df),
+                                  check_dtype=False)
+
+    legacy = best_time(legacy_underdog_favorite_stats, df, repeats)
+    vectorized = best_time(add_underdog_favorite_stats, df, repeats)
+    print(f'{rows} rows: iterrows {legacy * 1000:.1f} ms, vectorized {vectorized * 1000:.1f} ms, '
+          f'{legacy / vectorized:.0f}x faster')
+    return legacy, vectorized
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the underdog/favorite feature builder')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeats)
@@ -0,0 +1,182 @@
+import os
+import re
+import sys
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dictionary'))
+from team_registry import PLACEHOLDERS, get_registry, normalize
+from trend_normalizer import METRIC_DTYPE, RECORD_DTYPE
+
+# One dtype policy for the preview and training frames, applied after each stage:
+#   team name columns   -> category, categories in team-ID order (code == Team Rankings Index)
+#   record counts, ints -> int16 (nullable Int16 where a merge left gaps)
+#   other floats        -> float32
+#   True/False columns  -> bool (nullable boolean where results are missing)
+# Strings that are not team names (Spread, Odds, Time, ...) are left as they are.
+# A source's team columns only become categoricals when that is smaller than the
+# strings: a slate of a few games would otherwise carry the whole league's names.
+# The memory report is opt-in: set REPORT (slate_builder --memory-report) to print it.
+
+RANGE_SUFFIX = r'(?:_current_season|_all_time|_last_10_seasons)?'
+
+# Team name column pattern -> team_registry source its names are written in
+TEAM_COLUMNS = [
+    (re.compile(rf'^(?:Away|Home) Team(?: Team)?{RANGE_SUFFIX}$'), 'Team Rankings'),
+    (re.compile(rf'^(?:Underdog is_dog|Favorite is_fav) Team{RANGE_SUFFIX}$'), 'Team Rankings'),
+    (re.compile(rf'^(?:Away|Home) Team DraftKings{RANGE_SUFFIX}$'), 'DraftKings'),
+    (re.compile(rf'^(?:Away|Home) Team Covers{RANGE_SUFFIX}$'), 'Covers'),
+]
+TEAM_SOURCES = {source for _, source in TEAM_COLUMNS}
+
+# Float columns that are really counts: W-L-P parts before final_preprocess, Sample Size after
+COUNT_PATTERN = re.compile(r'(?:^|[_ ])(?:wins|losses|pushes|overs|unders|Sample Size)(?:_|$)')
+
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+REPORT = False
+
+
+@lru_cache(maxsize=None)
+def team_dtype(league, source='Team Rankings'):
+    """
+    Categorical dtype holding every team of a league as `source` writes its name.
+
+    Categories are ordered by team ID, so for sources with a name for every team
+    (Team Rankings, Covers) the category code is the team ID itself.
+    """
+    registry = get_registry(league)
+    names = {}
+    for team_id in sorted(registry.teams):
+        name = registry.field(team_id, source, None)
+        if isinstance(name, str) and normalize(name) not in PLACEHOLDERS:
+            names.setdefault(name, team_id)
+    return pd.CategoricalDtype(list(names))
+
+
+def team_source(column):
+    for pattern, source in TEAM_COLUMNS:
+        if pattern.match(column):
+            return source
+    return None
+
+
+def frame_team_dtype(columns, league=None, source='Team Rankings'):
+    """
+    One categorical dtype for every team column of a frame written in `source`.
+
+    Names the registry does not know are kept as extra categories after the
+    league's teams, so the values never change and the columns share one categories Index.
+    """
+    values = pd.concat([series.dropna() for series in columns]).unique() if columns else []
+    if league is None:
+        return pd.CategoricalDtype(sorted(values))
+    dtype = team_dtype(league, source)
+    extra = pd.Index(values).difference(dtype.categories)
+    if len(extra):
+        dtype = pd.CategoricalDtype(dtype.categories.append(extra))
+    return dtype
+
+
+def categorical_saves_memory(columns, dtype):
+    """Whether columns stored as `dtype` (codes plus one shared categories Index) are smaller than as they are."""
+    before = sum(series.memory_usage(index=False, deep=True) for series in columns)
+    code_bytes = np.dtype(np.int8 if len(dtype.categories) < 128 else np.int16).itemsize
+    after = code_bytes * sum(len(series) for series in columns) + dtype.categories.memory_usage(deep=True)
+    return after < before
+
+
+def is_bool_column(series):
+    if pd.api.types.is_bool_dtype(series):
+        return True
+    if series.dtype != object:
+        return False
+    values = series.dropna()
+    return len(values) > 0 and values.map(lambda value: isinstance(value, (bool, np.bool_))).all()
+
+
+def fits_int16(series):
+    values = series.dropna()
+    if values.empty:
+        return True
+    if not (values == np.floor(values)).all():
+        return False
+    return values.min() >= INT16_MIN and values.max() <= INT16_MAX
+
+
+def column_dtype(column, series):
+    """Target dtype for one column under the policy: a dtype, a TEAM_SOURCES name for team columns, or None."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return None
+    source = team_source(column)
+    if source is not None and (series.dtype == object or pd.api.types.is_string_dtype(series)):
+        return source
+    if is_bool_column(series):
+        return 'boolean' if series.isna().any() else 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        if not fits_int16(series):
+            return None
+        return 'Int16' if series.isna().any() or pd.api.types.is_extension_array_dtype(series) else RECORD_DTYPE
+    if pd.api.types.is_float_dtype(series):
+        if COUNT_PATTERN.search(column) and fits_int16(series):
+            return 'Int16' if series.isna().any() else RECORD_DTYPE
+        return METRIC_DTYPE
+    return None
+
+
+def memory_mb(df):
+    """
+    Deep memory of a frame in MB, counting a categories Index shared by several columns once.
+
+    pandas' memory_usage charges every categorical column for its full categories,
+    which would bill each team column for the whole league.
+    """
+    total = df.index.memory_usage(deep=True)
+    shared = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            total += series.cat.codes.to_numpy().nbytes
+            categories = series.cat.categories
+            shared[id(categories)] = categories.memory_usage(deep=True)
+        else:
+            total += series.memory_usage(index=False, deep=True)
+    return (total + sum(shared.values())) / 1e6
+
+
+def apply_policy(df, league=None, stage=None):
+    """
+    Downcast a preview or training frame to the repo's dtype policy.
+
+    Args:
+    - df (pd.DataFrame): Frame from any preview/training stage.
+    - league (str): 'NBA' or 'NCB'; team columns get the league's team-ID categories. None gives plain categoricals.
+    - stage (str): Name to print the frame's memory before and after under, when REPORT is set.
+
+    Returns:
+    - pd.DataFrame: New frame with the same columns and values, smaller dtypes.
+    """
+    report = REPORT and stage is not None
+    before = memory_mb(df) if report else None
+    dtypes = {column: column_dtype(column, df[column]) for column in df.columns}
+    for source in TEAM_SOURCES:
+        team_columns = [df[column] for column, dtype in dtypes.items() if dtype == source]
+        if team_columns:
+            shared = frame_team_dtype(team_columns, league, source)
+            if not categorical_saves_memory(team_columns, shared):
+                shared = None
+            dtypes.update({column: shared for column, dtype in dtypes.items() if dtype == source})
+
+    columns = {}
+    for column, dtype in dtypes.items():
+        columns[column] = df[column] if dtype is None else df[column].astype(dtype)
+    df = pd.DataFrame(columns, index=df.index)
+    if report:
+        print(memory_report(stage, before, memory_mb(df), df.shape))
+    return df
+
+
+def memory_report(stage, before, after, shape):
+    ratio = after / before if before else 1.0
+    return f'{stage}: {shape[0]} rows x {shape[1]} columns, {before:.2f} MB -> {after:.2f} MB ({ratio:.0%} of before)'
@@ -5,13 +5,37 @@ Created on Sat Nov 30 14:53:18 2024
 @author: dcooke
 """
 
+import numpy as np
 import pandas as pd
-import json
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dictionary'))
+from team_registry import get_registry
+from dtype_policy import apply_policy
+from manifest import Manifest, partition_key
+from odds import implied_probability, parse_american
+from trend_normalizer import field_columns, rename_field
+
+BASE_PATH = 'C:/Users/dcooke/Projects/Sports/basketball_trends/source'
+MANIFEST_VERSION = 2  # 2: built from the typed agg_preview, '--' stats as NaN, vectorized odds
+
+
+def game_results_file(league, date):
+    return f'{BASE_PATH}/raw_data/{league}/{date}/game_results.csv'
+
+
+def input_file(league, date):
+    return f'{BASE_PATH}/proc_data/preview/{league}/{date}/ats/agg_preview.csv'
+
+
+def output_file(league, date):
+    return f'{BASE_PATH}/proc_data/preview/{league}/{date}/ats/final_preprocess.csv'
+
 
 def append_home_cover(df, league, date):
     # Load the game_results.csv
-    game_results_path = f'C:/Users/dcooke/Projects/Sports/basketball_trends/source/raw_data/{league}/{date}/game_results.csv'
+    game_results_path = game_results_file(league, date)
     if not os.path.exists(game_results_path):
         print(f"game_results.csv not found for date {date}. Skipping.")
         return df  # Return the original DataFrame if the file doesn't exist
@@ -30,8 +54,21 @@ def append_home_cover(df, league, date):
 
 pd.set_option('display.max_rows', None)  # Show all rows
 pd.set_option('display.max_columns', None)  # Show all columns
-def main(league, date):
-    df = pd.read_csv(f'C:/Users/dcooke/Projects/Sports/basketball_trends/source/proc_data/preview/{league}/{date}/ats/agg_preview.csv')
+def transform(df, league, date):
+    """
+    Turn a combined preview (agg_preview) into the model's input rows.
+
+    Args:
+    - df (pd.DataFrame): agg_preview.csv contents, or combine_ranges.combine() output.
+    - league (str): 'NBA' or 'NCB'.
+    - date (str): 'YYYY-MM-DD', used to attach game_results.csv when it exists.
+
+    Returns:
+    - pd.DataFrame: final_preprocess rows.
+    """
+    # Lines missing from the DraftKings board are 'N/A'; read_csv turns them into NaN, so do the same here
+    text_columns = df.select_dtypes(include='object').columns
+    df[text_columns] = df[text_columns].mask(df[text_columns] == 'N/A')
     # print(df.columns)
     range_list = ['_last_10_seasons', '_all_time']
     col_list = ['Rank', 'Hotness Score', 'Time', 'Location', 'Home Team Team', 
@@ -51,27 +88,22 @@ def main(league, date):
     for col in col_list2:
         df = df.drop(columns=col)
             
-    for column in df.columns:
-        if "Cover %" in column:
-            df[column] = round(df[column].str.rstrip('%').astype(float) / 100, 4)
-
-    for column in df.columns:
-        if "ATS Record" in column:
-            # Split the W-L-T into separate components
-            try:
-                record_split = df[column].str.split('-', expand=True).astype(int)
-                df[column] = record_split[0] + record_split[1] + record_split[2]
-            except:
-                df[column] = 0
-            #df[f'{column}_WinRate'] = record_split[0] / df[f'{column}_TotalGames']
-            df.rename(columns={column: column.replace("ATS Record", "Sample Size")}, inplace=True)
-
-    if league == 'NBA':
-        sub_key = 'Pro'
-    else:
-        sub_key = 'College'
-    with open(f'C:\\Users\\dcooke\\Projects\\Sports\\basketball_trends\\source\\Dictionary\\{sub_key}\\{league}_mapping.json', 'r') as f:
-        data = json.load(f)
+    # Trend stats arrive typed; write them under the names the model was trained on
+    for column in field_columns(df.columns, 'cover_pct'):
+        df[column] = round(df[column] / 100, 4)
+
+    for column in field_columns(df.columns, 'wins'):
+        losses, pushes = rename_field(column, 'wins', 'losses'), rename_field(column, 'wins', 'pushes')
+        sample_size = df[column] + df[losses] + df[pushes]
+        # A missing record zeroes the whole column, as the failed 'W-L-P' split of one value always did
+        df[column] = 0 if sample_size.isna().any() else sample_size.astype('int64')
+        #df[f'{column}_WinRate'] = wins / sample size
+        df = df.drop(columns=[losses, pushes])
+
+    for field, name in [('wins', 'Sample Size'), ('cover_pct', 'Cover %'), ('mov', 'MOV'), ('ats_pm', 'ATS +/-')]:
+        df = df.rename(columns={column: rename_field(column, field, name) for column in field_columns(df.columns, field)})
+
+    registry = get_registry(league)
 
     team_col_list = ['Away Team_current_season', 'Home Team_current_season', 'Favorite is_fav Team_current_season', 'Underdog is_dog Team_current_season']
     #Encode team names
@@ -79,7 +111,7 @@ def main(league, date):
         # print(df[col][1])
         # team_name = df[col].split[' ']
         # team = f'{team_name[0].upper()} {team_name[1]}'
-        df[f'{col}_map'] = df[col].map(data['Team Encoding Mapping'])
+        df[f'{col}_map'] = registry.resolve(df[col], 'Team Rankings')
         # new_col = col.replace('_current_season', '')
         # df.rename(columns={col: new_col}, inplace=True)
         # with open('C:\\Users\\dcooke\\Projects\\Sports\\basketball_trends\\source\\Dictionary\\Pro\\NBA_mapping.json', 'r') as f:
@@ -91,45 +123,50 @@ def main(league, date):
         #     # df[col] = data['Team Encoding Mapping'][row[col]]
         # # print(data['Team Encoding Mapping'][df[col][1]])
 
-    def convert_american_odds_to_probability(odds):
-        # Check if the odds are negative (indicating a favorite)
-        fav = odds[0] == '-'
-        odds = int(odds[1:])
-        
-        if not fav:
-            return odds / (odds + 100)
-        else:
-            return 100 / (odds + 100)
-
-    # Iterate through all columns containing "Odds"
-    for column in df.columns:
-        if "Odds" in column:
-            df = df.dropna()
-            # Convert each value in the column from American odds to implied probability
-            df[column] = round(df[column].apply(convert_american_odds_to_probability), 4)
-            df.rename(columns={column:column.replace("Odds", "Implied Odds")}, inplace=True)
-
-    df = append_home_cover(df, league, date)
-    
-    
+    # Rows with any gap (no DraftKings line, an unknown team, ...) are dropped, as the old
+    # whole-frame dropna did; NaN trend metrics are Team Rankings' '--' and don't count
+    metric_columns = {column for name in ['Cover %', 'MOV', 'ATS +/-'] for column in field_columns(df.columns, name)}
+    odds_columns = [column for column in df.columns if 'Odds' in column]
+    parsed = {column: parse_american(df[column]) for column in odds_columns}
+    priced = df[[column for column in df.columns if column not in metric_columns]].notna().all(axis=1).to_numpy()
+    for odds in parsed.values():
+        priced &= odds.notna().to_numpy()
+    if not priced.all():
+        print(f'{league} {date}: dropping {(~priced).sum()} of {len(df)} games with a missing line, team or value')
+    df = df[priced].copy()
 
+    # Convert every odds column from American odds to implied probability
+    for column, odds in parsed.items():
+        df[column] = np.round(implied_probability(odds[priced]), 4)
+    df = df.rename(columns={column: column.replace("Odds", "Implied Odds") for column in odds_columns})
+
+    return apply_policy(append_home_cover(df, league, date), league)
+
+
+def main(league, date):
+    # transform applies the dtype policy to its output
+    df = transform(pd.read_csv(input_file(league, date)), league, date)
 
     # print(df.columns)
-    folder_path = f'C:/Users/dcooke/Projects/Sports/basketball_trends/source/proc_data/preview/{league}/{date}/ats/'
-    os.makedirs(folder_path, exist_ok=True)
-    df.to_csv(f'{folder_path}final_preprocess.csv')
+    output_path = output_file(league, date)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    df.to_csv(output_path)
 
 if __name__ == '__main__':
     from datetime import datetime, timedelta
     league_list = ['NCB']
-    for league in league_list:
-        for x in range(1, 29):
-            date = (datetime.today() - timedelta(days=x)).date()
-            # try:
-            print(date)
-            main(league, date)
-            # except Exception as e:
-                # print('Final error', date, league, e)
+    with Manifest('final_preprocess', f'{BASE_PATH}/proc_data/manifest', MANIFEST_VERSION) as manifest:
+        for league in league_list:
+            for x in range(1, 29):
+                date = (datetime.today() - timedelta(days=x)).date()
+                # try:
+                # game_results.csv lands a day later and is optional; its arrival re-runs the date
+                inputs = [input_file(league, date), game_results_file(league, date)]
+                if manifest.run(partition_key(league, date, 'ats'), inputs, [output_file(league, date)],
+                                lambda: main(league, date)):
+                    print(date)
+                # except Exception as e:
+                    # print('Final error', date, league, e)
     # main('NBA', '2024-12-06')
 
     print('final_preprocess ran')
\ No newline at end of file
@@ -1,9 +1,20 @@
 import pandas as pd
 import os
+import sys
 from datetime import datetime, timedelta
 import json
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dictionary'))
+from team_registry import dictionary_path, get_registry
+from odds_index import load_odds_index, odds_file_path, team_line
+from manifest import Manifest, partition_key
+from trend_normalizer import ATS_FIELDS, ATS_METRIC_FIELDS, field_columns
+from trend_dataset import SITUATIONS
+from dtype_policy import apply_policy
+
+MANIFEST_VERSION = 2  # 2: typed trend fields, only the kept aggregate columns, dtype policy
+
 # Configure pandas display options for better debugging and visualization
 pd.set_option('display.max_rows', None)
 pd.set_option('display.max_columns', None)
@@ -11,6 +22,24 @@ pd.set_option('display.width', 1000)
 pd.set_option('display.colheader_justify', 'left')
 
 
+def schedule_file(league, date):
+    return f'basketball_trends/source/raw_data/{league}/{date}/daily_schedule.csv'
+
+
+def agg_file(league, date, range_):
+    return f'basketball_trends/source/proc_data/agg_raw/{league}/{date}/ats/{range_}.csv'
+
+
+def output_files(league, date, range_):
+    output_path = f'basketball_trends/source/proc_data/preview/{league}/{date}/ats/'
+    return [f'{output_path}{range_}.csv', f'{output_path}{range_}.pkl']
+
+
+def preview_inputs(league, date, range_):
+    return [schedule_file(league, date), odds_file_path(league, date), agg_file(league, date, range_),
+            dictionary_path(league)]
+
+
 def load_json(file_path):
     """Load a JSON file and return its content."""
     try:
@@ -24,41 +53,94 @@ def load_json(file_path):
 
 def grab_spread_line(league, date, team_name):
     """Retrieve spread line and related data for a team."""
-    file_path = f'basketball_trends/source/raw_data/{league}/{date}/dk_odds.json'
-    json_data = load_json(file_path)
-
-    for game in json_data:
-        game_info = game[0]  # Extract the game dictionary
-        if game_info["Away Team"] == team_name:
-            underdog = game_info['Away Spread'][0] == '+'
-            return {
-                "Team": team_name,
-                "Spread": game_info["Away Spread"],
-                "Odds": game_info["Away Spread Odds"],
-                "Underdog": underdog
-            }
-        elif game_info["Home Team"] == team_name:
-            underdog = game_info['Home Spread'][0] == '+'
-            return {
-                "Team": team_name,
-                "Spread": game_info["Home Spread"],
-                "Odds": game_info["Home Spread Odds"],
-                "Underdog": underdog
-            }
-
-    return {"error": f"Team '{team_name}' not found in the data."}
-
-
-def load_team_mappings(league):
-    """Load team mappings for a specific league."""
-    if league == 'NBA':
-        path = 'basketball_trends/source/Dictionary/Pro/NBA.json'
-    elif league == 'NCB':
-        path = 'basketball_trends/source/Dictionary/College/NCB.json'
-    else:
-        raise ValueError(f"Unsupported league: {league}")
-
-    return load_json(path)
+    line = team_line(league, date, team_name)
+    if line is None:
+        return {"error": f"Team '{team_name}' not found in the data."}
+
+    spread, odds, underdog = line
+    return {
+        "Team": team_name,
+        "Spread": spread,
+        "Odds": odds,
+        "Underdog": underdog
+    }
+
+
+# Per-side fields copied for every role, then the trend stats of the role's family
+SIDE_FIELDS = ['Team', 'Spread', 'Odds']
+STAT_FIELDS = ATS_FIELDS
+
+# (label, stat family, flag column, flag value): the Away team's columns are used
+# where the flag column equals the value, the Home team's everywhere else.
+UNDERDOG_FAVORITE_ROLES = [
+    ('Underdog', 'is_dog', 'Away Team Underdog', True),
+    ('Favorite', 'is_fav', 'Away Team Underdog', False),
+]
+
+# Situations each side of the preview keeps from the aggregate; the role families
+# are read only to build the Underdog/Favorite columns and dropped afterwards.
+# Everything else in agg_raw (is_after_*, rest and days-off splits, the wrong
+# home/away split) is never read.
+ROLE_SITUATIONS = [family for _, family, _, _ in UNDERDOG_FAVORITE_ROLES]
+PREVIEW_SITUATIONS = {
+    'Away': ['all_games', 'is_away'] + ROLE_SITUATIONS,
+    'Home': ['all_games', 'is_home'] + ROLE_SITUATIONS,
+}
+
+
+def preview_situations():
+    """Every situation either side of the preview reads, in SITUATIONS order."""
+    needed = {situation for situations in PREVIEW_SITUATIONS.values() for situation in situations}
+    return [situation for situation in SITUATIONS if situation in needed]
+
+
+def preview_columns(side=None):
+    """
+    agg_raw columns the preview needs: 'Team' plus '{situation}_{field}' for the side's situations.
+
+    Args:
+    - side (str): 'Away' or 'Home'; None gives the union over both sides.
+
+    Returns:
+    - list: Column names, used as usecols or to project an in-memory aggregate.
+    """
+    situations = preview_situations() if side is None else PREVIEW_SITUATIONS[side]
+    return ['Team'] + [f'{situation}_{field}' for situation in situations for field in STAT_FIELDS]
+
+
+def side_column(side, field, family=None):
+    """Name of a per-side column, e.g. ('Away', 'mov', 'is_dog') -> 'Away Team is_dog_mov'."""
+    if family is not None:
+        return f'{side} Team {family}_{field}'
+    if field == 'Team':
+        return f'{side} Team'
+    return f'{side} Team {field}'
+
+
+def select_role_columns(df, roles, side_fields=SIDE_FIELDS, stat_fields=STAT_FIELDS):
+    """
+    Pick the Away or Home version of each column for every role, a whole column at a time.
+
+    Args:
+    - df (pd.DataFrame): Preview frame holding both sides' columns.
+    - roles (list): (label, family, flag column, flag value) tuples, e.g. UNDERDOG_FAVORITE_ROLES.
+    - side_fields (list): Fields taken as-is from each side ('Team', 'Spread', ...).
+    - stat_fields (list): Trend fields taken from the role's stat family.
+
+    Returns:
+    - dict: '{label} {family} {field}' -> Series aligned to df's rows, for every role and field.
+    """
+    columns = {}
+    for label, family, flag_column, flag_value in roles:
+        use_away = df[flag_column].astype(bool) == flag_value
+        fields = [(field, None) for field in side_fields] + [(field, family) for field in stat_fields]
+        for field, stat_family in fields:
+            # Series.where keeps the nullable record dtype that np.where would turn into objects
+            away = df[side_column('Away', field, stat_family)]
+            home = df[side_column('Home', field, stat_family)]
+            columns[f'{label} {family} {field}'] = away.where(use_away, home)
+    return columns
+
 
 def add_underdog_favorite_stats(df):
     """
@@ -70,89 +152,19 @@ def add_underdog_favorite_stats(df):
     Returns:
     pd.DataFrame: The DataFrame with new underdog and favorite stats columns.
     """
-    underdog_stats = []
-    favorite_stats = []
-
-    for _, row in df.iterrows():
-        # Determine if away or home team is the underdog
-        if row['Away Team Underdog']:
-            underdog_stats.append({
-                'Team': row['Away Team'],
-                'Spread': row['Away Team Spread'],
-                'Odds': row['Away Team Odds'],
-                'ATS Record': row['Away Team is_dog_ATS Record'],
-                'Cover %': row['Away Team is_dog_Cover %'],
-                'MOV': row['Away Team is_dog_MOV'],
-                'ATS +/-': row['Away Team is_dog_ATS +/-']
-            })
-            favorite_stats.append({
-                'Team': row['Home Team'],
-                'Spread': row['Home Team Spread'],
-                'Odds': row['Home Team Odds'],
-                'ATS Record': row['Home Team is_fav_ATS Record'],
-                'Cover %': row['Home Team is_fav_Cover %'],
-                'MOV': row['Home Team is_fav_MOV'],
-                'ATS +/-': row['Home Team is_fav_ATS +/-']
-            })
-        else:
-            underdog_stats.append({
-                'Team': row['Home Team'],
-                'Spread': row['Home Team Spread'],
-                'Odds': row['Home Team Odds'],
-                'ATS Record': row['Home Team is_dog_ATS Record'],
-                'Cover %': row['Home Team is_dog_Cover %'],
-                'MOV': row['Home Team is_dog_MOV'],
-                'ATS +/-': row['Home Team is_dog_ATS +/-']
-            })
-            favorite_stats.append({
-                'Team': row['Away Team'],
-                'Spread': row['Away Team Spread'],
-                'Odds': row['Away Team Odds'],
-                'ATS Record': row['Away Team is_fav_ATS Record'],
-                'Cover %': row['Away Team is_fav_Cover %'],
-                'MOV': row['Away Team is_fav_MOV'],
-                'ATS +/-': row['Away Team is_fav_ATS +/-']
-            })
-
-    underdog_df = pd.DataFrame(underdog_stats).add_prefix('Underdog is_dog ')
-    favorite_df = pd.DataFrame(favorite_stats).add_prefix('Favorite is_fav ')
-
-    # Concatenate new columns to the existing DataFrame
-    df = pd.concat([df, underdog_df, favorite_df], axis=1)
-
+    df = df.copy(deep=False)  # New columns only; the caller's frame is left untouched
+    for column, values in select_role_columns(df, UNDERDOG_FAVORITE_ROLES).items():
+        df[column] = values
     return df
 
 def grab_name_info(df, league):
     """Map team names from Team Rankings to DraftKings names."""
-    team_mappings = load_team_mappings(league)
-    team_mappings_df = pd.DataFrame(team_mappings)
-
-    # Normalize team names for matching
-    team_mappings_df['Team Rankings Name (Lower)'] = team_mappings_df['Team Rankings Name'].str.strip().str.lower()
-    df['Away Team (Lower)'] = df['Away Team'].str.strip().str.lower()
-    df['Home Team (Lower)'] = df['Home Team'].str.strip().str.lower()
-
-    # Merge DraftKings names for Away and Home teams
-    df = df.merge(
-        team_mappings_df[['Team Rankings Name (Lower)', 'DraftKings Name', 'Covers']],
-        left_on='Away Team (Lower)',
-        right_on='Team Rankings Name (Lower)',
-        how='left'
-    ).rename(columns={
-        'DraftKings Name': 'Away Team DraftKings',
-        'Covers': 'Away Team Covers'
-    }).drop(columns=['Team Rankings Name (Lower)', 'Away Team (Lower)'])
-
-    df = df.merge(
-        team_mappings_df[['Team Rankings Name (Lower)', 'DraftKings Name', 'Covers']],
-        left_on='Home Team (Lower)',
-        right_on='Team Rankings Name (Lower)',
-        how='left'
-    ).rename(columns={
-        'DraftKings Name': 'Home Team DraftKings',
-        'Covers': 'Home Team Covers'
-    }).drop(columns=['Team Rankings Name (Lower)', 'Home Team (Lower)'])
-    
+    registry = get_registry(league)
+
+    for side in ['Away', 'Home']:
+        df[f'{side} Team DraftKings'] = registry.translate_series(df[f'{side} Team'], 'Team Rankings', 'DraftKings')
+        df[f'{side} Team Covers'] = registry.translate_series(df[f'{side} Team'], 'Team Rankings', 'Covers')
+
     return df
 
 
@@ -187,8 +199,7 @@ def drop_irrelevant_stats(df):
 
 def process_schedule_data(league, date):
     """Load and process the daily schedule data."""
-    file_path = f'basketball_trends/source/raw_data/{league}/{date}/daily_schedule.csv'
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(schedule_file(league, date))
 
     # Extract and clean team names from Matchup column
     away_pattern = r"(?:#(\d+)\s+)?([^#]+)\s+(?:at|vs.)"
@@ -208,67 +219,87 @@ def process_schedule_data(league, date):
 
 def add_spread_data(df, league, date):
     """Add spread data to the schedule DataFrame."""
-    spread_data = []
-    for _, row in df.iterrows():
-        away_data = grab_spread_line(league, date, row['Away Team DraftKings'])
-        home_data = grab_spread_line(league, date, row['Home Team DraftKings'])
+    index = load_odds_index(league, date)
+    spreads = {team: line[0] for team, line in index.items()}
+    odds = {team: line[1] for team, line in index.items()}
+    underdogs = {team: line[2] for team, line in index.items()}
 
-        spread_data.append({
-            "Away Team Spread": away_data.get("Spread", "N/A"),
-            "Away Team Odds": away_data.get("Odds", "N/A"),
-            "Away Team Underdog": away_data.get("Underdog", False),
-            "Home Team Spread": home_data.get("Spread", "N/A"),
-            "Home Team Odds": home_data.get("Odds", "N/A"),
-            "Home Team Underdog": home_data.get("Underdog", False)
-        })
+    for side in ['Away', 'Home']:
+        teams = df[f'{side} Team DraftKings']
+        df[f'{side} Team Spread'] = teams.map(spreads).fillna('N/A')
+        df[f'{side} Team Odds'] = teams.map(odds).fillna('N/A')
+        df[f'{side} Team Underdog'] = teams.map(underdogs).eq(True)
 
-    spread_df = pd.DataFrame(spread_data)
-    return pd.concat([df, spread_df], axis=1)
+    return df
 
 
-def generate_preview(league, date, range_):
-    """Generate a preview of game data including spread lines and aggregate stats."""
-    schedule_df = process_schedule_data(league, date)
-    schedule_df = add_spread_data(schedule_df, league, date)
+def build_preview(schedule_df, agg_df, league=None, stage=None):
+    """
+    Join one range's aggregate ATS stats onto the day's schedule.
 
-    # Load aggregate ATS data
-    agg_file = f'basketball_trends/source/proc_data/agg_raw/{league}/{date}/ats/{range_}.csv'
-    agg_df = pd.read_csv(agg_file)
+    Args:
+    - schedule_df (pd.DataFrame): Output of process_schedule_data + add_spread_data.
+    - agg_df (pd.DataFrame): agg_raw frame for one range, with a 'Team' column; columns
+      outside preview_columns() are ignored.
+    - league (str): League of the slate, for the team-ID categories of the dtype policy.
+    - stage (str): Name to print a memory report under; None prints nothing.
+
+    Returns:
+    - pd.DataFrame: Preview for that range, as written by generate_preview.
+    """
+    needed = set(preview_columns())
+    agg_df = agg_df[[column for column in agg_df.columns if column in needed]].copy()
     agg_df['Team'] = agg_df['Team'].str.strip().str.title()
 
-    # Merge aggregate data
-    schedule_df = schedule_df.merge(
-        agg_df.add_prefix('Away Team '),
-        left_on='Away Team',
-        right_on='Away Team Team',
-        how='left'
-    )
-    
-    schedule_df = schedule_df.merge(
-        agg_df.add_prefix('Home Team '),
-        left_on='Home Team',
-        right_on='Home Team Team',
-        how='left'
-    )
+    # Merge aggregate data, each side carrying only its own situations
+    for side in ['Away', 'Home']:
+        side_needed = set(preview_columns(side))
+        side_df = agg_df[[column for column in agg_df.columns if column in side_needed]]
+        schedule_df = schedule_df.merge(
+            side_df.add_prefix(f'{side} Team '),
+            left_on=f'{side} Team',
+            right_on=f'{side} Team Team',
+            how='left'
+        )
+        # A team with no aggregate row gets 0 metrics and missing records, like a team missing from one table
+        unmatched = schedule_df[f'{side} Team Team'].isna()
+        metrics = [column for field in ATS_METRIC_FIELDS for column in field_columns(schedule_df.columns, field)
+                   if column.startswith(f'{side} Team ')]
+        schedule_df.loc[unmatched, metrics] = 0
     # schedule_df = add_underdog_favorite_stats(schedule_df)
 
     schedule_df = drop_irrelevant_stats(schedule_df)
 
+    # Trend stats keep their gaps ('--' metrics, missing records); everything else is filled with 0
+    stats = {column for field in ATS_FIELDS for column in field_columns(schedule_df.columns, field)}
+    others = [column for column in schedule_df.columns if column not in stats]
+    schedule_df[others] = schedule_df[others].fillna(0)
+
+    return apply_policy(schedule_df, league, stage)
+
+
+def generate_preview(league, date, range_):
+    """Generate a preview of game data including spread lines and aggregate stats."""
+    schedule_df = process_schedule_data(league, date)
+    schedule_df = add_spread_data(schedule_df, league, date)
 
-    schedule_df = schedule_df.fillna(0)
+    # Load aggregate ATS data
+    needed = set(preview_columns())
+    schedule_df = build_preview(schedule_df, pd.read_csv(agg_file(league, date, range_), usecols=lambda column: column in needed),
+                                league, f'preview {league}/{date}/{range_}')
 
     # Save the preview to a CSV
-    output_path = f'basketball_trends/source/proc_data/preview/{league}/{date}/ats/'
-    os.makedirs(output_path, exist_ok=True)
-    schedule_df.to_csv(f'{output_path}{range_}.csv', index=False)
-    schedule_df.to_pickle(f'{output_path}{range_}.pkl')
+    csv_path, pickle_path = output_files(league, date, range_)
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    schedule_df.to_csv(csv_path, index=False)
+    schedule_df.to_pickle(pickle_path)
     # print(f"Preview saved to {output_path}")
     # print(schedule_df.columns)
     
     return schedule_df
 
 
-def main():
+def main(force=False):
     league_list = ['NBA', 'NCB']
     today = datetime.now()
     start_date = datetime(2024, 11, 10)
@@ -280,11 +311,14 @@ def main():
     range_list = ['yearly_2024_2025_aggregated', 'yearly_all_aggregated', 'yearly_since_2014_2015_aggregated']
 
     # Output the generated list
-    for date in date_list:
+    with Manifest('game_preview_v2', version=MANIFEST_VERSION) as manifest:
+        for date in date_list:
             for league in league_list:
                 for range_ in range_list:
                     try:
-                        generate_preview(league, date, f'{range_}')
+                        manifest.run(partition_key(league, date, 'ats', range_), preview_inputs(league, date, range_),
+                                     output_files(league, date, range_),
+                                     lambda: generate_preview(league, date, f'{range_}'), force)
                     except Exception as e:
                         print(f'Error on {league}/{date}: {e}')
     print(f'game_preview_v2 saved')
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+
+# Per-stage record of what each output partition was built from, so a run only
+# recomputes (league, date, type, range) partitions whose inputs changed.
+#
+# One JSON file per stage under proc_data/manifest/:
+#   {"NBA/2024-12-09/ats/yearly_all": {
+#       "inputs": {"<path>": {"mtime": ..., "size": ..., "sha1": "..."}, ...},
+#       "outputs": ["<path>", ...]}}
+# A missing input is recorded as null, so an optional file showing up later
+# (e.g. game_results.csv) marks the partition dirty.
+
+MANIFEST_DIR = 'basketball_trends/source/proc_data/manifest'
+
+
+def partition_key(*parts):
+    return '/'.join(str(part) for part in parts)
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_state(path, previous=None):
+    """
+    Fingerprint one input file.
+
+    Args:
+    - path (str): File to fingerprint.
+    - previous (dict): Last recorded state; its hash is reused when mtime and size are unchanged.
+
+    Returns:
+    - dict: {'mtime', 'size', 'sha1'}, or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if previous and previous['mtime'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+        return previous
+    return {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': file_sha1(path)}
+
+
+class Manifest:
+    """Input fingerprints and outputs for every partition one stage has built."""
+
+    def __init__(self, stage, manifest_dir=MANIFEST_DIR, version=1):
+        self.stage = stage
+        self.version = version  # Bump when a stage's output format changes to rebuild everything
+        self.path = os.path.join(manifest_dir, f'{stage}.json')
+        self.entries = {}
+        self.skipped = 0
+        self.built = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def is_dirty(self, key, inputs, outputs):
+        """
+        True when the partition has never been built, an output is missing, or an input changed.
+
+        Args:
+        - key (str): Partition key from partition_key().
+        - inputs (list): Input file paths; missing files are allowed.
+        - outputs (list): Output file paths the stage writes.
+
+        Returns:
+        - bool: Whether the partition needs to be recomputed.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry.get('version', 1) != self.version or entry['outputs'] != list(outputs):
+            return True
+        if not all(os.path.exists(path) for path in outputs):
+            return True
+
+        recorded = entry['inputs']
+        if set(recorded) != set(inputs):
+            return True
+        for path in inputs:
+            previous = recorded[path]
+            current = file_state(path, previous)
+            if (current and current['sha1']) != (previous and previous['sha1']):
+                return True
+            recorded[path] = current  # Touched but unchanged: remember the new mtime
+        return False
+
+    def record(self, key, inputs, outputs):
+        """Stores the fingerprints of the inputs a partition was just built from."""
+        previous = self.entries.get(key, {}).get('inputs', {})
+        self.entries[key] = {
+            'inputs': {path: file_state(path, previous.get(path)) for path in inputs},
+            'outputs': list(outputs),
+            'version': self.version,
+        }
+
+    def run(self, key, inputs, outputs, build, force=False):
+        """
+        Calls build() only if the partition is dirty, then records it.
+
+        Returns:
+        - bool: True if build() ran.
+        """
+        if not force and not self.is_dirty(key, inputs, outputs):
+            self.skipped += 1
+            return False
+        build()
+        self.record(key, inputs, outputs)
+        self.built += 1
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.save()
+        print(f'{self.stage}: {self.built} partitions rebuilt, {self.skipped} up to date')
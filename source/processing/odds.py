@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized American-odds math for whole columns of DraftKings lines.
+#   '−110' (DraftKings writes a Unicode minus), '-110', '+105', 'EVEN', 'N/A' -> Int16 -110, -110, 105, 100, <NA>
+#   implied probability: -110 -> 0.5238, +105 -> 0.4878
+#   decimal odds:        -110 -> 1.9091, +105 -> 2.05
+#   no-vig probability:  both sides' implied probabilities scaled to sum to 1
+# Every function takes a scalar, array or Series and returns float64 NumPy arrays, NaN where the line is missing.
+#
+# The string helper final_preprocess used before this module only treated a leading
+# Unicode minus as a price to lay; '+105' and ASCII '-110' came out as the other
+# side's probability (0.5122 and 0.4762). Of the 3390 DraftKings spread prices in
+# raw_data, 3388 carry the Unicode minus and 2 are '+100', where both readings give 0.5.
+
+MINUS_SIGNS = '\u2212\u2012\u2013\u2014\ufe63\uff0d'  # Unicode minus and look-alike dashes
+EVEN_ODDS = {'EVEN': '100', 'EV': '100', 'PK': '100'}
+MINUS_TABLE = str.maketrans(MINUS_SIGNS, '-' * len(MINUS_SIGNS))
+ODDS_DTYPE = 'Int16'
+
+
+def parse_american(values):
+    """
+    Parse American odds strings into integers.
+
+    Args:
+    - values (pd.Series, list or scalar): Odds as scraped; numbers pass through.
+
+    Returns:
+    - pd.Series: Nullable Int16 odds, <NA> for 'N/A', blanks and anything unparseable.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(np.atleast_1d(values))
+    if pd.api.types.is_numeric_dtype(series):
+        return series.round().astype(ODDS_DTYPE)
+    # A season has a few hundred distinct prices, so only those are parsed as text
+    codes, uniques = pd.factorize(series)
+    text = pd.Series(uniques, dtype='string').str.strip().str.upper()
+    text = text.str.translate(MINUS_TABLE).replace(EVEN_ODDS).str.lstrip('+')
+    parsed = pd.to_numeric(text, errors='coerce').round().astype(ODDS_DTYPE).array
+    # factorize codes missing values as -1, which take() fills with <NA>
+    return pd.Series(parsed.take(codes, allow_fill=True), index=series.index, name=series.name)
+
+
+def as_float(odds):
+    """Odds as float64, NaN where missing; strings are parsed first, float arrays pass through."""
+    if isinstance(odds, np.ndarray) and odds.dtype == np.float64:
+        return odds
+    return parse_american(odds).to_numpy(dtype='float64', na_value=np.nan)
+
+
+def implied_probability(odds):
+    """Break-even win probability of each line, vig included."""
+    odds = as_float(odds)
+    price = np.abs(odds)
+    return np.where(odds < 0, price / (price + 100), 100 / (price + 100))
+
+
+def decimal_odds(odds):
+    """Total return per unit staked, stake included."""
+    odds = as_float(odds)
+    price = np.abs(odds)
+    return np.where(odds < 0, 1 + 100 / price, 1 + price / 100)
+
+
+def profit_per_unit(odds):
+    """Profit on a winning one-unit bet at each line."""
+    return decimal_odds(odds) - 1
+
+
+def no_vig_probability(odds, other_odds):
+    """
+    Fair probabilities for both sides of a two-way market, vig removed proportionally.
+
+    Args:
+    - odds, other_odds: Lines for the two sides, row-aligned.
+
+    Returns:
+    - tuple: (side probability, other side probability) arrays.
+    """
+    implied, other_implied = implied_probability(odds), implied_probability(other_odds)
+    overround = implied + other_implied
+    return implied / overround, other_implied / overround
+
+
+def convert_market(odds, other_odds):
+    """
+    Every conversion for both sides of a market at once.
+
+    Returns:
+    - dict: 'implied', 'decimal', 'no_vig' -> (side, other side) arrays, plus 'overround'.
+    """
+    odds, other_odds = as_float(odds), as_float(other_odds)
+    implied, other_implied = implied_probability(odds), implied_probability(other_odds)
+    overround = implied + other_implied
+    return {
+        'implied': (implied, other_implied),
+        'decimal': (decimal_odds(odds), decimal_odds(other_odds)),
+        'no_vig': (implied / overround, other_implied / overround),
+        'overround': overround,
+    }
@@ -0,0 +1,52 @@
+import json
+from functools import lru_cache
+
+# Each day's DraftKings board, parsed once and indexed by team name.
+# Bounded by the number of (league, date) files kept in memory, so a full
+# backfill over the season only ever holds the most recent few days.
+
+MAX_DATES = 64
+
+
+def odds_file_path(league, date):
+    return f'basketball_trends/source/raw_data/{league}/{date}/dk_odds.json'
+
+
+def parse_spread(spread, odds):
+    """Returns (spread, odds, underdog) for one side of a game."""
+    return spread, odds, spread[:1] == '+'
+
+
+@lru_cache(maxsize=MAX_DATES)
+def load_odds_index(league, date):
+    """
+    Index one day's dk_odds.json by DraftKings team name.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - date (str): 'YYYY-MM-DD'.
+
+    Returns:
+    - dict: Team name -> (spread, odds, underdog).
+    """
+    file_path = odds_file_path(league, date)
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            json_data = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {file_path}")
+    except json.JSONDecodeError:
+        raise ValueError(f"Failed to decode JSON from: {file_path}")
+
+    index = {}
+    for game in json_data:
+        game_info = game[0]  # Extract the game dictionary
+        # First listing wins, matching the old linear scan
+        index.setdefault(game_info['Away Team'], parse_spread(game_info['Away Spread'], game_info['Away Spread Odds']))
+        index.setdefault(game_info['Home Team'], parse_spread(game_info['Home Spread'], game_info['Home Spread Odds']))
+    return index
+
+
+def team_line(league, date, team_name):
+    """(spread, odds, underdog) for a team, or None if it is not on the board."""
+    return load_odds_index(league, date).get(team_name)
@@ -0,0 +1,105 @@
+import argparse
+import os
+import timeit
+from datetime import datetime
+import agg_csv_files
+import combine_ranges
+import dtype_policy
+import final_preprocess
+import game_preview_v2
+from trend_dataset import aggregate, ingest_partition, read_raw_tables
+
+# Builds one day's model input in a single process, passing DataFrames from
+# stage to stage instead of writing and re-reading agg_raw, the range previews
+# and agg_preview.csv. The stages are the same functions main.py chains
+# through subprocesses; intermediates are written only when asked for.
+#
+#   python basketball_trends/source/processing/slate_builder.py --league NCB
+#   python basketball_trends/source/processing/slate_builder.py --league NBA --date 2024-12-09 --write-intermediates
+
+
+def aggregate_range(league, date, range_, write_intermediates=False):
+    """
+    agg_raw frame for one ATS range, straight from the day's raw trend CSVs.
+
+    Without intermediates only the situations the preview uses are read; the
+    written agg_raw and dataset partition always hold every situation.
+    """
+    if write_intermediates:
+        df = ingest_partition(league, date, 'ats', range_)
+    else:
+        df = read_raw_tables(league, date, 'ats', range_, game_preview_v2.preview_situations())
+    if df is None:
+        raise FileNotFoundError(f"No trend CSVs for {league}/{date}/ats/{range_}")
+
+    agg_df = aggregate(df)
+    if write_intermediates:
+        output_path = agg_csv_files.output_file(date, league, 'ats', range_)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        agg_df.to_csv(output_path)
+    return agg_df.reset_index()
+
+
+def build_slate(league, date, write_intermediates=False, save=True):
+    """
+    Run aggregation, preview, range combination and final preprocessing for one day in memory.
+
+    Args:
+    - league (str): 'NBA' or 'NCB'.
+    - date (str): 'YYYY-MM-DD'.
+    - write_intermediates (bool): Also write agg_raw, the range previews and agg_preview.csv.
+    - save (bool): Write final_preprocess.csv, the model's input.
+
+    Returns:
+    - pd.DataFrame: final_preprocess rows for the day's slate.
+    """
+    date = str(date)
+    timings = {}
+    start = timeit.default_timer()
+
+    # The schedule and odds are shared by every range, so they are joined once
+    schedule_df = game_preview_v2.add_spread_data(game_preview_v2.process_schedule_data(league, date), league, date)
+    timings['schedule'] = timeit.default_timer() - start
+
+    previews = []
+    for range_file in combine_ranges.RANGE_FILES:
+        stage_start = timeit.default_timer()
+        agg_df = aggregate_range(league, date, range_file[:-len('_aggregated')], write_intermediates)
+        preview_df = game_preview_v2.build_preview(schedule_df, agg_df, league, f'preview {range_file}')
+        if write_intermediates:
+            csv_path, pickle_path = game_preview_v2.output_files(league, date, range_file)
+            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+            preview_df.to_csv(csv_path, index=False)
+            preview_df.to_pickle(pickle_path)
+        previews.append(preview_df)
+        timings[range_file] = timeit.default_timer() - stage_start
+
+    stage_start = timeit.default_timer()
+    combined_df = combine_ranges.combine(*previews)
+    if write_intermediates:
+        combined_df.to_csv(combine_ranges.output_file(league, date), index=False)
+    final_df = final_preprocess.transform(combined_df, league, date)
+    timings['final'] = timeit.default_timer() - stage_start
+
+    if save:
+        output_path = final_preprocess.output_file(league, date)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        final_df.to_csv(output_path)
+
+    timings['total'] = timeit.default_timer() - start
+    print(f"{league} {date}: {len(final_df)} games in {timings['total']:.2f}s "
+          f"({', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items() if stage != 'total')})")
+    return final_df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build a day's model input in memory")
+    parser.add_argument('--league', choices=['NBA', 'NCB'], action='append')
+    parser.add_argument('--date', default=datetime.today().strftime('%Y-%m-%d'))
+    parser.add_argument('--write-intermediates', action='store_true')
+    parser.add_argument('--memory-report', action='store_true', help="Print each preview's memory under the dtype policy")
+    args = parser.parse_args()
+    dtype_policy.REPORT = args.memory_report
+
+    for league in args.league or ['NBA', 'NCB']:
+        build_slate(league, args.date, args.write_intermediates)
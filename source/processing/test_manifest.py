@@ -0,0 +1,94 @@
+import os
+from manifest import Manifest, partition_key
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def touch_later(path):
+    """Move a file's mtime forward without changing its contents."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+
+class Partition:
+    """One stage partition: an input, an optional input, an output and a build that counts its runs."""
+
+    def __init__(self, root):
+        self.key = partition_key('NCB', '2024-12-09', 'ats', 'yearly_all')
+        self.manifest_dir = os.path.join(root, 'manifest')
+        self.source = os.path.join(root, 'raw', 'situation.csv')
+        self.optional = os.path.join(root, 'raw', 'game_results.csv')
+        self.output = os.path.join(root, 'out', 'agg.csv')
+        self.builds = 0
+        write(self.source, 'Team,ATS Record\nKansas,1-0-0\n')
+
+    def build(self):
+        self.builds += 1
+        write(self.output, 'built\n')
+
+    def run(self, version=1, force=False):
+        """Runs the stage in a fresh process-like Manifest, as each pipeline run does."""
+        with Manifest('agg_csv_files', self.manifest_dir, version) as manifest:
+            return manifest.run(self.key, [self.source, self.optional], [self.output], self.build, force)
+
+
+def test_builds_once_then_skips(tmp_path):
+    partition = Partition(str(tmp_path))
+    assert partition.run()
+    assert not partition.run()
+    assert partition.builds == 1
+
+
+def test_changed_input_rebuilds(tmp_path):
+    partition = Partition(str(tmp_path))
+    partition.run()
+    write(partition.source, 'Team,ATS Record\nKansas,2-0-0\n')
+    assert partition.run()
+    assert not partition.run()
+
+
+def test_touched_but_unchanged_input_is_fresh(tmp_path):
+    partition = Partition(str(tmp_path))
+    partition.run()
+    write(partition.source, 'Team,ATS Record\nKansas,1-0-0\n')
+    touch_later(partition.source)
+    assert not partition.run()
+    assert partition.builds == 1
+
+
+def test_optional_input_arriving_rebuilds(tmp_path):
+    partition = Partition(str(tmp_path))
+    partition.run()
+    write(partition.optional, 'Away Team,Home Team,Cover Team\n')
+    assert partition.run()
+    os.remove(partition.optional)
+    assert partition.run()
+
+
+def test_missing_output_version_bump_and_force_rebuild(tmp_path):
+    partition = Partition(str(tmp_path))
+    partition.run()
+    os.remove(partition.output)
+    assert partition.run()
+    assert partition.run(version=2)
+    assert not partition.run(version=2)
+    assert partition.run(version=2, force=True)
+    assert partition.builds == 4
+
+
+def test_failed_build_is_not_recorded(tmp_path):
+    partition = Partition(str(tmp_path))
+
+    def fail():
+        raise RuntimeError('stage failed')
+
+    manifest = Manifest('agg_csv_files', partition.manifest_dir)
+    try:
+        manifest.run(partition.key, [partition.source], [partition.output], fail)
+    except RuntimeError:
+        pass
+    assert partition.key not in manifest.entries
@@ -0,0 +1,67 @@
+import glob
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from odds import convert_market, decimal_odds, implied_probability, no_vig_probability, parse_american
+
+RAW_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'raw_data')
+
+
+def old_probability(odds):
+    """The string helper final_preprocess used before odds.py, kept as the reference it replaced."""
+    fav = odds[0] == '-'
+    odds = int(odds[1:])
+    if not fav:
+        return odds / (odds + 100)
+    else:
+        return 100 / (odds + 100)
+
+
+def test_parse_american():
+    parsed = parse_american(pd.Series(['−110', '-110', '+105', '105', ' EVEN ', 'even', 'PK', 'N/A', '', None]))
+    assert str(parsed.dtype) == 'Int16'
+    assert parsed.tolist()[:7] == [-110, -110, 105, 105, 100, 100, 100]
+    assert parsed.isna().tolist() == [False] * 7 + [True] * 3
+
+
+def test_parse_american_keeps_index_and_numbers():
+    series = pd.Series(['−120', '+140'], index=[7, 3], name='Home Team Odds')
+    parsed = parse_american(series)
+    assert parsed.index.tolist() == [7, 3] and parsed.name == 'Home Team Odds'
+    assert parse_american(pd.Series([-110.0, 250.0])).tolist() == [-110, 250]
+
+
+def test_implied_probability():
+    probabilities = implied_probability(['−110', '-110', '+105', 'EVEN', 'N/A'])
+    assert np.allclose(probabilities[:4], [110 / 210, 110 / 210, 100 / 205, 0.5])
+    assert np.isnan(probabilities[4])
+
+
+@pytest.mark.parametrize('odds, expected', [('+105', 100 / 205), ('+250', 100 / 350), ('-110', 110 / 210)])
+def test_ascii_signed_lines_are_no_longer_inverted(odds, expected):
+    assert np.isclose(implied_probability(odds)[0], expected)
+    assert np.isclose(old_probability(odds), 1 - expected)
+
+
+def test_dk_spread_odds_on_disk_match_old_helper():
+    prices = []
+    for path in glob.glob(os.path.join(RAW_DATA, '*', '*', 'dk_odds.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for game in json.load(f):
+                prices += [game[0]['Away Spread Odds'], game[0]['Home Spread Odds']]
+    prices = [price for price in prices if price not in ('N/A', '-999')]
+    if not prices:
+        pytest.skip('no dk_odds.json in raw_data')
+    assert np.allclose(np.round(implied_probability(prices), 4), [round(old_probability(price), 4) for price in prices])
+
+
+def test_decimal_and_no_vig():
+    assert np.allclose(decimal_odds(['−110', '+105']), [1 + 100 / 110, 2.05])
+    side, other = no_vig_probability('−110', '−110')
+    assert np.allclose([side[0], other[0]], [0.5, 0.5])
+
+    market = convert_market(['−120'], ['+100'])
+    assert np.isclose(market['overround'][0], 120 / 220 + 0.5)
+    assert np.isclose(market['no_vig'][0][0] + market['no_vig'][1][0], 1.0)
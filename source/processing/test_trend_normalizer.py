@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pandas as pd
+from trend_normalizer import field_columns, normalize_table, parse_record, rename_field
+
+# Fixture pages are scraped Team Rankings tables from the committed raw_data
+RAW_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'raw_data')
+ATS_PAGE = os.path.join(RAW_DATA, 'NCB', '2024-11-17', 'ats', 'yearly_2024_2025', 'four_plus_days_off.csv')
+OU_PAGE = os.path.join(RAW_DATA, 'NCB', '2024-11-17', 'ou', 'yearly_all', 'four_plus_days_off.csv')
+
+
+def split_record(series):
+    """W-L-P parts the way the string pipeline split them."""
+    return series.str.split('-', expand=True).astype(int)
+
+
+def as_number(series):
+    return pd.to_numeric(series.str.rstrip('%'), errors='coerce')
+
+
+def test_ats_page():
+    page = pd.read_csv(ATS_PAGE, dtype=str)
+    typed = normalize_table(page)
+
+    assert list(typed.columns) == ['Team', 'wins', 'losses', 'pushes', 'cover_pct', 'mov', 'ats_pm']
+    assert typed['Team'].tolist() == page['Team'].tolist()
+    assert (typed[['wins', 'losses', 'pushes']].dtypes == 'Int16').all()
+    assert (typed[['cover_pct', 'mov', 'ats_pm']].dtypes == 'float32').all()
+
+    assert (typed[['wins', 'losses', 'pushes']].to_numpy(dtype=int) == split_record(page['ATS Record']).to_numpy()).all()
+    for column, field in [('Cover %', 'cover_pct'), ('MOV', 'mov'), ('ATS +/-', 'ats_pm')]:
+        assert np.allclose(typed[field], as_number(page[column]), equal_nan=True, atol=1e-5), column
+
+    # '--' ATS +/- of teams without a game in the situation stays NaN
+    placeholders = page['ATS +/-'] == '--'
+    assert placeholders.sum() > 0
+    assert typed.loc[placeholders, 'ats_pm'].isna().all()
+    assert typed.loc[page['Team'] == 'Kansas', ['wins', 'cover_pct', 'ats_pm']].iloc[0].tolist() == [1, 100.0, 2.5]
+
+
+def test_ou_page():
+    page = pd.read_csv(OU_PAGE, dtype=str)
+    typed = normalize_table(page)
+
+    assert list(typed.columns) == ['Team', 'overs', 'unders', 'pushes', 'over_pct', 'under_pct', 'total_pm']
+    assert (typed[['overs', 'unders', 'pushes']].to_numpy(dtype=int) == split_record(page['Over Record']).to_numpy()).all()
+    assert np.allclose(typed['total_pm'], as_number(page['Total +/-']), equal_nan=True, atol=1e-5)
+
+
+def test_missing_and_malformed_records_are_na():
+    parts = parse_record(pd.Series(['12-3-1', ' 0-0-0 ', '12-3', 'N/A', None]))
+    assert parts.iloc[0].tolist() == [12, 3, 1]
+    assert parts.iloc[1].tolist() == [0, 0, 0]
+    assert parts.iloc[2:].isna().all().all()
+
+
+def test_field_columns():
+    columns = ['Away Team is_dog_mov_current_season', 'Home Team is_home_mov_all_time', 'Away Team is_dog_movement',
+               'is_home_mov', 'Away Team is_dog_cover_pct_current_season']
+    assert field_columns(columns, 'mov') == columns[:2] + ['is_home_mov']
+    assert rename_field('Away Team is_dog_cover_pct_current_season', 'cover_pct', 'Cover %') == \
+        'Away Team is_dog_Cover %_current_season'
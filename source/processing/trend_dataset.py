@@ -0,0 +1,192 @@
+import argparse
+import glob
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from trend_normalizer import METRIC_COLUMNS, NULLABLE_RECORD_DTYPE, RECORD_COLUMNS, normalize_table
+
+# Columnar store for the Team Rankings trend tables.
+#
+# raw_data holds one small CSV per (league, date, type, range, situation). Ingest
+# folds each (league, date, type, range) into a single Parquet file with the
+# situation as a column and the stats typed by trend_normalizer, laid out as a hive dataset:
+#   proc_data/trends/league=NBA/date=2024-12-09/type=ats/range=yearly_all/part-0.parquet
+# load_trends() reads it back with partition pruning and column projection, so a
+# whole season is one dataset scan instead of thousands of read_csv calls.
+#
+#   python trend_dataset.py ingest            # ingest every day under raw_data
+#   python trend_dataset.py ingest --league NBA --date 2024-12-09
+
+RAW_DIR = 'basketball_trends/source/raw_data'
+DATASET_DIR = 'basketball_trends/source/proc_data/trends'
+
+TYPES = ['ou', 'ats']
+RANGES = ['yearly_since_2014_2015', 'yearly_all', 'yearly_2024_2025']
+SITUATIONS = [
+    'all_games', 'is_after_win', 'is_after_loss',
+    'is_home', 'is_away', 'is_fav',
+    'is_dog', 'rest_advantage', 'rest_disadvantage',
+    'equal_rest', 'four_plus_days_off', 'two_three_days_off',
+    'one_day_off', 'no_rest'
+]
+PARTITION_KEYS = ['league', 'date', 'type', 'range']
+
+SCHEMA = pa.schema(
+    [('Team', pa.string()), ('situation', pa.string())]
+    + [(column, pa.int16()) for column in RECORD_COLUMNS]
+    + [(column, pa.float32()) for column in METRIC_COLUMNS]
+)
+PARTITIONING = ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor='hive')
+
+
+def raw_table_dir(league, date, type_, range_):
+    return f'{RAW_DIR}/{league}/{date}/{type_}/{range_}'
+
+
+def partition_dir(league, date, type_, range_, dataset_dir=DATASET_DIR):
+    return f'{dataset_dir}/league={league}/date={date}/type={type_}/range={range_}'
+
+
+def read_raw_tables(league, date, type_, range_, situations=None):
+    """
+    Stack every situation CSV of one partition into a long frame.
+
+    Args:
+    - situations (list): Read only these situations' CSVs; None reads them all.
+
+    Returns:
+    - pd.DataFrame: One row per (situation, team), or None if nothing was scraped.
+    """
+    frames = []
+    for file_path in sorted(glob.glob(f'{raw_table_dir(league, date, type_, range_)}/*.csv')):
+        situation = os.path.basename(file_path)[:-len('.csv')]
+        if situations is not None and situation not in situations:
+            continue
+        df = pd.read_csv(file_path, dtype=str)
+        df.insert(1, 'situation', situation)
+        frames.append(df)
+    if not frames:
+        return None
+    return normalize_table(pd.concat(frames, ignore_index=True))
+
+
+def ingest_partition(league, date, type_, range_, dataset_dir=DATASET_DIR):
+    """
+    Write one (league, date, type, range) of raw CSVs into the dataset, replacing any earlier copy.
+
+    Returns:
+    - pd.DataFrame: The long frame that was written, or None if there were no raw files.
+    """
+    df = read_raw_tables(league, date, type_, range_)
+    if df is None:
+        return None
+    table = pa.Table.from_pandas(df.reindex(columns=SCHEMA.names), schema=SCHEMA, preserve_index=False)
+    output_dir = partition_dir(league, date, type_, range_, dataset_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    pq.write_table(table, f'{output_dir}/part-0.parquet')
+    return df
+
+
+def ingest_day(league, date, dataset_dir=DATASET_DIR):
+    """Ingest every type and range scraped for a league-day. Returns the number of partitions written."""
+    written = 0
+    for type_ in TYPES:
+        for range_ in RANGES:
+            if ingest_partition(league, date, type_, range_, dataset_dir) is not None:
+                written += 1
+    return written
+
+
+def isin(field, values):
+    return ds.field(field).isin([str(value) for value in values])
+
+
+def load_trends(leagues=None, dates=None, types=None, ranges=None, situations=None,
+                start_date=None, end_date=None, columns=None, dataset_dir=DATASET_DIR):
+    """
+    Read trend rows from the dataset, touching only the partitions and columns asked for.
+
+    Args:
+    - leagues, dates, types, ranges, situations (list): Keep only these values; None keeps all.
+    - start_date, end_date (str): Inclusive 'YYYY-MM-DD' bounds on the date partition.
+    - columns (list): Columns to read, e.g. ['Team', 'situation', 'MOV']; None reads all.
+    - dataset_dir (str): Root of the hive-partitioned dataset.
+
+    Returns:
+    - pd.DataFrame: Long frame with the partition keys as columns.
+    """
+    schema = pa.unify_schemas([SCHEMA, PARTITIONING.schema])
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning=PARTITIONING, schema=schema)
+
+    conditions = []
+    for field, values in [('league', leagues), ('date', dates), ('type', types), ('range', ranges),
+                          ('situation', situations)]:
+        if values is not None:
+            conditions.append(isin(field, values))
+    if start_date is not None:
+        conditions.append(ds.field('date') >= str(start_date))
+    if end_date is not None:
+        conditions.append(ds.field('date') <= str(end_date))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    # Nullable Int16 keeps the record counts integral when ats and ou rows are read together
+    return dataset.to_table(columns=columns, filter=expression).to_pandas(types_mapper={pa.int16(): pd.Int16Dtype()}.get)
+
+
+def aggregate(df):
+    """
+    Pivot long trend rows into the agg_raw layout: one row per team, '{situation}_{stat}' columns.
+
+    Args:
+    - df (pd.DataFrame): Rows from load_trends() or ingest_partition(); may span many partitions.
+
+    Returns:
+    - pd.DataFrame: Indexed by the partition keys present in df plus 'Team'.
+    """
+    keys = [key for key in PARTITION_KEYS if key in df.columns]
+    stats = [column for column in df.columns if column not in keys + ['Team', 'situation'] and df[column].notna().any()]
+    long = df.set_index(keys + ['Team', 'situation'])
+    wide = long[stats].unstack('situation')
+    present = pd.Series(True, index=long.index).unstack('situation', fill_value=False)
+
+    situations = [situation for situation in SITUATIONS if situation in wide.columns.get_level_values(1)]
+    ordered = [(stat, situation) for situation in situations for stat in stats if (stat, situation) in wide.columns]
+    wide = wide[ordered]
+    # A team missing from a situation's table: its record is <NA> and its metrics 0,
+    # as when agg_raw held strings and the preview filled the gaps with 0
+    for stat, situation in ordered:
+        if stat in RECORD_COLUMNS:
+            wide[(stat, situation)] = wide[(stat, situation)].astype(NULLABLE_RECORD_DTYPE)
+        else:
+            wide[(stat, situation)] = wide[(stat, situation)].mask(~present[situation], 0)
+    wide.columns = [f'{situation}_{stat}' for stat, situation in ordered]
+    return wide
+
+
+def aggregate_partition(league, date, type_, range_, dataset_dir=DATASET_DIR):
+    """agg_raw frame for one partition, read from the dataset."""
+    df = load_trends([league], [date], [type_], [range_], dataset_dir=dataset_dir)
+    if df.empty:
+        raise FileNotFoundError(f'No trends ingested for {partition_dir(league, date, type_, range_, dataset_dir)}')
+    return aggregate(df.drop(columns=PARTITION_KEYS))
+
+
+def raw_days(league):
+    return sorted(os.path.basename(path) for path in glob.glob(f'{RAW_DIR}/{league}/*') if os.path.isdir(path))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest raw trend CSVs into the Parquet trend dataset')
+    parser.add_argument('command', choices=['ingest'])
+    parser.add_argument('--league', choices=['NBA', 'NCB'], action='append')
+    parser.add_argument('--date', action='append', help='YYYY-MM-DD; defaults to every day under raw_data')
+    args = parser.parse_args()
+
+    for league in args.league or ['NBA', 'NCB']:
+        for date in args.date or raw_days(league):
+            ingest_day(league, date)
+        print(f'{league} trends ingested to {DATASET_DIR}')
@@ -0,0 +1,97 @@
+import re
+import pandas as pd
+
+# Turns Team Rankings trend tables into typed columns once, at ingest:
+#   ATS Record '951-862-31' -> wins 951, losses 862, pushes 31   (Int16)
+#   Cover %    '52.5%'      -> cover_pct 52.5                     (float32)
+#   MOV '-3.1', ATS +/- '+0.3', '--' placeholders -> float32, NaN for '--'
+# Over/under tables get the same treatment under their own field names.
+#
+# Missing values keep the meaning they had when the stats were strings: a
+# record that is not there (team absent from a table, malformed text) is <NA>,
+# and final_preprocess zeroes a Sample Size column holding one, as the string
+# split used to. A metric of a team absent from a table is 0, while '--' stays
+# NaN, the non-numeric placeholder it was.
+
+RECORD_PATTERN = r'^\s*(\d+)-(\d+)-(\d+)\s*$'
+NUMBER_PATTERN = r'^\s*([+-]?\d+(?:\.\d+)?)\s*%?\s*$'
+
+RECORD_DTYPE = 'int16'
+NULLABLE_RECORD_DTYPE = 'Int16'
+METRIC_DTYPE = 'float32'
+
+# Scraped column -> typed field(s)
+RECORD_FIELDS = {
+    'ATS Record': ['wins', 'losses', 'pushes'],
+    'Over Record': ['overs', 'unders', 'pushes'],
+}
+METRIC_FIELDS = {
+    'Cover %': 'cover_pct',
+    'MOV': 'mov',
+    'ATS +/-': 'ats_pm',
+    'Over %': 'over_pct',
+    'Under %': 'under_pct',
+    'Total +/-': 'total_pm',
+}
+RECORD_COLUMNS = sorted({field for fields in RECORD_FIELDS.values() for field in fields})
+METRIC_COLUMNS = list(METRIC_FIELDS.values())
+
+# Fields an ATS table normalizes to, in output order
+ATS_RECORD_FIELDS = RECORD_FIELDS['ATS Record']
+ATS_METRIC_FIELDS = ['cover_pct', 'mov', 'ats_pm']
+ATS_FIELDS = ATS_RECORD_FIELDS + ATS_METRIC_FIELDS
+
+
+def parse_record(series, fields=RECORD_FIELDS['ATS Record']):
+    """
+    Split 'W-L-P' strings into three Int16 columns; malformed or missing records are <NA>.
+
+    Args:
+    - series (pd.Series): Record strings.
+    - fields (list): Names for the three parts.
+
+    Returns:
+    - pd.DataFrame: One Int16 column per part, aligned to series.
+    """
+    parts = series.astype('string').str.extract(RECORD_PATTERN)
+    parts.columns = fields
+    return parts.astype(NULLABLE_RECORD_DTYPE)
+
+
+def parse_metric(series):
+    """'52.5%' -> 52.5, '+0.3' -> 0.3, '--' -> NaN, as float32."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(METRIC_DTYPE)
+    return series.astype('string').str.extract(NUMBER_PATTERN, expand=False).astype(METRIC_DTYPE)
+
+
+def normalize_table(df):
+    """
+    Replace every scraped stat column of a trend table with its typed fields.
+
+    Args:
+    - df (pd.DataFrame): Table as scraped (Team, ATS Record, Cover %, MOV, ATS +/-, ...).
+
+    Returns:
+    - pd.DataFrame: Same rows; non-stat columns kept, stat columns replaced in place.
+    """
+    columns = {}
+    for column in df.columns:
+        if column in RECORD_FIELDS:
+            for field, values in parse_record(df[column], RECORD_FIELDS[column]).items():
+                columns[field] = values
+        elif column in METRIC_FIELDS:
+            columns[METRIC_FIELDS[column]] = parse_metric(df[column])
+        else:
+            columns[column] = df[column]
+    return pd.DataFrame(columns, index=df.index)
+
+
+def field_columns(columns, field):
+    """Wide-layout columns holding `field`, e.g. 'is_home_mov' or 'Away Team is_dog_mov_current_season'."""
+    pattern = re.compile(rf'(?:^|[_ ]){re.escape(field)}(?:_|$)')
+    return [column for column in columns if pattern.search(column)]
+
+
+def rename_field(column, field, new_name):
+    return re.sub(rf'(^|[_ ]){re.escape(field)}(_|$)', lambda m: f'{m.group(1)}{new_name}{m.group(2)}', column)
@@ -0,0 +1,67 @@
+import argparse
+import os
+import statistics
+import timeit
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from driver_pool import create_driver
+from fixtures import FIXTURE_DIR, FixtureStore, replay_url, start_replay_server
+
+# Page-ready time with and without the fast browser profile, measured against
+# pages recorded with SCRAPER_FIXTURES=record (see fixtures.py) and served by
+# the local replay server, so the numbers don't depend on the live sites.
+#
+#   python bench_profile.py --host draftkings.com --selector ".parlay-card-10-a"
+
+
+def time_page(driver, url, selector, timeout=20):
+    """Seconds from driver.get() until `selector` is present in the DOM."""
+    start = timeit.default_timer()
+    driver.get(url)
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+    return timeit.default_timer() - start
+
+
+def bench_profile(urls, selector, fast_profile, repeats):
+    """Loads every URL `repeats` times in one browser and returns the page-ready times."""
+    driver = create_driver(fast_profile=fast_profile)
+    try:
+        time_page(driver, urls[0], selector)  # Warm-up load, not counted
+        return [time_page(driver, url, selector) for _ in range(repeats) for url in urls]
+    finally:
+        driver.quit()
+
+
+def main(store_path=FIXTURE_DIR, host='', selector='table', repeats=3):
+    store = FixtureStore(store_path)
+    recorded = [url for url in store.urls() if host in url]
+    if not recorded:
+        raise FileNotFoundError(f"No recorded pages matching '{host}' in {store_path}")
+
+    server, base_url = start_replay_server(store)
+    try:
+        urls = [replay_url(url, base_url) for url in recorded]
+        results = {}
+        for label, fast_profile in [('default', False), ('fast', True)]:
+            results[label] = bench_profile(urls, selector, fast_profile, repeats)
+    finally:
+        server.shutdown()
+
+    print(f"{len(recorded)} pages x {repeats} loads, ready when '{selector}' is present")
+    for label, times in results.items():
+        print(f"{label:>8}: median {statistics.median(times) * 1000:.0f} ms, "
+              f"mean {statistics.mean(times) * 1000:.0f} ms, max {max(times) * 1000:.0f} ms")
+    speedup = statistics.median(results['default']) / statistics.median(results['fast'])
+    print(f"fast profile speedup: {speedup:.2f}x")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Page-ready time with and without the fast browser profile')
+    parser.add_argument('--store', default=os.environ.get('SCRAPER_FIXTURE_DIR', FIXTURE_DIR))
+    parser.add_argument('--host', default='', help='Only replay recorded pages whose URL contains this')
+    parser.add_argument('--selector', default='table', help='CSS selector that marks a page as ready')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    main(args.store, args.host, args.selector, args.repeats)
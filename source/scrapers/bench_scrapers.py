@@ -0,0 +1,158 @@
+import argparse
+import csv
+import os
+import statistics
+import sys
+import timeit
+from datetime import datetime
+from lxml import html as lxml_html
+from fixtures import FIXTURE_DIR, FixtureStore, replay_url, start_replay_server
+from trend_tables import parse_table
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive'))
+
+# Offline benchmark for every scraper, run against pages recorded with
+# SCRAPER_FIXTURES=record. Parse time per page is reported once per host's parser
+# (both Team Rankings engines share one); end-to-end fetch+parse wall time and
+# pages/sec through the local replay server are reported per scraper engine.
+# Results are appended to a CSV log so regressions show up run over run: parse rows
+# are logged under the host, end-to-end rows under the scraper.
+#
+#   python bench_scrapers.py                 # HTTP scrapers end to end, all parsers
+#   python bench_scrapers.py --browser       # also drive headless Chrome end to end
+
+BENCH_LOG = FIXTURE_DIR.parent / 'bench_log.csv'
+
+
+def parse_dk(url, html):
+    from dk import WebScraper
+    league = 'NBA' if url.rstrip('/').endswith('/nba') else 'NCB'
+    return WebScraper(league, 'DK', []).scrape_page_source(html)
+
+
+def parse_covers(url, html):
+    # Same XPath covers_results.py walks through Selenium
+    return lxml_html.fromstring(html).xpath('/html/body/main/div[3]/article')
+
+
+def parse_espn(url, html):
+    from results import parse_scores
+    league = 'ncb' if 'mens-college-basketball' in url else 'nba'
+    return parse_scores(html, league, 'espn', {})
+
+
+# One parser per host; recorded pages are keyed by URL, so a host's pages are timed once
+PARSERS = {
+    'teamrankings.com': lambda url, html: parse_table(html),
+    'draftkings.com': parse_dk,
+    'covers.com': parse_covers,
+    'espn.com': parse_espn,
+}
+
+SCRAPERS = {
+    'team_rankings': {'host': 'teamrankings.com', 'engine': 'browser'},
+    'team_rankings_http': {'host': 'teamrankings.com', 'engine': 'http'},
+    'dk': {'host': 'draftkings.com', 'engine': 'browser'},
+    'covers_results': {'host': 'covers.com', 'engine': 'browser'},
+    'results': {'host': 'espn.com', 'engine': 'http'},
+}
+
+
+def bench_parse(pages, parse):
+    """Seconds spent parsing each recorded page."""
+    times = []
+    for url, html in pages:
+        start = timeit.default_timer()
+        parse(url, html)
+        times.append(timeit.default_timer() - start)
+    return times
+
+
+def bench_end_to_end(pages, parse, engine, base_url):
+    """Wall time to fetch every page from the replay server and parse it."""
+    if engine == 'http':
+        import requests
+        with requests.Session() as session:
+            start = timeit.default_timer()
+            for url, _ in pages:
+                response = session.get(replay_url(url, base_url))
+                response.raise_for_status()
+                parse(url, response.text)
+            return timeit.default_timer() - start
+
+    from driver_pool import create_driver
+    driver = create_driver(fast_profile=True)
+    try:
+        start = timeit.default_timer()
+        for url, _ in pages:
+            driver.get(replay_url(url, base_url))
+            parse(url, driver.page_source)
+        return timeit.default_timer() - start
+    finally:
+        driver.quit()
+
+
+def log_results(file_path, rows):
+    file_exists = os.path.exists(file_path)
+    with open(file_path, mode='a', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=rows[0].keys())
+        if not file_exists:
+            writer.writeheader()  # Write headers only if the file doesn't exist
+        writer.writerows(rows)
+
+
+def main(store_path=FIXTURE_DIR, browser=False, log_file=BENCH_LOG):
+    store = FixtureStore(store_path)
+    all_pages = list(store.items())
+    server, base_url = start_replay_server(store)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    pages_by_host = {host: [(url, html) for url, html in all_pages if host in url] for host in PARSERS}
+    rows = []
+    try:
+        for host, parse in PARSERS.items():
+            pages = pages_by_host[host]
+            if not pages:
+                print(f"{host:>20}: no recorded pages")
+                continue
+            parse_times = bench_parse(pages, parse)
+            rows.append({
+                'timestamp': timestamp,
+                'scraper': host,
+                'pages': len(pages),
+                'parse_ms_per_page': statistics.mean(parse_times) * 1000,
+                'parse_pages_per_sec': len(pages) / sum(parse_times) if sum(parse_times) else 0.0,
+                'wall_time': '',
+                'pages_per_sec': '',
+            })
+            print(f"{host:>20}: {len(pages)} pages, parse {rows[-1]['parse_ms_per_page']:.1f} ms/page")
+
+        for name, scraper in SCRAPERS.items():
+            pages = pages_by_host[scraper['host']]
+            if not pages or not (scraper['engine'] == 'http' or browser):
+                continue
+            wall_time = bench_end_to_end(pages, PARSERS[scraper['host']], scraper['engine'], base_url)
+            rows.append({
+                'timestamp': timestamp,
+                'scraper': name,
+                'pages': len(pages),
+                'parse_ms_per_page': '',
+                'parse_pages_per_sec': '',
+                'wall_time': wall_time,
+                'pages_per_sec': len(pages) / wall_time,
+            })
+            print(f"{name:>20}: {len(pages)} pages, end-to-end {wall_time:.2f}s ({rows[-1]['pages_per_sec']:.1f} pages/s)")
+    finally:
+        server.shutdown()
+
+    if rows and log_file:
+        log_results(log_file, rows)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the scrapers against recorded fixtures')
+    parser.add_argument('--store', default=os.environ.get('SCRAPER_FIXTURE_DIR', FIXTURE_DIR))
+    parser.add_argument('--browser', action='store_true', help='Also run the Selenium scrapers end to end')
+    parser.add_argument('--log', default=BENCH_LOG, help='CSV file results are appended to')
+    args = parser.parse_args()
+    main(args.store, args.browser, args.log)
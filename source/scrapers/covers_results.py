@@ -1,30 +1,23 @@
 import csv
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from driver_pool import shared_pool
+from fixtures import fixture_mode, record_page, resolve_url
+from rate_limiter import call_with_retry, shared_limiter
 from datetime import date, timedelta
 
-def setup_driver():
-    """Sets up and returns a basic Selenium WebDriver instance."""
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('log-level=3')
-    
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    return driver
-
-def fetch_articles_and_save_to_csv(url, output_csv):
+def fetch_articles_and_save_to_csv(url, output_csv, limiter=None, pool=None):
     """Fetches titles and dynamic text from each article and saves parsed data to a CSV."""
-    driver = setup_driver()
-    try:
-        driver.get(url)
+    limiter = limiter or shared_limiter()
+    # Full profile: article text is read through Selenium, which depends on page CSS
+    pool = pool or shared_pool(fast_profile=False)
+    # A page that raises sends its browser back as broken, to be replaced
+    with pool.driver() as driver:
+        url = resolve_url(url)
+        call_with_retry(limiter, url, lambda: driver.get(url), retry_on=(WebDriverException,))
+        if fixture_mode() == 'record':
+            record_page(url, driver.page_source)
         
         # Locate all articles dynamically
         articles = driver.find_elements(By.XPATH, "/html/body/main/div[3]/article")
@@ -62,8 +55,6 @@ def fetch_articles_and_save_to_csv(url, output_csv):
                     print()
                 except Exception as e:
                     print(f"Error processing Article {idx}: {e}")
-    finally:
-        driver.quit()
 
 def main():
     # Main Execution
@@ -7,15 +7,27 @@ import sys
 import time
 import timeit
 import tqdm
+from bs4 import BeautifulSoup
 from datetime import date, datetime
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 from tqdm import tqdm
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import shared_pool
+from fixtures import fixture_mode, record_page, resolve_url
+from odds_log import OddsLogWriter, log_path
+from rate_limiter import call_with_retry, shared_limiter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Dictionary'))
+from team_registry import TeamRegistry
+
+
+def event_id_from_href(href):
+    """DraftKings event ID from a game's link ('/event/nyk-knicks-%40-tor-raptors/30512345'), or '-999'."""
+    event_id = (href or '').rstrip('/').rsplit('/', 1)[-1].split('?')[0]
+    return event_id if event_id.isdigit() else '-999'
 
 
 class TeamMappingsLoader:
@@ -36,12 +48,15 @@ class ProgressPrinter:
 
 
 class WebScraper:
-    def __init__(self, league, book, team_mappings):
+    def __init__(self, league, book, team_mappings, limiter=None, pool=None):
         self.league = league
         self.book = book
         self.live_games = 0
         self.total_games = 0
         self.team_mappings = team_mappings
+        self.registry = TeamRegistry(league, team_mappings)
+        self.limiter = limiter or shared_limiter()
+        self.pool = pool or shared_pool()
 
     def encode_bet_table_id(self, matchup_id):
         return f'{self.book}_{matchup_id}'
@@ -50,22 +65,13 @@ class WebScraper:
         return f'{away_id}_{home_id}_{self.league}'
 
     def find_team_id(self, team_name):
-        for team_mapping in self.team_mappings:
-            if team_mapping["DraftKings Name"] == team_name:
-                return team_mapping["TeamID"]
-        return "Unknown"
+        return self.registry.translate(team_name, 'DraftKings', 'TeamID')
 
     def find_abv(self, team_name):
-        for team_mapping in self.team_mappings:
-            if team_mapping["DraftKings Name"] == team_name:
-                return team_mapping["PlainText"]
-        return "Unknown"
+        return self.registry.translate(team_name, 'DraftKings', 'PlainText')
 
     def find_team_rank_name(self, dk_team_name):
-        for team_mapping in self.team_mappings:
-            if team_mapping["DraftKings Name"] == dk_team_name:
-                return team_mapping["Team Rankings Name"]
-        return "Unknown"
+        return self.registry.translate(dk_team_name, 'DraftKings', 'Team Rankings')
 
     def find_element_text_or_not_found(self, driver, xpath, wait_time=2):
         try:
@@ -121,6 +127,9 @@ class WebScraper:
         # home_abv = self.find_abv(home_team_text)
         self.total_games += 1
 
+        links = driver.find_elements(By.CSS_SELECTOR, f'.sportsbook-table__body > tr:nth-child({x}) > {self.EVENT_LINK_SELECTOR}')
+        event_id = event_id_from_href(links[0].get_attribute('href') if links else None)
+
         if (self.find_element_text_or_not_found(driver, f'div.parlay-card-10-a:nth-child(1) > table:nth-child(1) > tbody:nth-child(2) > tr:nth-child({x}) > th:nth-child(1) > a:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(3) > span:nth-child(2)') != '-999'):
             self.live_games += 1
             start_time_text = 'Live Game'
@@ -144,6 +153,7 @@ class WebScraper:
                     'Over Total Odds': self.check_even(over_total_odds_text), 
                     'Under Total Odds': self.check_even(under_total_odds_text),
                     'Start Time': start_time_text, 
+                    'Event ID': event_id,
 
                 },
                 # 'MatchupID': matchup_id,
@@ -166,14 +176,86 @@ class WebScraper:
         #     print(f"Error scraping team {away_team_text}, {home_team_text}")
         #     return None
     
-    def init_driver(self):
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('log-level=3')
+    # Row-relative copies of the selectors in scrape(). The single-pass mode
+    # applies these to every <tr> of a parsed page_source snapshot instead of
+    # running one WebDriverWait per field.
+    TEAM_SELECTOR = 'th:nth-child(1) > a:nth-child(1) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1)'
+    NCB_TEAM_SELECTOR = 'th > a > div > div.event-cell > div > div > div > div'
+    SPREAD_SELECTOR = 'td:nth-child(2) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > span:nth-child(1)'
+    SPREAD_ODDS_SELECTOR = 'td:nth-child(2) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(2) > div:nth-child(2) > span:nth-child(1)'
+    TOTAL_SELECTOR = 'td:nth-child(3) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > span:nth-child(3)'
+    TOTAL_ODDS_SELECTOR = 'td:nth-child(3) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(2) > div:nth-child(2) > span:nth-child(1)'
+    ML_SELECTOR = 'td:nth-child(4) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(2) > span:nth-child(1)'
+    START_TIME_SELECTOR = 'th:nth-child(1) > a:nth-child(1) > div:nth-child(1) > div:nth-child(1) > span:nth-child(2)'
+    LIVE_SELECTOR = 'th:nth-child(1) > a:nth-child(1) > div:nth-child(1) > div:nth-child(1) > div:nth-child(3) > span:nth-child(2)'
+    EVENT_LINK_SELECTOR = 'th:nth-child(1) > a:nth-child(1)'
+
+    def select_text_or_not_found(self, row, selector):
+        """Same contract as find_element_text_or_not_found, against a parsed row."""
+        element = row.select_one(f':scope > {selector}')
+        if element is None:
+            return '-999'
+        text = element.get_text(strip=True)
+        if text == '':
+            return '-999'
+        return text
+
+    def parse_rows(self, away_row, home_row, current_timestamp):
+        """Build one matchup record from an away/home pair of parsed table rows."""
+        team_selector = self.NCB_TEAM_SELECTOR if self.league == 'NCB' else self.TEAM_SELECTOR
+        away_team_text = self.select_text_or_not_found(away_row, team_selector)
+        home_team_text = self.select_text_or_not_found(home_row, team_selector)
+        start_time_text = self.select_text_or_not_found(away_row, self.START_TIME_SELECTOR)
+        link = away_row.select_one(f':scope > {self.EVENT_LINK_SELECTOR}')
+        event_id = event_id_from_href(link.get('href') if link else None)
+
+        self.total_games += 1
+        if self.select_text_or_not_found(away_row, self.LIVE_SELECTOR) != '-999':
+            self.live_games += 1
+            start_time_text = 'Live Game'
+
+        info = {
+                    'Scrape Time': current_timestamp,
+                    'Book Name': self.book,
+                    'Away Team': away_team_text,
+                    'Away Spread': self.select_text_or_not_found(away_row, self.SPREAD_SELECTOR),
+                    'Away Spread Odds': self.check_even(self.select_text_or_not_found(away_row, self.SPREAD_ODDS_SELECTOR)),
+                    'Away ML': self.check_even(self.select_text_or_not_found(away_row, self.ML_SELECTOR)),
+                    'Home Team': home_team_text,
+                    'Home Spread': self.select_text_or_not_found(home_row, self.SPREAD_SELECTOR),
+                    'Home Spread Odds': self.check_even(self.select_text_or_not_found(home_row, self.SPREAD_ODDS_SELECTOR)),
+                    'Home ML': self.check_even(self.select_text_or_not_found(home_row, self.ML_SELECTOR)),
+                    'Total': self.select_text_or_not_found(away_row, self.TOTAL_SELECTOR),
+                    'Over Total Odds': self.check_even(self.select_text_or_not_found(away_row, self.TOTAL_ODDS_SELECTOR)),
+                    'Under Total Odds': self.check_even(self.select_text_or_not_found(home_row, self.TOTAL_ODDS_SELECTOR)),
+                    'Start Time': start_time_text,
+                    'Event ID': event_id,
+                },
+        return info  # Same one-element tuple scrape() returns, so dk_odds.json keeps its shape
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
+    def scrape_page_source(self, page_source):
+        """
+        Parse every game on the page in a single pass over a page_source snapshot.
+
+        Args:
+        - page_source (str): HTML of the league page once '.parlay-card-10-a' is visible.
+
+        Returns:
+        - list: Matchup records in the same format as scrape().
+        """
+        soup = BeautifulSoup(page_source, 'lxml')
+        card = soup.select_one('.parlay-card-10-a')
+        if card is None:
+            return []
+
+        rows = card.select('table > tbody > tr')
+        current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        all_matchups = []
+        for away_row, home_row in zip(rows[0::2], rows[1::2]):
+            matchup = self.parse_rows(away_row, home_row, current_timestamp)
+            if matchup:
+                all_matchups.append(matchup)
+        return all_matchups
 
     def check_even(self, text):
         if text == 'Even':
@@ -188,16 +270,57 @@ class WebScraper:
                     return data.get(game_type)
             return None  # Or appropriate error handling/alternative return value
 
-    def scrape_all(self, laegue):
-
-        driver = self.init_driver()
-        url = f"https://sportsbook.draftkings.com/leagues/basketball/{'nba' if self.league == 'NBA' else 'ncaab'}"
+    def scrape_all(self, laegue, single_pass=False):
+        # Browser comes from the warm pool and goes back to it afterwards
+        with self.pool.driver() as driver:
+            return self.scrape_with_driver(driver, single_pass)
+
+    def poll(self, interval=60, max_polls=None, log_file=None):
+        """
+        Re-read the slate every `interval` seconds, appending only changed lines to the day's delta log.
+
+        Args:
+        - interval (int): Seconds between polls.
+        - max_polls (int): Stop after this many polls; None polls until interrupted.
+        - log_file (str): Delta log path (see odds_log.py); None logs each poll to its own day's log_path.
+        """
+        writer = None
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            started = time.monotonic()
+            try:
+                self.total_games = self.live_games = 0
+                all_matchups = self.scrape_all(self.league)
+                if all_matchups:  # An empty board is a failed load, not every game coming off
+                    now = datetime.now()
+                    # Resolved per snapshot, so a poll running past midnight starts the next day's log
+                    path = log_file or log_path(self.league, now.date())
+                    if writer is None or writer.path != path:
+                        writer = OddsLogWriter(path)
+                    changed = writer.append_snapshot(all_matchups, now.strftime('%Y-%m-%d %H:%M:%S'))
+                    print(f'{self.league}: {len(all_matchups)} games, {changed} changed')
+            except Exception as e:
+                print(f"Error polling {self.league}: {e}")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(max(0, interval - (time.monotonic() - started)))
+
+    def scrape_with_driver(self, driver, single_pass=False):
+        url = resolve_url(f"https://sportsbook.draftkings.com/leagues/basketball/{'nba' if self.league == 'NBA' else 'ncaab'}")
+
+        def load_page():
+            driver.get(url)
+            #Wait for table element to appear
+            return WebDriverWait(driver, 5).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, '.parlay-card-10-a'))
+            )
+        specific_tbody = call_with_retry(self.limiter, url, load_page, retry_on=(WebDriverException,))
+        if fixture_mode() == 'record':
+            record_page(url, driver.page_source)
 
-        driver.get(url)
-        #Wait for table element to appear
-        specific_tbody = WebDriverWait(driver, 5).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, '.parlay-card-10-a'))
-        )
+        if single_pass:
+            # One DOM snapshot, parsed locally, instead of ~14 WebDriverWaits per game
+            return self.scrape_page_source(driver.page_source)
 
         num_rows = len(specific_tbody.find_elements(By.TAG_NAME, 'tr')) - 1 # Total number of teams playing today
         number_of_games = (num_rows) / 2 # Total number of games today
@@ -211,7 +334,6 @@ class WebScraper:
             if matchup:
                 all_matchups.append(matchup)
 
-        driver.quit()
         return all_matchups
 
 
@@ -241,7 +363,7 @@ class DataUpdater:
                 json.dump(data, file, indent=4)
 
 
-def main(league):
+def main(league, single_pass=False):
     start = timeit.default_timer()
 
     webdriver.chrome
@@ -256,7 +378,7 @@ def main(league):
     scraper = WebScraper(league, 'DK', team_mappings)
 
     # Scraping and updating data
-    all_matchups = scraper.scrape_all(league)
+    all_matchups = scraper.scrape_all(league, single_pass=single_pass)
     DataUpdater.update_games_count('../games_count.json', scraper.league, scraper.total_games)
     DataUpdater.update_live_games_count('../live_games_count.json', scraper.league, scraper.live_games)
 
@@ -280,6 +402,15 @@ def main(league):
     # print('Time: ', stop - start)
 
 
+def poll(league, interval=60, max_polls=None):
+    """Long-running mode: log intraday line movement instead of overwriting dk_odds.json."""
+    if league == 'NBA': key = 'Pro'
+    elif league == 'NCB': key = 'College'
+    team_mappings = TeamMappingsLoader.load_team_mappings(f'../Dictionary/{key}/{league}.json')
+    scraper = WebScraper(league, 'DK', team_mappings)
+    scraper.poll(interval, max_polls)
+
+
 if __name__ == '__main__':
     main('NBA')
     main('NCB')
\ No newline at end of file
@@ -0,0 +1,244 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from fake_useragent import UserAgent
+
+# Where the resolved chromedriver path is kept between runs, and how long to
+# trust it before asking webdriver_manager again (Chrome updates itself).
+DRIVER_PATH_CACHE = Path(__file__).resolve().parent / '.chromedriver_path.json'
+DRIVER_PATH_MAX_AGE = 7 * 24 * 60 * 60
+
+POOL_SIZE = 4
+MAX_PAGES_PER_DRIVER = 50
+
+# "Fast profile", opt-in: eager page loads, no images/CSS/fonts/trackers, and for
+# pooled browsers a disk cache per pool slot that survives between runs.
+FAST_PROFILE = False
+CACHE_DIR = Path(__file__).resolve().parent / '.chrome_cache'
+# Images, CSS and fonts from any host, and everything from these hand-picked ad and
+# analytics hosts. Other third-party scripts still load: Network.setBlockedURLs only
+# matches URL patterns and can't tell a first-party request from a third-party one.
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*scorecardresearch.com*',
+    '*quantserve.com*', '*adnxs.com*', '*amazon-adsystem.com*', '*hotjar.com*',
+    '*optimizely.com*', '*nr-data.net*', '*newrelic.com*', '*segment.io*',
+    '*taboola.com*', '*outbrain.com*', '*criteo.com*', '*pubmatic.com*',
+]
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(max_age=DRIVER_PATH_MAX_AGE):
+    """
+    Returns the chromedriver binary path, resolving it at most once per process
+    and reusing the on-disk cache while it is fresh and the binary still exists.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+
+        try:
+            with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if time.time() - cached['resolved_at'] < max_age and os.path.exists(cached['path']):
+                _driver_path = cached['path']
+                return _driver_path
+        except (FileNotFoundError, KeyError, ValueError):
+            pass
+
+        _driver_path = ChromeDriverManager().install()
+        with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({'path': _driver_path, 'resolved_at': time.time()}, f, indent=4)
+        return _driver_path
+
+
+def chrome_options(proxy=None, fast_profile=False, cache_slot=None):
+    """
+    Headless Chrome options shared by every scraper.
+
+    A fast-profile browser with a `cache_slot` keeps its disk cache in that slot's
+    folder; one without uses Chrome's own cache for the session.
+    """
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('log-level=3')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument("--disable-extensions")
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_argument(f'user-agent={UserAgent().random}')
+    if proxy:
+        options.add_argument(f'--proxy-server={proxy}')
+    if fast_profile:
+        # Return from get() at DOMContentLoaded instead of waiting for every asset
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+    if fast_profile and cache_slot is not None:
+        # The pool hands a slot to one browser at a time, so concurrent browsers never share a folder
+        options.add_argument(f'--disk-cache-dir={CACHE_DIR / str(cache_slot)}')
+    return options
+
+
+def block_requests(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Blocks matching requests (images, CSS, fonts, the listed tracker hosts) through the DevTools protocol."""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+
+def create_driver(proxy=None, fast_profile=False, cache_slot=None):
+    """Launches a new headless Chrome using the cached chromedriver path."""
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options(proxy, fast_profile, cache_slot))
+    if fast_profile:
+        block_requests(driver)
+    return driver
+
+
+class DriverPool:
+    """
+    Keeps up to `size` warm browsers that are checked out and returned across
+    leagues and scrapers. A browser is quit and replaced after `max_pages`
+    checkouts, or straight away if the work done with it raised.
+
+    Each browser holds one of `size` slots, passed to `factory`, which picks its
+    cache folder; a replacement takes over the slot of the browser it replaces.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER, factory=None, fast_profile=FAST_PROFILE):
+        self.size = size
+        self.max_pages = max_pages
+        self.factory = factory or (lambda slot: create_driver(fast_profile=fast_profile, cache_slot=slot))
+        self.idle = []  # Most recently used last, so spare browsers stay idle
+        self.pages = {}
+        self.slots = {}
+        self.free_slots = list(range(size - 1, -1, -1))
+        self.created = 0
+        self.recycled = 0
+        # Signalled whenever a browser is checked in or a pool place frees up
+        self.available = threading.Condition()
+
+    def reserve(self):
+        """Takes a free place and slot; call with `available` held."""
+        self.created += 1
+        return self.free_slots.pop()
+
+    def release(self, slot):
+        """Gives back a place and its slot; call with `available` held."""
+        self.created -= 1
+        self.free_slots.append(slot)
+        self.available.notify()
+
+    def launch(self, slot):
+        """Starts a browser in a reserved slot, giving the slot back if it fails."""
+        try:
+            driver = self.factory(slot)
+        except Exception:
+            with self.available:
+                self.release(slot)
+            raise
+        with self.available:
+            self.pages[id(driver)] = 0
+            self.slots[id(driver)] = slot
+        return driver
+
+    def warm(self, count=None):
+        """Starts browsers ahead of time so the first pages don't pay for the launch."""
+        with self.available:
+            slots = [self.reserve() for _ in range(min(count or self.size, self.size - self.created))]
+        for slot in slots:
+            driver = self.launch(slot)
+            with self.available:
+                self.idle.append(driver)
+                self.available.notify()
+
+    def checkout(self):
+        """Returns an idle browser, launching one if the pool isn't full, else waits for one."""
+        with self.available:
+            while not self.idle and self.created >= self.size:
+                self.available.wait()
+            if self.idle:
+                return self.idle.pop()
+            slot = self.reserve()
+        return self.launch(slot)
+
+    def checkin(self, driver, broken=False):
+        """Returns a browser after one page of work, recycling it if worn out or broken."""
+        with self.available:
+            pages = self.pages.get(id(driver), 0) + 1
+            if not broken and pages < self.max_pages:
+                self.pages[id(driver)] = pages
+                self.idle.append(driver)
+                self.available.notify()
+                return
+        self.discard(driver)
+
+    def discard(self, driver):
+        """Quits a browser, then frees its slot so a waiting checkout launches a replacement into it."""
+        with self.available:
+            self.pages.pop(id(driver), None)
+            slot = self.slots.pop(id(driver))
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Only once Chrome is gone, so the replacement never shares its cache folder
+        with self.available:
+            self.release(slot)
+            self.recycled += 1
+
+    @contextmanager
+    def driver(self):
+        """Checks a browser out for the duration of the block."""
+        driver = self.checkout()
+        try:
+            yield driver
+        except Exception:
+            self.checkin(driver, broken=True)
+            raise
+        self.checkin(driver)
+
+    def close(self):
+        """Quits every idle browser."""
+        with self.available:
+            drivers, self.idle = self.idle, []
+            slots = [self.slots.pop(id(driver)) for driver in drivers]
+            for driver in drivers:
+                self.pages.pop(id(driver), None)
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        with self.available:
+            for slot in slots:
+                self.release(slot)
+            self.available.notify_all()
+
+
+_shared_pools = {}
+_shared_lock = threading.Lock()
+
+
+def shared_pool(fast_profile=FAST_PROFILE):
+    """Process-wide pool, so scrapers run back to back in one process reuse browsers."""
+    with _shared_lock:
+        if fast_profile not in _shared_pools:
+            pool = DriverPool(fast_profile=fast_profile)
+            atexit.register(pool.close)
+            _shared_pools[fast_profile] = pool
+        return _shared_pools[fast_profile]
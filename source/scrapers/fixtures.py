@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Record/replay of fetched pages so scrapers can be run and benchmarked offline.
+#
+#   SCRAPER_FIXTURES=record  python dk.py         # save every fetched page
+#   python fixtures.py replay --port 8765         # serve the saved pages
+#   SCRAPER_FIXTURES=replay SCRAPER_REPLAY_URL=http://127.0.0.1:8765 python dk.py
+#
+# Pages are keyed by their original URL and stored gzipped, one file per page,
+# with index.json mapping URL -> file. In replay mode scrapers rewrite
+# https://host/path?query to {SCRAPER_REPLAY_URL}/host/path?query.
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures' / 'store'
+
+
+class FixtureStore:
+    """Compressed page store keyed by URL."""
+
+    def __init__(self, path=FIXTURE_DIR):
+        self.path = Path(path)
+        self.index_path = self.path / 'index.json'
+        self.lock = threading.Lock()
+        self.index = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def save(self, url, html):
+        """Stores one page, replacing any earlier recording of the same URL."""
+        file_name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html.gz'
+        self.path.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path / file_name, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        with self.lock:
+            self.index[url] = file_name
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=4)
+
+    def load(self, url):
+        """Returns the recorded HTML for a URL, or None if it was never recorded."""
+        file_name = self.index.get(url)
+        if file_name is None:
+            return None
+        with gzip.open(self.path / file_name, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def urls(self):
+        return list(self.index)
+
+    def items(self):
+        for url in self.urls():
+            yield url, self.load(url)
+
+
+def fixture_mode():
+    """'record', 'replay' or None, from the SCRAPER_FIXTURES environment variable."""
+    return os.environ.get('SCRAPER_FIXTURES')
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def default_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FixtureStore(os.environ.get('SCRAPER_FIXTURE_DIR', FIXTURE_DIR))
+        return _store
+
+
+def replay_url(url, replay_base):
+    """Maps https://host/path?query to {replay_base}/host/path?query."""
+    parts = urlsplit(url)
+    query = f'?{parts.query}' if parts.query else ''
+    return f'{replay_base.rstrip("/")}/{parts.netloc}{parts.path}{query}'
+
+
+def resolve_url(url):
+    """Returns the URL to fetch: the original, or its replay-server address in replay mode."""
+    if fixture_mode() != 'replay':
+        return url
+    return replay_url(url, os.environ.get('SCRAPER_REPLAY_URL', 'http://127.0.0.1:8765'))
+
+
+def record_page(url, html):
+    """Saves a fetched page under its original URL when running in record mode."""
+    if fixture_mode() == 'record':
+        default_store().save(url, html)
+
+
+def replay_key(path):
+    """Maps a replay request path (/host/path?query) back to the original URL."""
+    return f'https://{path.lstrip("/")}'
+
+
+def start_replay_server(store=None, port=0):
+    """
+    Serves recorded pages from a local HTTP stand-in.
+
+    Args:
+    - store (FixtureStore): Pages to serve; defaults to the configured store.
+    - port (int): Port to bind on 127.0.0.1; 0 picks a free one.
+
+    Returns:
+    - tuple: (server, base_url). Call server.shutdown() when done.
+    """
+    store = store or default_store()
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            html = store.load(replay_key(self.path))
+            if html is None:
+                self.send_error(404, f'No fixture recorded for {replay_key(self.path)}')
+                return
+            body = html.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve or list recorded scraper fixtures')
+    parser.add_argument('command', choices=['replay', 'list'])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--store', default=os.environ.get('SCRAPER_FIXTURE_DIR', FIXTURE_DIR))
+    args = parser.parse_args()
+
+    fixture_store = FixtureStore(args.store)
+    if args.command == 'list':
+        for fixture_url in fixture_store.urls():
+            print(fixture_url)
+    else:
+        replay_server, base_url = start_replay_server(fixture_store, args.port)
+        print(f'Replaying {len(fixture_store.urls())} pages at {base_url}')
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            replay_server.shutdown()
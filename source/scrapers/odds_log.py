@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import os
+
+# Append-only, delta-compressed log of DraftKings lines, one per league per day.
+# Each poll appends one gzip member holding a JSON line for every matchup whose
+# fields changed since the previous poll:
+#   {"t": "2024-12-09 11:02:19", "k": "30512345", "d": {"Away Spread": "-6.5"}}
+# A matchup that drops off the board gets {"t": ..., "k": ..., "removed": true}.
+# Matchups are keyed on DraftKings' event ID. Records without one fall back to
+# the raw DraftKings names, and games that still share a key in one snapshot
+# (a board of '-999 @ -999' rows) are told apart by their order on the board.
+
+IGNORED_FIELDS = ('Scrape Time',)
+
+
+def log_path(league, day):
+    return f'../raw_data/{league}/{day}/dk_odds_log.jsonl.gz'
+
+
+def matchup_key(game):
+    event_id = game.get('Event ID', '-999')
+    if event_id != '-999':
+        return event_id
+    return f"{game['Away Team']} @ {game['Home Team']}"
+
+
+def game_fields(game):
+    return {field: value for field, value in game.items() if field not in IGNORED_FIELDS}
+
+
+def fingerprint(fields):
+    """Stable hash of a game's fields, so unchanged games are skipped without a field-by-field diff."""
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def read_log(path):
+    """Yields every record in the log, oldest first."""
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def line_at(path, timestamp=None):
+    """
+    Rebuild the board as it stood at a point in time.
+
+    Args:
+    - path (str): Log file written by OddsLogWriter.
+    - timestamp (str): 'YYYY-MM-DD HH:MM:SS'; None replays the whole log.
+
+    Returns:
+    - dict: Matchup key -> fields as of the last change at or before `timestamp`.
+    """
+    board = {}
+    for record in read_log(path):
+        if timestamp is not None and record['t'] > timestamp:
+            break
+        if record.get('removed'):
+            board.pop(record['k'], None)
+        else:
+            board.setdefault(record['k'], {}).update(record['d'])
+    return board
+
+
+def history(path, key):
+    """Returns [(timestamp, changed fields), ...] for one matchup."""
+    return [(record['t'], record.get('d', {'removed': True})) for record in read_log(path) if record['k'] == key]
+
+
+class OddsLogWriter:
+    """Diffs each snapshot against the previous one and appends only what changed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.board = line_at(path)  # Resume from what is already logged
+        self.hashes = {key: fingerprint(fields) for key, fields in self.board.items()}
+
+    def append_snapshot(self, matchups, timestamp):
+        """
+        Append the changes in one poll of the slate.
+
+        Args:
+        - matchups (list): Records as returned by WebScraper.scrape_all.
+        - timestamp (str): Poll time, 'YYYY-MM-DD HH:MM:SS'.
+
+        Returns:
+        - int: Number of records appended.
+        """
+        records = []
+        seen = set()
+        counts = {}
+        for matchup in matchups:
+            game = matchup[0]  # scrape() returns a one-element tuple
+            key = matchup_key(game)
+            counts[key] = counts.get(key, 0) + 1
+            if counts[key] > 1:
+                key = f'{key} #{counts[key]}'
+            fields = game_fields(game)
+            digest = fingerprint(fields)
+            seen.add(key)
+            if self.hashes.get(key) == digest:
+                continue
+
+            previous = self.board.get(key, {})
+            delta = {field: value for field, value in fields.items() if previous.get(field) != value}
+            records.append({'t': timestamp, 'k': key, 'd': delta})
+            self.board[key] = fields
+            self.hashes[key] = digest
+
+        for key in [key for key in self.board if key not in seen]:
+            records.append({'t': timestamp, 'k': key, 'removed': True})
+            del self.board[key]
+            del self.hashes[key]
+
+        if records:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+        return len(records)
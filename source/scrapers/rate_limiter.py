@@ -0,0 +1,196 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Default politeness budget per host. The adaptive limiter moves each host's
+# rate between MIN_RATE and MAX_RATE based on how the host is responding.
+REQUESTS_PER_SECOND = 0.5
+BURST = 2
+MIN_RATE = 0.05
+MAX_RATE = 4.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available and returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class HostState:
+    """Per-host bucket plus the latency/error averages that drive its rate."""
+
+    def __init__(self, rate, burst):
+        self.bucket = TokenBucket(rate, burst)
+        self.latency = None  # EWMA of response time in seconds
+        self.error_rate = 0.0  # EWMA of failures
+        self.requests = 0
+        self.failures = 0
+        self.wait_time = 0.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host token buckets with AIMD rate control.
+
+    Every successful response adds `increase` requests/sec to the host's rate while
+    its average latency stays under `slow_latency` and its recent error rate under
+    `max_error_rate`; otherwise the rate is multiplied by `decrease`. Hosts that
+    keep up get faster, hosts that start failing or slowing down back off.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 increase=0.05, decrease=0.5, slow_latency=5.0, max_error_rate=0.2, smoothing=0.2):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.max_error_rate = max_error_rate
+        self.smoothing = smoothing
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def configure(self, rate=None, burst=None):
+        """Sets the starting rate and burst, for hosts already seen as well as new ones."""
+        with self.lock:
+            self.rate = self.rate if rate is None else rate
+            self.burst = self.burst if burst is None else burst
+            for state in self.hosts.values():
+                with state.bucket.lock:
+                    state.bucket.rate = min(self.max_rate, max(self.min_rate, self.rate))
+                    state.bucket.capacity = self.burst
+                    state.bucket.tokens = min(state.bucket.tokens, self.burst)
+
+    def host_state(self, url):
+        host = urlparse(url).netloc or url
+        with self.lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostState(self.rate, self.burst)
+            return self.hosts[host]
+
+    def acquire(self, url):
+        """Waits for the host's next token and returns the seconds spent waiting."""
+        state = self.host_state(url)
+        waited = state.bucket.acquire()
+        with self.lock:
+            state.wait_time += waited
+        return waited
+
+    def record(self, url, latency, ok):
+        """Feeds one response back into the host's averages and adjusts its rate."""
+        state = self.host_state(url)
+        with self.lock:
+            state.requests += 1
+            if not ok:
+                state.failures += 1
+            state.latency = latency if state.latency is None else (
+                (1 - self.smoothing) * state.latency + self.smoothing * latency)
+            state.error_rate = (1 - self.smoothing) * state.error_rate + self.smoothing * (0.0 if ok else 1.0)
+
+            bucket = state.bucket
+            if ok and state.latency < self.slow_latency and state.error_rate < self.max_error_rate:
+                new_rate = bucket.rate + self.increase
+            else:
+                new_rate = bucket.rate * self.decrease
+            with bucket.lock:
+                bucket.rate = min(self.max_rate, max(self.min_rate, new_rate))
+
+    @contextmanager
+    def request(self, url):
+        """Rate-limits the wrapped request and records its latency and outcome."""
+        self.acquire(url)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(url, time.monotonic() - start, ok=False)
+            raise
+        self.record(url, time.monotonic() - start, ok=True)
+
+    def stats(self):
+        """Returns a per-host summary of rate, latency, error rate and time spent waiting."""
+        with self.lock:
+            return {
+                host: {
+                    'rate': state.bucket.rate,
+                    'latency': state.latency,
+                    'error_rate': state.error_rate,
+                    'requests': state.requests,
+                    'failures': state.failures,
+                    'wait_time': state.wait_time,
+                }
+                for host, state in self.hosts.items()
+            }
+
+
+def call_with_retry(limiter, url, fn, retries=3, retry_on=(Exception,), base=1.0, cap=60.0):
+    """
+    Call fn() through the limiter, retrying with jittered exponential backoff.
+
+    Args:
+    - limiter (AdaptiveRateLimiter): Limiter for the host of `url`.
+    - url (str): URL being fetched; its host selects the bucket.
+    - fn (callable): Performs the request; raising marks the attempt as failed.
+    - retries (int): Total attempts before the last error is re-raised.
+    - retry_on (tuple): Exception types worth retrying.
+
+    Returns:
+    - Whatever fn() returns on the first successful attempt.
+    """
+    for attempt in range(retries):
+        try:
+            with limiter.request(url):
+                return fn()
+        except retry_on:
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff_delay(attempt, base, cap))
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(rate=None, burst=None):
+    """
+    Process-wide limiter so every scraper running in this process shares host budgets.
+
+    `rate` (starting requests/sec per host) and `burst` override the defaults;
+    scrapers call it without them and get whatever budget the entry point set.
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter()
+        if rate is not None or burst is not None:
+            _shared_limiter.configure(rate, burst)
+        return _shared_limiter
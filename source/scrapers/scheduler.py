@@ -0,0 +1,92 @@
+import argparse
+import timeit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+from rate_limiter import BURST, REQUESTS_PER_SECOND, shared_limiter
+
+WORKERS = 4
+
+
+def run_tasks(tasks, limiter=None, workers=WORKERS, pool=None, desc="Scraping"):
+    """
+    Run page tasks over a bounded pool of workers.
+
+    Politeness is handled inside each task through a shared AdaptiveRateLimiter,
+    so one budget per host covers every worker and every league in the run.
+
+    Args:
+    - tasks (list): Callables taking a driver checked out from `pool`, or None without a pool.
+    - limiter (AdaptiveRateLimiter): Limiter the tasks use; only read for the report.
+    - workers (int): Number of worker threads.
+    - pool (DriverPool): Browsers to check out per task; None for HTTP-only tasks.
+    - desc (str): Progress bar label.
+
+    Returns:
+    - dict: Throughput report with completed/failed counts, errors and pages per second.
+    """
+    errors = []
+
+    def run(task):
+        if pool is None:
+            return task(None)
+        with pool.driver() as driver:
+            return task(driver)
+
+    start = timeit.default_timer()
+    completed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor, tqdm(total=len(tasks), desc=desc) as pbar:
+        futures = [executor.submit(run, task) for task in tasks]
+        for future in as_completed(futures):
+            try:
+                future.result()
+                completed += 1
+            except Exception as e:
+                errors.append(str(e))
+            pbar.update(1)
+
+    elapsed = timeit.default_timer() - start
+    host_stats = limiter.stats() if limiter else {}
+    return {
+        'tasks': len(tasks),
+        'completed': completed,
+        'failed': len(tasks) - completed,
+        'errors': errors,
+        'workers': workers,
+        'elapsed': elapsed,
+        'rate_limit_wait': sum(host['wait_time'] for host in host_stats.values()),
+        'hosts': host_stats,
+        'pages_per_sec': completed / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(report):
+    print(f"{report['completed']}/{report['tasks']} pages in {report['elapsed']:.1f}s "
+          f"({report['pages_per_sec']:.2f} pages/s, {report['workers']} workers, "
+          f"{report['rate_limit_wait']:.1f}s waiting on rate limit)")
+    for host, stats in report['hosts'].items():
+        latency = f"{stats['latency']:.2f}s" if stats['latency'] is not None else "n/a"
+        print(f"  {host}: {stats['rate']:.2f} req/s, latency {latency}, "
+              f"{stats['failures']}/{stats['requests']} failed")
+
+
+if __name__ == '__main__':
+    # Scrape the Team Rankings trend tables with an explicit politeness budget:
+    #   python scheduler.py --engine http --workers 4 --rate 1 --burst 4
+    parser = argparse.ArgumentParser(description='Scrape the Team Rankings tables over a bounded worker pool')
+    parser.add_argument('--engine', choices=['selenium', 'http'], default='selenium')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--rate', type=float, default=REQUESTS_PER_SECOND,
+                        help='Starting requests/sec per host; the limiter adapts it from there')
+    parser.add_argument('--burst', type=int, default=BURST, help='Requests a host may take back to back')
+    parser.add_argument('--fast-profile', action='store_true',
+                        help='Selenium engine: eager page loads with images, CSS, fonts and known trackers blocked')
+    args = parser.parse_args()
+
+    limiter = shared_limiter(args.rate, args.burst)
+    if args.engine == 'http':
+        import team_rankings_http
+        team_rankings_http.main(workers=args.workers, limiter=limiter)
+    else:
+        import team_rankings
+        from driver_pool import shared_pool
+        team_rankings.main(workers=args.workers, limiter=limiter, pool=shared_pool(fast_profile=args.fast_profile))
@@ -1,14 +1,25 @@
-import subprocess
+import argparse
+import covers_results
+import team_rankings
+from driver_pool import shared_pool
 
-# Paths to your Python scripts
-script1 = 'team_rankings.py'  # Replace with the actual path to your first script
-script2 = 'dk.py'  # Replace with the actual path to your second script
+parser = argparse.ArgumentParser(description='Run the daily scrapers over one shared browser pool')
+parser.add_argument('--fast-profile', action='store_true',
+                    help='Eager page loads with images, CSS, fonts and known trackers blocked')
+args = parser.parse_args()
 
-# Run script1 three times
+# Run every scraper in this one process so they share the warm browser pool
+# and the cached chromedriver path instead of relaunching Chrome per script.
+pool = shared_pool(fast_profile=args.fast_profile)
+pool.warm()
+
+# Run team_rankings three times; each pass only fetches tables still missing
 for _ in range(3):
-    subprocess.run(['python', script1], check=True)
+    team_rankings.main(pool=pool)
+
+# Run dk.py once
+# dk.main('NBA'); dk.main('NCB')
+covers_results.main()
+# subprocess.run(['python', 'reuslts_process.py'], check=True)
 
-# Run script2 once
-# subprocess.run(['python', script2], check=True)
-subprocess.run(['python', 'covers_results.py'], check=True)
-# subprocess.run(['python', 'reuslts_process.py'], check=True)
\ No newline at end of file
+pool.close()
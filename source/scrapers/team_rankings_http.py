@@ -0,0 +1,103 @@
+import requests
+from requests.adapters import HTTPAdapter
+from datetime import date
+from pathlib import Path
+from fake_useragent import UserAgent
+from fixtures import record_page
+from rate_limiter import call_with_retry, shared_limiter
+from scheduler import WORKERS, print_report, run_tasks
+from trend_tables import (KEY_LIST, RANGE_LIST, TREND_TYPES, parse_table,
+                          schedule_file_path, schedule_url, trend_file_path, trend_url)
+
+# HTTP-only engine for the Team Rankings tables. The tables are server rendered,
+# so a pooled keep-alive session replaces the headless Chrome in team_rankings.py
+# and writes the same raw_data/{LEAGUE}/{date}/{type}/{range}/{situation}.csv files.
+
+REQUEST_TIMEOUT = 20
+
+
+def create_session(pool_size=4):
+    """
+    Build a requests Session with a keep-alive connection pool.
+
+    Args:
+    - pool_size (int): Connections kept open per host.
+
+    Returns:
+    - requests.Session: Session to share across leagues.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': UserAgent().random,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def fetch_page(session, url, limiter, retries=3):
+    """Returns the HTML of a page through the limiter, retrying errors and non-2xx responses with backoff."""
+    def fetch():
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        record_page(url, response.text)
+        return response.text
+    return call_with_retry(limiter, url, fetch, retries=retries, retry_on=(requests.RequestException,))
+
+
+def fetch_table(session, url, file_name, limiter):
+    """Fetches a table page and saves the parsed table as CSV."""
+    if Path(file_name).exists():
+        return  # Skip if file already exists
+
+    df = parse_table(fetch_page(session, url, limiter))
+    df.to_csv(file_name, index=False)
+
+
+def build_league_tasks(session, league, date_to_scrape, limiter):
+    """Lists the schedule page and every trend table for one league as scheduler tasks."""
+    date_str = date_to_scrape.strftime("%Y-%m-%d")
+    jobs = [(schedule_url(league, date_to_scrape), schedule_file_path(league, date_str))]
+    for trend_type in TREND_TYPES:
+        for key in KEY_LIST:
+            for range_folder in RANGE_LIST:
+                jobs.append((trend_url(league, trend_type, key, range_folder),
+                             trend_file_path(league, date_str, trend_type, range_folder, key)))
+
+    def make_task(url, file_name):
+        def task(_):
+            # Failures are raised to the scheduler, which counts the page as failed
+            try:
+                fetch_table(session, url, file_name, limiter)
+            except Exception as e:
+                raise RuntimeError(f"Error scraping {url}: {e}") from e
+        return task
+
+    # Files already on disk are dropped here so reruns don't spend rate-limit tokens on them
+    return [make_task(url, file_name) for url, file_name in jobs if not Path(file_name).exists()]
+
+
+def main(league_list=('nba', 'ncb'), workers=WORKERS, limiter=None):
+    today_date = date.today()
+
+    # Per-host adaptive budget, shared by both leagues and any other scraper in this process
+    limiter = limiter or shared_limiter()
+    with create_session(pool_size=workers) as session:
+        tasks = [task for league in league_list
+                 for task in build_league_tasks(session, league, today_date, limiter)]
+        report = run_tasks(tasks, limiter, workers=workers, desc="Team Rankings (HTTP)")
+    print_report(report)
+
+    # Display errors at the end
+    if report['errors']:
+        print("\nErrors encountered:")
+        for error in report['errors']:
+            print(error)
+    return report['errors']
+
+
+if __name__ == '__main__':
+    main()
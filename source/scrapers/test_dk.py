@@ -0,0 +1,114 @@
+import pytest
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from dk import WebScraper, event_id_from_href
+
+# No DraftKings page is recorded in the tree, so the board is rebuilt from the
+# selectors both modes read: the full-page ones in scrape() and the row-relative
+# ones parse_rows() applies to a page_source snapshot.
+
+
+def nest(depth, inner):
+    return '<div>' * depth + inner + '</div>' * depth
+
+
+def team_row(team, spread, spread_odds, total_side, total, total_odds, ml, start_time, href=None, live=False,
+             ncb=False):
+    if ncb:
+        name = '<div class="event-cell"><div><div><div><div>' + team + '</div></div></div></div></div>'
+    else:
+        name = '<div><div><div><div><div></div><div><div>' + team + '</div></div></div></div></div></div>'
+    clock = '<span></span><span>' + start_time + '</span>'
+    if live:
+        clock += '<div><span>Q2</span><span>5:32</span></div>'
+    link = '<a href="' + href + '">' if href else '<a>'
+    th = '<th>' + link + '<div><div>' + clock + '</div>' + name + '</div></a></th>'
+
+    def priced(line, odds):
+        return '<td>' + nest(3, nest(1, line) + '<div><div></div><div><span>' + odds + '</span></div></div>') + '</td>'
+
+    spread_cell = priced('<span>' + spread + '</span>', spread_odds)
+    total_cell = priced('<span>' + total_side + '</span><span> </span><span>' + total + '</span>', total_odds)
+    ml_cell = '<td>' + nest(4, '<div></div><div><span>' + ml + '</span></div>') + '</td>'
+    return '<tr>' + th + spread_cell + total_cell + ml_cell + '</tr>'
+
+
+def board(games, ncb=False):
+    rows = ''.join(team_row(**side, ncb=ncb) for game in games for side in game)
+    return ('<html><body><div class="parlay-card-10-a"><table><thead><tr><th>Game</th></tr></thead>'
+            '<tbody class="sportsbook-table__body">' + rows + '</tbody></table></div></body></html>')
+
+
+GAMES = [
+    ({'team': 'NY Knicks', 'spread': '-6.5', 'spread_odds': '−110', 'total_side': 'O', 'total': '221.5',
+      'total_odds': '−112', 'ml': '−250', 'start_time': '7:30PM', 'href': '/event/nyk-knicks-%40-tor-raptors/30512345'},
+     {'team': 'TOR Raptors', 'spread': '+6.5', 'spread_odds': '−110', 'total_side': 'U', 'total': '221.5',
+      'total_odds': '−108', 'ml': '+205', 'start_time': ''}),
+    ({'team': 'LA Lakers', 'spread': '-3', 'spread_odds': 'Even', 'total_side': 'O', 'total': '230',
+      'total_odds': '−110', 'ml': '−150', 'start_time': '', 'live': True},
+     {'team': 'UTA Jazz', 'spread': '+3', 'spread_odds': '−120', 'total_side': 'U', 'total': '230',
+      'total_odds': '−110', 'ml': '+130', 'start_time': ''}),
+]
+
+
+class FakeElement:
+    def __init__(self, tag):
+        self.tag = tag
+        self.text = tag.get_text(strip=True)
+
+    def is_displayed(self):
+        return True
+
+    def get_attribute(self, name):
+        return self.tag.get(name)
+
+    def find_elements(self, by, value):
+        return [FakeElement(tag) for tag in self.tag.find_all(value)]
+
+
+class FakeDriver:
+    """Answers Selenium's CSS lookups from an HTML string; a missing element fails at once instead of waiting."""
+
+    def __init__(self, html):
+        self.page_source = html
+        self.soup = BeautifulSoup(html, 'lxml')
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        tag = self.soup.select_one(value)
+        if tag is None:
+            raise TimeoutException(value)
+        return FakeElement(tag)
+
+    def find_elements(self, by, value):
+        return [FakeElement(tag) for tag in self.soup.select(value)]
+
+
+def records(league, html, single_pass):
+    scraper = WebScraper(league, 'DK', [], pool=object())
+    matchups = scraper.scrape_with_driver(FakeDriver(html), single_pass=single_pass)
+    fields = [{key: value for key, value in matchup[0].items() if key != 'Scrape Time'} for matchup in matchups]
+    return fields, scraper.total_games, scraper.live_games
+
+
+@pytest.mark.parametrize('league', ['NBA', 'NCB'])
+def test_single_pass_matches_element_by_element(league):
+    html = board(GAMES, ncb=league == 'NCB')
+    single = records(league, html, single_pass=True)
+    assert single == records(league, html, single_pass=False)
+
+    fields, total_games, live_games = single
+    assert (total_games, live_games) == (2, 1)
+    assert [game['Away Team'] for game in fields] == ['NY Knicks', 'LA Lakers']
+    assert fields[0]['Event ID'] == '30512345' and fields[1]['Event ID'] == '-999'
+    assert fields[1]['Start Time'] == 'Live Game' and fields[1]['Away Spread Odds'] == '+100'
+    assert fields[0]['Total'] == '221.5' and fields[0]['Under Total Odds'] == '−108'
+    assert fields[1]['Home Team'] == 'UTA Jazz' and fields[1]['Home ML'] == '+130'
+
+
+def test_event_id_from_href():
+    assert event_id_from_href('https://sportsbook.draftkings.com/event/nyk-knicks-%40-tor-raptors/30512345') == '30512345'
+    assert event_id_from_href('/event/30512345?category=odds') == '30512345'
+    assert event_id_from_href(None) == '-999' and event_id_from_href('/event/live') == '-999'
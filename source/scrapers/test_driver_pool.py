@@ -0,0 +1,94 @@
+import threading
+import time
+import pytest
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, factory, slot):
+        self.factory = factory
+        self.slot = slot
+
+    def quit(self):
+        with self.factory.lock:
+            self.factory.live.discard(self)
+
+
+class FakeFactory:
+    """Stands in for create_driver, tracking the browsers open at once and their cache slots."""
+
+    def __init__(self):
+        self.live = set()
+        self.launched = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.shared_slot = False
+
+    def __call__(self, slot):
+        driver = FakeDriver(self, slot)
+        with self.lock:
+            self.shared_slot |= any(other.slot == slot for other in self.live)
+            self.launched += 1
+            self.live.add(driver)
+            self.peak = max(self.peak, len(self.live))
+        return driver
+
+
+def hold(driver):
+    time.sleep(0.002)
+
+
+def run_workers(pool, workers, pages, work=hold):
+    errors = []
+
+    def worker():
+        for _ in range(pages):
+            try:
+                with pool.driver() as driver:
+                    work(driver)
+            except RuntimeError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads), 'a checkout never returned'
+    return errors
+
+
+@pytest.mark.parametrize('max_pages', [1, 3])
+def test_concurrent_checkout_under_recycling(max_pages):
+    factory = FakeFactory()
+    pool = DriverPool(size=2, max_pages=max_pages, factory=factory)
+    run_workers(pool, workers=6, pages=20)
+
+    assert factory.peak <= 2
+    assert not factory.shared_slot
+    assert sorted(pool.free_slots + list(pool.slots.values())) == [0, 1]
+    assert pool.created == len(pool.idle) <= 2
+    assert pool.recycled == factory.launched - pool.created
+    pool.close()
+    assert pool.created == 0 and not factory.live
+
+
+def test_broken_drivers_are_replaced_for_waiters():
+    factory = FakeFactory()
+    pool = DriverPool(size=1, max_pages=50, factory=factory)
+
+    def fail(driver):
+        hold(driver)
+        raise RuntimeError('page failed')
+
+    errors = run_workers(pool, workers=4, pages=5, work=fail)
+    assert len(errors) == 20
+    assert factory.launched == 20 and pool.recycled == 20
+    assert pool.created == 0 and not factory.live
+
+
+def test_failed_launch_frees_its_place():
+    pool = DriverPool(size=1, factory=lambda slot: (_ for _ in ()).throw(OSError('chrome not found')))
+    with pytest.raises(OSError):
+        pool.checkout()
+    assert pool.created == 0 and pool.free_slots == [0]
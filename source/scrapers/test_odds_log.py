@@ -0,0 +1,60 @@
+from odds_log import OddsLogWriter, history, line_at, matchup_key, read_log
+
+
+def game(away, home, spread, event_id='-999', scrape_time='2024-12-09 11:00:00'):
+    """One matchup record as WebScraper.scrape_all returns it."""
+    return ({
+        'Scrape Time': scrape_time,
+        'Book Name': 'DK',
+        'Away Team': away,
+        'Away Spread': spread,
+        'Home Team': home,
+        'Home Spread': spread.translate(str.maketrans('+-', '-+')),
+        'Event ID': event_id,
+    },)
+
+
+def fields(record):
+    return {field: value for field, value in record[0].items() if field != 'Scrape Time'}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'dk_odds_log.jsonl.gz')
+    knicks = game('NY Knicks', 'TOR Raptors', '-6.5', '30512345')
+    lakers = game('LA Lakers', 'UTA Jazz', '-3', '30512346')
+
+    writer = OddsLogWriter(path)
+    assert writer.append_snapshot([knicks, lakers], '2024-12-09 11:00:00') == 2
+    # An unchanged poll writes nothing, whatever its scrape time
+    assert writer.append_snapshot([game('NY Knicks', 'TOR Raptors', '-6.5', '30512345', '2024-12-09 11:01:00'), lakers],
+                                  '2024-12-09 11:01:00') == 0
+    moved = game('NY Knicks', 'TOR Raptors', '-7', '30512345')
+    assert writer.append_snapshot([moved], '2024-12-09 11:02:00') == 2
+
+    records = list(read_log(path))
+    assert records[2] == {'t': '2024-12-09 11:02:00', 'k': '30512345', 'd': {'Away Spread': '-7', 'Home Spread': '+7'}}
+    assert records[3] == {'t': '2024-12-09 11:02:00', 'k': '30512346', 'removed': True}
+
+    assert line_at(path, '2024-12-09 11:01:00') == {'30512345': fields(knicks), '30512346': fields(lakers)}
+    assert line_at(path) == {'30512345': fields(moved)}
+    assert [t for t, _ in history(path, '30512346')] == ['2024-12-09 11:00:00', '2024-12-09 11:02:00']
+
+    # A new writer resumes from the log instead of re-logging the board
+    assert OddsLogWriter(path).append_snapshot([moved], '2024-12-09 11:03:00') == 0
+
+
+def test_games_without_names_or_ids_stay_apart(tmp_path):
+    path = str(tmp_path / 'dk_odds_log.jsonl.gz')
+    board = [game('-999', '-999', '+12.5'), game('-999', '-999', '+19'), game('-999', '-999', '+2.5')]
+    OddsLogWriter(path).append_snapshot(board, '2024-11-11 12:44:42')
+
+    logged = line_at(path)
+    assert len(logged) == 3
+    assert [line['Away Spread'] for line in logged.values()] == ['+12.5', '+19', '+2.5']
+
+
+def test_matchup_key_prefers_event_id():
+    assert matchup_key(game('NY Knicks', 'TOR Raptors', '-6.5', '30512345')[0]) == '30512345'
+    assert matchup_key(game('NY Knicks', 'TOR Raptors', '-6.5')[0]) == 'NY Knicks @ TOR Raptors'
+    # Logs written before the Event ID field existed
+    assert matchup_key({'Away Team': 'NY Knicks', 'Home Team': 'TOR Raptors'}) == 'NY Knicks @ TOR Raptors'
@@ -0,0 +1,25 @@
+from datetime import date
+import requests
+import team_rankings_http
+from rate_limiter import AdaptiveRateLimiter
+from scheduler import run_tasks
+
+
+def test_failed_pages_are_counted(tmp_path, monkeypatch):
+    # trend_file_path writes under ../raw_data
+    (tmp_path / 'scrapers').mkdir()
+    monkeypatch.chdir(tmp_path / 'scrapers')
+
+    def fetch_table(session, url, file_name, limiter):
+        if 'yearly_all' in url:
+            raise requests.HTTPError(f'503 Server Error for url: {url}')
+
+    monkeypatch.setattr(team_rankings_http, 'fetch_table', fetch_table)
+    tasks = team_rankings_http.build_league_tasks(None, 'nba', date(2024, 12, 9), AdaptiveRateLimiter())
+    report = run_tasks(tasks, workers=2)
+
+    failed = len(tasks) - report['completed']
+    assert failed == report['failed'] > 0
+    assert report['completed'] > 0
+    assert len(report['errors']) == failed
+    assert all('yearly_all' in error and '503' in error for error in report['errors'])
@@ -0,0 +1,61 @@
+import os
+from bs4 import BeautifulSoup
+import pandas as pd
+from fixtures import resolve_url
+
+# Shared by the Selenium (team_rankings.py) and HTTP (team_rankings_http.py) engines
+BASE_URL = "https://www.teamrankings.com"
+TABLE_ID = "DataTables_Table_0"
+
+TREND_TYPES = ["ou", "ats"]
+KEY_LIST = [
+    "all_games", "is_after_win", "is_after_loss",
+    "is_home", "is_away", "is_fav",
+    "is_dog", "rest_advantage", "rest_disadvantage",
+    "equal_rest", "four_plus_days_off", "two_three_days_off",
+    "one_day_off", "no_rest"
+]
+RANGE_LIST = ["yearly_all", "yearly_2024_2025", "yearly_since_2014_2015"]
+
+
+def trend_url(league, trend_type, key, range_folder):
+    #https://www.teamrankings.com/nba/trends/ats_trends/?sc=is_home&range=yearly_all
+    return resolve_url(f"{BASE_URL}/{league}/trends/{trend_type}_trends/?sc={key}&range={range_folder}")
+
+
+def schedule_url(league, date_to_scrape):
+    return resolve_url(f"{BASE_URL}/{league}/schedules/?date={date_to_scrape}")
+
+
+def trend_file_path(league, date_to_scrape, trend_type, range_folder, condition):
+    """Returns raw_data/{LEAGUE}/{date}/{type}/{range}/{situation}.csv, creating the folder."""
+    base_path = f"../raw_data/{league.upper()}/{date_to_scrape}/{trend_type}/{range_folder}/"
+    os.makedirs(base_path, exist_ok=True)
+    return os.path.join(base_path, f"{condition}.csv")
+
+
+def schedule_file_path(league, date_to_scrape):
+    base_path = f"../raw_data/{league.upper()}/{date_to_scrape}/"
+    os.makedirs(base_path, exist_ok=True)
+    return os.path.join(base_path, "daily_schedule.csv")
+
+
+def parse_table(html, table_id=TABLE_ID):
+    """
+    Parse a Team Rankings data table out of a page's HTML.
+
+    Args:
+    - html (str): Page source, either from a live fetch or a saved fixture.
+    - table_id (str): id attribute of the table to read.
+
+    Returns:
+    - pd.DataFrame: One row per team, columns taken from the table header.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    table = soup.find("table", {"id": table_id})
+    if not table:
+        raise ValueError(f"No table '{table_id}' found in page")
+
+    headers = [header.text.strip() for header in table.find_all("th")]
+    data = [[cell.text.strip() for cell in row.find_all("td")] for row in table.find("tbody").find_all("tr")]
+    return pd.DataFrame(data, columns=headers)